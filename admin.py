@@ -1,70 +1,48 @@
 import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib
-matplotlib.use("TkAgg")
+from tkinter import messagebox
 import mysql.connector
-import subprocess
-import sys
-from datetime import datetime, timedelta
-import calendar
-
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",  # Replace with your MySQL username
-        password="new_password",  # Replace with your MySQL password
-        database="hotel_book"  # Corrected database name
-    )
+from instrument import timed
+import router
+import session
+import tasks
+import analytics
+from rollup import rebuild_rollup
+from analytics import get_period_totals, recent_periods, period_label
 
 # ------------------- Global Variables -------------------
 current_admin = None
 
+# Chart range option -> (grouping, number of periods)
+CHART_RANGES = {
+    "Last 30 Days": ("day", 30),
+    "Last 12 Weeks": ("week", 12),
+    "Last 7 Months": ("month", 7),
+    "Last 12 Months": ("month", 12),
+    "Last 8 Quarters": ("quarter", 8),
+}
+DEFAULT_CHART_RANGE = "Last 7 Months"
+
+# The matplotlib chart is built on first use (see build_chart)
+fig = None
+ax = None
+ax2 = None
+chart_canvas = None
+thousands_formatter = None
+
 # ------------------- Admin Session Management -------------------
 def load_admin_session():
-    """Load admin information from database"""
+    """Load the logged-in admin's profile from the signed session token"""
     global current_admin
     
-    # Check if any admin_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            admin_id = int(sys.argv[1])
-            
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Admin WHERE Admin_ID = %s",
-                (admin_id,)
-            )
-            admin_data = cursor.fetchone()
-            
-            if admin_data:
-                current_admin = admin_data
-                return True
-                
-        except (ValueError, IndexError, mysql.connector.Error) as err:
-            print(f"Error loading admin session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    # The token is checked locally (no database round trip)
+    current_admin = session.current("admin")
+    return current_admin is not None
 
 # ------------------- Navigation Functions -------------------
 def open_page(page_name):
-    """Open another page and close the current one"""
+    """Switch to another page in the same window"""
     try:
-        # Pass the current admin ID to the next page if an admin is logged in
-        admin_param = [str(current_admin['Admin_ID'])] if current_admin else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + admin_param
-        
-        subprocess.Popen(command)
-        app.destroy()  # Close the current window
+        router.show(page_name)
     except Exception as e:
         print(f"Navigation Error: {e}")
 
@@ -81,11 +59,12 @@ def logout():
     """Log out the current admin and return to login page"""
     global current_admin
     current_admin = None
-    open_page("login")
+    router.logout("login")
 
 # ------------------- Data Fetching Functions -------------------
+@timed()
 def get_dashboard_stats():
-    """Fetch statistics for dashboard"""
+    """Fetch statistics for dashboard (cached for analytics.STATS_TTL seconds)"""
     stats = {
         "total_bookings": 0,
         "total_revenue": 0,
@@ -94,112 +73,159 @@ def get_dashboard_stats():
     }
     
     try:
-        connection = connect_db()
-        cursor = connection.cursor()
-        
-        # Get total bookings
-        cursor.execute("SELECT COUNT(*) FROM Booking")
-        stats["total_bookings"] = cursor.fetchone()[0]
-        
-        # Get total revenue
-        cursor.execute("SELECT SUM(Total_Cost) FROM Booking")
-        total_revenue = cursor.fetchone()[0]
-        stats["total_revenue"] = total_revenue if total_revenue else 0
-        
-        # Get active users
-        cursor.execute("SELECT COUNT(*) FROM Users")
-        stats["active_users"] = cursor.fetchone()[0]
-        
-        # Get hotels (rooms) listed - assuming Room table contains hotel rooms
-        cursor.execute("SELECT COUNT(*) FROM Room")
-        stats["hotels_listed"] = cursor.fetchone()[0]
-        
+        stats = analytics.get_dashboard_stats()
     except mysql.connector.Error as err:
         print(f"Database Error: {err}")
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
     
     return stats
 
-def get_monthly_data():
-    """Fetch monthly revenue and booking data for the last 6 months"""
-    months = []
+@timed()
+def get_monthly_data(chart_range=None):
+    """Fetch revenue and booking data per period for the selected chart range"""
+    grouping, count = CHART_RANGES.get(chart_range, CHART_RANGES[DEFAULT_CHART_RANGE])
+    labels = []
     revenue = []
     bookings = []
     
     try:
-        connection = connect_db()
-        cursor = connection.cursor()
-        
-        # Get current date and date 6 months ago
-        today = datetime.today()
-        six_months_ago = today - timedelta(days=180)
-        
-        # Get data for each month
-        current = six_months_ago
-        while current <= today:
-            month_start = datetime(current.year, current.month, 1)
-            if current.month == 12:
-                next_month = datetime(current.year + 1, 1, 1)
-            else:
-                next_month = datetime(current.year, current.month + 1, 1)
-            
-            # Get bookings count for this month
-            cursor.execute(
-                """
-                SELECT COUNT(*) 
-                FROM Booking 
-                WHERE Check_IN_Date >= %s AND Check_IN_Date < %s
-                """,
-                (month_start, next_month)
-            )
-            month_bookings = cursor.fetchone()[0]
-            
-            # Get revenue for this month
-            cursor.execute(
-                """
-                SELECT SUM(Total_Cost) 
-                FROM Booking 
-                WHERE Check_IN_Date >= %s AND Check_IN_Date < %s
-                """,
-                (month_start, next_month)
-            )
-            month_revenue = cursor.fetchone()[0]
-            
-            # Add to lists
-            months.append(calendar.month_abbr[current.month])
-            bookings.append(month_bookings)
-            revenue.append(month_revenue if month_revenue else 0)
-            
-            # Move to next month
-            if current.month == 12:
-                current = datetime(current.year + 1, 1, 1)
-            else:
-                current = datetime(current.year, current.month + 1, 1)
+        # One grouped query for the whole range, gaps filled with zeros
+        start, end = recent_periods(grouping, count)
+        for period, period_bookings, period_revenue in get_period_totals(start, end, grouping):
+            labels.append(period_label(period, grouping))
+            bookings.append(period_bookings)
+            revenue.append(period_revenue)
         
     except mysql.connector.Error as err:
         print(f"Database Error: {err}")
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
     
-    return months, revenue, bookings
+    return labels, revenue, bookings
+
+# ------------------- Dashboard Functions -------------------
+def update_stat_cards():
+    """Fetch the dashboard stats in the background and show them on the stat cards"""
+    tasks.submit(get_dashboard_stats, key="stats", spinner=chart_spinner, on_success=show_stat_cards)
+
+def show_stat_cards(stats):
+    """Show loaded stats on the stat cards"""
+    stat_value_labels["total_bookings"].configure(text=f"{stats['total_bookings']:,}")
+    stat_value_labels["total_revenue"].configure(text=f"${stats['total_revenue']:,}")
+    stat_value_labels["active_users"].configure(text=f"{stats['active_users']:,}")
+    stat_value_labels["hotels_listed"].configure(text=f"{stats['hotels_listed']:,}")
+
+def draw_chart():
+    """Fetch the chart data in the background, then (re)draw the chart"""
+    tasks.submit(get_monthly_data, chart_range_var.get(), key="chart", spinner=chart_spinner,
+                 on_success=render_chart)
+
+def build_chart():
+    """Import matplotlib and create the chart (the first time it is drawn)
+
+    matplotlib takes longer to import than the rest of the page takes to
+    build, so the dashboard is drawn with a placeholder first and the chart
+    only appears once its data has arrived.
+    """
+    global fig, ax, ax2, chart_canvas, thousands_formatter
+    
+    # Let the stat cards and the rest of the page draw before the import
+    chart_frame.update_idletasks()
+    
+    import matplotlib
+    matplotlib.use("TkAgg")
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+    
+    # Create matplotlib figure for the chart
+    fig = Figure(figsize=(10, 4), dpi=100)
+    ax = fig.add_subplot(111)
+    
+    # Create a second y-axis for bookings
+    ax2 = ax.twinx()
+    
+    # Adjust margins
+    fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.15)
+    
+    # Format y-axis labels with commas for thousands
+    thousands_formatter = FuncFormatter(lambda x, p: format(int(x), ','))
+    
+    # Embed the chart in the tkinter window, in place of the placeholder
+    chart_placeholder.destroy()
+    chart_canvas = FigureCanvasTkAgg(fig, master=chart_frame)
+    chart_canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=(0, 20))
+
+def render_chart(data):
+    """Draw the revenue & bookings chart from get_monthly_data() output"""
+    months, revenue, bookings = data
+    
+    if fig is None:
+        build_chart()
+    
+    ax.clear()
+    ax2.clear()
+    ax2.yaxis.tick_right()
+    ax2.yaxis.set_label_position("right")
+    
+    # Plot revenue and bookings
+    revenue_line, = ax.plot(months, revenue, marker='o', linewidth=2, color='#007BFF', label='Revenue ($)')
+    booking_line, = ax2.plot(months, bookings, marker='s', linewidth=2, color='#28A745', label='Bookings')
+    
+    # Add grid and legends
+    ax.grid(True, linestyle='--', alpha=0.7)
+    lines = [revenue_line, booking_line]
+    labels = [line.get_label() for line in lines]
+    ax.legend(lines, labels, loc='upper left')
+    
+    # Set labels and title
+    ax.set_xlabel(CHART_RANGES[chart_range_var.get()][0].capitalize())
+    ax.set_ylabel('Revenue ($)', color='#007BFF')
+    ax2.set_ylabel('Bookings', color='#28A745')
+    
+    # Format the chart for better appearance
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax2.spines['top'].set_visible(False)
+    ax2.tick_params(axis='y', colors='#28A745')
+    ax.tick_params(axis='y', colors='#007BFF')
+    
+    # Format y-axis labels with commas for thousands
+    ax.get_yaxis().set_major_formatter(thousands_formatter)
+    
+    # Keep long ranges readable
+    if len(months) > 12:
+        ax.tick_params(axis='x', labelrotation=45, labelsize=8)
+    
+    chart_canvas.draw()
+
+def rebuild_analytics():
+    """Recompute the daily revenue rollup from all bookings and redraw the chart"""
+    admin_id = current_admin['Admin_ID'] if current_admin else None
+    rebuild_btn.configure(state="disabled")
+    tasks.submit(rebuild_rollup, admin_id, key="rebuild", spinner=chart_spinner,
+                 on_success=analytics_rebuilt, on_error=analytics_rebuild_failed)
+
+def analytics_rebuilt(rows):
+    """Report a finished rollup rebuild and redraw the chart"""
+    rebuild_btn.configure(state="normal")
+    messagebox.showinfo("Analytics Rebuilt", f"Daily rollup rebuilt ({rows} rows).")
+    draw_chart()
+
+def analytics_rebuild_failed(err):
+    """Report a failed rollup rebuild"""
+    rebuild_btn.configure(state="normal")
+    print(f"Database Error: {err}")
+    messagebox.showerror("Database Error", f"Error rebuilding analytics: {err}")
+
+def refresh_dashboard():
+    """Reload stats and chart when the dashboard is shown again"""
+    update_stat_cards()
+    draw_chart()
 
 # ----------------- Initialize App -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
-app = ctk.CTk()
-app.title("Hotel Booking - Admin Dashboard")
-app.geometry("1200x700")
-app.resizable(False, False)
+app = router.get_app()
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("admin", "Hotel Booking - Admin Dashboard", "1200x700",
+                                on_show=refresh_dashboard)
 
 # ----------------- Sidebar (Navigation) -----------------
 sidebar = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=200, corner_radius=0)
@@ -249,29 +275,28 @@ header_subtitle = ctk.CTkLabel(header_frame, text="Dashboard",
 header_subtitle.pack(anchor="center")
 
 # ----------------- Stats Cards Section -----------------
-# Fetch stats from database
-stats = get_dashboard_stats()
-
 stats_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
 stats_frame.pack(fill="x", padx=30, pady=(0, 20))
 
-# Create stat cards
+# Create stat cards (values are filled in by update_stat_cards)
 stat_cards = [
-    ("Total\nBookings", f"{stats['total_bookings']:,}"),
-    ("Total\nRevenue", f"${stats['total_revenue']:,}"),
-    ("Active\nUsers", f"{stats['active_users']:,}"),
-    ("Hotels\nListed", f"{stats['hotels_listed']:,}")
+    ("Total\nBookings", "total_bookings"),
+    ("Total\nRevenue", "total_revenue"),
+    ("Active\nUsers", "active_users"),
+    ("Hotels\nListed", "hotels_listed")
 ]
+stat_value_labels = {}
 
-for title, value in stat_cards:
+for title, key in stat_cards:
     card = ctk.CTkFrame(stats_frame, fg_color="white", corner_radius=10,
                       border_width=1, border_color="#E5E5E5", width=150, height=100)
     card.pack(side="left", padx=10, expand=True, fill="both")
     
     ctk.CTkLabel(card, text=title, font=("Arial", 14, "bold"), 
                text_color="#2C3E50").pack(pady=(15, 5))
-    ctk.CTkLabel(card, text=value, font=("Arial", 24, "bold"), 
-               text_color="#2C3E50").pack(pady=(5, 15))
+    stat_value_labels[key] = ctk.CTkLabel(card, text="0", font=("Arial", 24, "bold"), 
+                                        text_color="#2C3E50")
+    stat_value_labels[key].pack(pady=(5, 15))
 
 # ----------------- Chart Section -----------------
 chart_frame = ctk.CTkFrame(content_frame, fg_color="white", corner_radius=10,
@@ -283,54 +308,34 @@ chart_header = ctk.CTkFrame(chart_frame, fg_color="white", height=40)
 chart_header.pack(fill="x", padx=20, pady=10)
 
 ctk.CTkLabel(chart_header, text="Revenue & Bookings Overview", 
-           font=("Arial", 18, "bold"), text_color="#2C3E50").pack(anchor="w")
-
-# Fetch chart data from database
-months, revenue, bookings = get_monthly_data()
-
-# Create matplotlib figure for the chart
-fig = Figure(figsize=(10, 4), dpi=100)
-ax = fig.add_subplot(111)
-
-# Plot revenue
-revenue_line, = ax.plot(months, revenue, marker='o', linewidth=2, color='#007BFF', label='Revenue ($)')
-
-# Create a second y-axis for bookings
-ax2 = ax.twinx()
-booking_line, = ax2.plot(months, bookings, marker='s', linewidth=2, color='#28A745', label='Bookings')
-
-# Add grid and legends
-ax.grid(True, linestyle='--', alpha=0.7)
-lines = [revenue_line, booking_line]
-labels = [line.get_label() for line in lines]
-ax.legend(lines, labels, loc='upper left')
+           font=("Arial", 18, "bold"), text_color="#2C3E50").pack(side="left")
 
-# Set labels and title
-ax.set_xlabel('Month')
-ax.set_ylabel('Revenue ($)', color='#007BFF')
-ax2.set_ylabel('Bookings', color='#28A745')
+# Chart range selector
+chart_range_var = ctk.StringVar(value=DEFAULT_CHART_RANGE)
+chart_range_dropdown = ctk.CTkComboBox(chart_header, values=list(CHART_RANGES), variable=chart_range_var,
+                                     width=150, command=lambda choice: draw_chart())
+chart_range_dropdown.pack(side="right")
 
-# Format the chart for better appearance
-ax.spines['top'].set_visible(False)
-ax.spines['right'].set_visible(False)
-ax2.spines['top'].set_visible(False)
-ax2.tick_params(axis='y', colors='#28A745')
-ax.tick_params(axis='y', colors='#007BFF')
+rebuild_btn = ctk.CTkButton(chart_header, text="Rebuild Analytics", font=("Arial", 12), 
+                          fg_color="#6C757D", hover_color="#5A6268",
+                          command=rebuild_analytics, width=130, height=28)
+rebuild_btn.pack(side="right", padx=(0, 10))
 
-# Format y-axis labels with commas for thousands
-ax.get_yaxis().set_major_formatter(matplotlib.ticker.FuncFormatter(lambda x, p: format(int(x), ',')))
+# Shown while dashboard data loads in the background
+chart_spinner = tasks.Spinner(chart_header, text="Loading...")
+chart_spinner.pack(side="right", padx=10)
 
-# Adjust margins
-fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.15)
+# Placeholder until the chart is built (see build_chart)
+chart_placeholder = ctk.CTkLabel(chart_frame, text="Loading chart...", font=("Arial", 14), text_color="gray")
+chart_placeholder.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-# Embed the chart in the tkinter window
-chart_canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-chart_canvas.draw()
-chart_canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=(0, 20))
+# Fetch stats and chart data in the background
+update_stat_cards()
+draw_chart()
 
 # Try to load admin session
 load_admin_session()
 
 # Run the application
 if __name__ == "__main__":
-    app.mainloop()
\ No newline at end of file
+    router.run("admin")
\ No newline at end of file
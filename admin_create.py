@@ -1,20 +1,8 @@
 import mysql.connector
-import hashlib
+from db import connect_db
+from credentials import hash_password
 import sys
 
-# Function to hash passwords
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
-# Database connection function
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="new_password",
-        database="hotel_book"
-    )
-
 # Function to add a new admin
 def add_admin(name, email, password):
     hashed_password = hash_password(password)
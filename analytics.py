@@ -0,0 +1,166 @@
+from db import connect_db
+from instrument import timed
+from datetime import date, timedelta
+import calendar
+import threading
+import time
+
+# ------------------- Period Grouping -------------------
+# SQL expression that maps a rollup day to the first day of its period
+PERIOD_SQL = {
+    "day": "d.Stat_Date",
+    "week": "DATE_SUB(d.Stat_Date, INTERVAL WEEKDAY(d.Stat_Date) DAY)",
+    "month": "DATE_SUB(d.Stat_Date, INTERVAL DAYOFMONTH(d.Stat_Date) - 1 DAY)",
+    "quarter": "MAKEDATE(YEAR(d.Stat_Date), 1) + INTERVAL QUARTER(d.Stat_Date) - 1 QUARTER",
+}
+
+def period_start(day, grouping):
+    """Return the first day of the period that contains day"""
+    if grouping == "day":
+        return day
+    if grouping == "week":
+        return day - timedelta(days=day.weekday())
+    if grouping == "month":
+        return day.replace(day=1)
+    if grouping == "quarter":
+        return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    raise ValueError(f"Unknown grouping: {grouping}")
+
+def next_period(start, grouping):
+    """Return the first day of the period after the one starting at start"""
+    if grouping == "day":
+        return start + timedelta(days=1)
+    if grouping == "week":
+        return start + timedelta(days=7)
+
+    months = 1 if grouping == "month" else 3
+    month = start.month - 1 + months
+    return date(start.year + month // 12, month % 12 + 1, 1)
+
+def period_label(start, grouping):
+    """Return the chart label for a period"""
+    if grouping in ("day", "week"):
+        return start.strftime("%b %d")
+    if grouping == "month":
+        return calendar.month_abbr[start.month]
+    return f"Q{(start.month - 1) // 3 + 1} {start.year}"
+
+def recent_periods(grouping, count, today=None):
+    """Return the (start, end) dates covering the last count periods up to today
+
+    end is exclusive, so the current period is included in full.
+    """
+    today = today or date.today()
+    end = next_period(period_start(today, grouping), grouping)
+
+    start = period_start(today, grouping)
+    for _ in range(count - 1):
+        start = period_start(start - timedelta(days=1), grouping)
+
+    return start, end
+
+# ------------------- Aggregation -------------------
+@timed()
+def get_period_totals(start, end, grouping="month"):
+    """Return bookings and revenue per period for check-ins in [start, end)
+
+    Runs a single GROUP BY query over the Daily_Rollup table (see rollup.py),
+    so the cost depends on the number of days rather than bookings, and fills
+    periods without bookings with zeros. Cancelled bookings are not counted.
+    Returns a list of (period_start, bookings, revenue) tuples.
+    """
+    if grouping not in PERIOD_SQL:
+        raise ValueError(f"Unknown grouping: {grouping}")
+
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"""
+            SELECT {PERIOD_SQL[grouping]} AS period, SUM(d.Bookings), SUM(d.Revenue)
+            FROM Daily_Rollup d
+            WHERE d.Stat_Date >= %s AND d.Stat_Date < %s
+            GROUP BY period
+            """,
+            (start, end)
+        )
+        rows = {period: (int(count), revenue or 0) for period, count, revenue in cursor.fetchall()}
+        cursor.close()
+    finally:
+        connection.close()
+
+    totals = []
+    current = period_start(start, grouping)
+    while current < end:
+        count, revenue = rows.get(current, (0, 0))
+        totals.append((current, count, revenue))
+        current = next_period(current, grouping)
+
+    return totals
+
+# ------------------- Dashboard Stats -------------------
+STATS_TTL = 60  # Seconds a stats snapshot is reused before it is recomputed
+
+_stats_lock = threading.Lock()
+_stats_snapshot = None
+_stats_loaded_at = 0.0
+_stats_generation = 0  # Bumped on every invalidation
+
+@timed()
+def load_dashboard_stats():
+    """Compute every dashboard KPI in a single round trip
+
+    Cancelled bookings are not counted, the same as in the chart (see
+    get_period_totals).
+    """
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            SELECT b.bookings, b.revenue,
+                   (SELECT COUNT(*) FROM Users),
+                   (SELECT COUNT(*) FROM Room)
+            FROM (SELECT COUNT(*) AS bookings, SUM(Total_Cost) AS revenue
+                  FROM Booking
+                  WHERE Booking_Status <> 'Cancelled') b
+            """
+        )
+        total_bookings, total_revenue, active_users, hotels_listed = cursor.fetchone()
+        cursor.close()
+    finally:
+        connection.close()
+
+    return {
+        "total_bookings": total_bookings,
+        "total_revenue": total_revenue if total_revenue else 0,
+        "active_users": active_users,
+        "hotels_listed": hotels_listed
+    }
+
+def get_dashboard_stats(ttl=STATS_TTL):
+    """Return the dashboard KPIs, reusing the cached snapshot while it is fresh"""
+    global _stats_snapshot, _stats_loaded_at
+
+    with _stats_lock:
+        if _stats_snapshot is not None and time.monotonic() - _stats_loaded_at < ttl:
+            return dict(_stats_snapshot)
+        generation = _stats_generation
+
+    snapshot = load_dashboard_stats()
+
+    with _stats_lock:
+        # Don't cache a snapshot that was computed before a write invalidated it
+        if generation == _stats_generation:
+            _stats_snapshot = snapshot
+            _stats_loaded_at = time.monotonic()
+
+    return dict(snapshot)
+
+def invalidate_dashboard_stats():
+    """Drop the cached snapshot; call after writes to Booking, Users or Room"""
+    global _stats_snapshot, _stats_generation
+
+    with _stats_lock:
+        _stats_snapshot = None
+        _stats_generation += 1
@@ -0,0 +1,273 @@
+import mysql.connector
+from db import connect_db, pool_stats
+from datetime import date, timedelta
+from booking_queries import load_bookings, load_booking_details, load_status_counts
+from user_queries import load_users, load_user_details
+from user_index import UserIndex
+from analytics import get_period_totals, recent_periods, load_dashboard_stats
+from search import SearchIndex
+from inventory import invalidate_inventory
+from generate_data import CITIES, LAST_NAMES
+import instrument
+import reservations
+import rollup
+import user_counters
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+# ------------------- Application Benchmark Harness -------------------
+# Times the data functions behind the pages headlessly (no windows are
+# opened) against the configured database, e.g. after loading a dataset with
+# generate_data.py:
+#   - Manage Bookings: load_bookings() first page, search, status and date
+#     filters, following the keyset cursor deep into the list, status
+#     counts, details
+#   - Dashboard: the chart totals for each range and the stat cards
+#   - Manage Users: load_users(), load_user_details(), building the user
+#     index and searching it as a term is typed
+#   - Home: building the search index and searching hotels
+#   - Booking: book_room() confirmations (removed again afterwards)
+# Each benchmark runs once to warm up and then --runs times. Results are
+# written as JSON so runs on different datasets or commits can be compared
+# with --compare.
+#
+# Usage: python bench_app.py [--runs 20] [--output bench_results.json] [--compare old.json]
+
+CHART_RANGES = [("day", 30), ("week", 12), ("month", 12), ("quarter", 8)]  # Same ranges as the dashboard
+BOOKING_DATES_FROM = 3000  # Benchmark bookings are made this many days ahead, where every room is free
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction of a sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def measure(func, runs):
+    """Call func() once to warm up and then runs times; returns timing stats
+
+    func returns the number of rows (or results) it produced.
+    """
+    func()
+    latencies, rows = [], 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        rows = func()
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "runs": runs,
+        "mean_ms": round(sum(latencies) / runs, 3),
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "min_ms": round(latencies[0], 3),
+        "max_ms": round(latencies[-1], 3),
+        "rows": rows,
+    }
+
+def dataset_info():
+    """Return the row counts of the main tables and the server version"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        info = {}
+        for table in ("Users", "Hotel", "Room", "Booking", "Room_Night", "Daily_Rollup"):
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            info[table] = cursor.fetchone()[0]
+        cursor.execute("SELECT MIN(Booking_ID), MAX(Booking_ID) FROM Booking")
+        info["booking_ids"] = cursor.fetchone()
+        cursor.execute("SELECT MIN(user_id), MAX(user_id) FROM Users")
+        info["user_ids"] = cursor.fetchone()
+        cursor.execute("SELECT Room_Type FROM Room WHERE Availability_status = 'Available' LIMIT 1")
+        row = cursor.fetchone()
+        info["room_type"] = row[0] if row else None
+        info["server"] = connection.get_server_info()
+        cursor.close()
+        return info
+    finally:
+        connection.close()
+
+def random_id(id_range):
+    low, high = id_range
+    return random.randint(low, high) if low is not None else 0
+
+# ------------------- Benchmarks -------------------
+def bench_bookings(results, runs, info):
+    results["load_bookings.first_page"] = measure(lambda: len(load_bookings()[0]), runs)
+    results["load_bookings.search"] = measure(
+        lambda: len(load_bookings({"search_term": random.choice(LAST_NAMES)})[0]), runs)
+    results["load_bookings.status"] = measure(
+        lambda: len(load_bookings({"status": random.choice(["Pending", "Confirmed", "Cancelled"])})[0]), runs)
+
+    def date_range():
+        start = date.today() - timedelta(days=random.randrange(365))
+        return len(load_bookings({"start_date": start, "end_date": start + timedelta(days=30)})[0])
+    results["load_bookings.date_range"] = measure(date_range, runs)
+
+    def deep_pages(pages=10):
+        after, rows = None, 0
+        for _ in range(pages):
+            bookings, after = load_bookings({"sort": "Highest Amount"}, after)
+            rows += len(bookings)
+            if after is None:
+                break
+        return rows
+    results["load_bookings.ten_pages"] = measure(deep_pages, runs)
+
+    results["load_status_counts"] = measure(lambda: sum(load_status_counts().values()), runs)
+    results["load_status_counts.search"] = measure(
+        lambda: sum(load_status_counts({"search_term": random.choice(LAST_NAMES)}).values()), runs)
+
+    results["load_booking_details"] = measure(
+        lambda: int(load_booking_details(random_id(info["booking_ids"])) is not None), runs)
+
+def bench_dashboard(results, runs):
+    for grouping, count in CHART_RANGES:
+        def chart(grouping=grouping, count=count):
+            start, end = recent_periods(grouping, count)
+            return len(get_period_totals(start, end, grouping))
+        results[f"get_monthly_data.{grouping}"] = measure(chart, runs)
+    results["dashboard_stats"] = measure(lambda: len(load_dashboard_stats()), runs)
+
+def bench_users(results, runs, info):
+    users = load_users()
+    results["load_users"] = measure(lambda: len(load_users()), max(1, runs // 4))
+    results["load_user_details"] = measure(
+        lambda: int(load_user_details(random_id(info["user_ids"])) is not None), runs)
+
+    index = UserIndex()
+    results["user_index.build"] = measure(lambda: index.build(users) or len(users), max(1, runs // 4))
+
+    def typing():
+        # Type a last name one key at a time, narrowing like the page does
+        term = random.choice(LAST_NAMES).lower()
+        found, previous = [], None
+        for end in range(1, len(term) + 1):
+            found = index.search(term[:end], previous)
+            previous = found
+        return len(found)
+    results["search_users.typing"] = measure(typing, runs)
+
+def bench_search(results, runs):
+    index = SearchIndex()
+    results["search_index.load"] = measure(lambda: index.load() or len(index.hotels), max(1, runs // 4))
+
+    def search():
+        city, _ = random.choice(CITIES)
+        check_in = date.today() + timedelta(days=random.randrange(90))
+        return len(index.search(city, check_in, check_in + timedelta(days=random.randint(1, 5)),
+                                random.randint(1, 4)))
+    results["search_rooms"] = measure(search, runs)
+
+def bench_booking(results, runs, info):
+    """Time book_room() confirmations, then remove the bookings they made"""
+    if not info["room_type"] or info["user_ids"][0] is None:
+        return
+    user_id = info["user_ids"][0]
+    made = []
+    offset = iter(range(BOOKING_DATES_FROM, BOOKING_DATES_FROM + 10 * (runs + 1), 10))
+
+    def confirm():
+        check_in = date.today() + timedelta(days=next(offset))
+        booked = reservations.book_room(user_id, info["room_type"], check_in,
+                                        check_in + timedelta(days=2), 200)
+        if booked:
+            made.append(booked[0])
+        return int(booked is not None)
+
+    try:
+        results["book_room"] = measure(confirm, runs)
+    finally:
+        remove_bookings(made)
+
+def remove_bookings(booking_ids):
+    """Delete bookings made by the benchmark, keeping the rollup and user counters right"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        for booking_id in booking_ids:
+            cursor.execute("SELECT User_ID, Total_Cost, Booking_Status FROM Booking WHERE Booking_ID = %s FOR UPDATE",
+                           (booking_id,))
+            row = cursor.fetchone()
+            if not row:
+                continue
+            user_id, total_cost, status = row
+            if status != "Cancelled":
+                rollup.apply_booking(cursor, booking_id, -1)
+            user_counters.apply_booking(cursor, user_id, total_cost, -1)
+            cursor.execute("DELETE FROM Booking WHERE Booking_ID = %s", (booking_id,))
+            connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+    invalidate_inventory()
+
+# ------------------- Running and Comparing -------------------
+def run(runs, seed, label=None):
+    """Run every benchmark and return the results document"""
+    random.seed(seed)
+    instrument.reset()
+    info = dataset_info()
+    results = {}
+
+    started = time.perf_counter()
+    for name, bench in (("bookings", lambda: bench_bookings(results, runs, info)),
+                        ("dashboard", lambda: bench_dashboard(results, runs)),
+                        ("users", lambda: bench_users(results, runs, info)),
+                        ("search", lambda: bench_search(results, runs)),
+                        ("booking", lambda: bench_booking(results, runs, info))):
+        print(f"Running {name} benchmarks...")
+        bench()
+
+    metrics = instrument.snapshot()
+    return {
+        "label": label,
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "runs": runs,
+        "seed": seed,
+        "elapsed_s": round(time.perf_counter() - started, 2),
+        "dataset": {key: value for key, value in info.items() if key not in ("booking_ids", "user_ids", "room_type")},
+        "results": results,
+        "queries": dict(list(metrics["queries"].items())[:25]),
+        "pool": pool_stats(),
+    }
+
+def print_results(document, previous=None):
+    """Print the results, with the change in p50 against an earlier run if given"""
+    print(f"\nDataset: {document['dataset']}")
+    print(f"{'Benchmark':<28} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'rows':>7}" +
+          (f" {'p50 vs old':>11}" if previous else ""))
+    for name, stats in document["results"].items():
+        line = f"{name:<28} {stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['max_ms']:>9} {stats['rows']:>7}"
+        old = previous["results"].get(name) if previous else None
+        if old and old["p50_ms"]:
+            line += f" {(stats['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100:>+10.1f}%"
+        print(line)
+
+# Direct execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless benchmark of the app's data functions")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--label", help="name stored with the results (e.g. a commit or dataset size)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    try:
+        document = run(args.runs, args.seed, args.label)
+    except mysql.connector.Error as err:
+        print(f"Database Error: {err}")
+        sys.exit(1)
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(document, output, indent=2, default=str)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as old:
+            previous = json.load(old)
+    print_results(document, previous)
+    print(f"\nResults written to {args.output}")
@@ -0,0 +1,154 @@
+import mysql.connector
+import db
+from db import connect_db
+from datetime import date, timedelta
+from inventory import invalidate_inventory
+import reservations
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+
+# ------------------- Concurrent Booking Stress Test -------------------
+# Starts N writer threads that all book the same few rooms for random,
+# overlapping date ranges through reservations.book_room(), then checks the
+# database for overlapping stays. Every request is also sent a second time
+# with the same idempotency key, which must return the original booking.
+#
+# Usage: python bench_booking.py [--writers 8] [--requests 50] [--rooms 5] [--days 60]
+#
+# The test rooms, user and their bookings are removed afterwards.
+
+BENCH_ROOM_TYPE = "Stress Test Room"
+BENCH_EMAIL = "stress-test@example.invalid"
+
+def setup(rooms):
+    """Create the test user and rooms; returns the user ID"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            INSERT INTO Users (first_name, last_name, email, password)
+            VALUES ('Stress', 'Test', %s, '-')
+            """,
+            (BENCH_EMAIL,)
+        )
+        user_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO Room (Room_Type, Price_per_Night, Availability_status) VALUES (%s, %s, 'Available')",
+            [(BENCH_ROOM_TYPE, 100)] * rooms
+        )
+        connection.commit()
+        cursor.close()
+        return user_id
+    finally:
+        connection.close()
+
+def cleanup():
+    """Remove everything the test created (bookings and nights cascade)"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("DELETE FROM Users WHERE email = %s", (BENCH_EMAIL,))
+        cursor.execute("DELETE FROM Room WHERE Room_Type = %s", (BENCH_ROOM_TYPE,))
+        cursor.execute("DELETE FROM Daily_Rollup WHERE Room_Type = %s", (BENCH_ROOM_TYPE,))
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+    invalidate_inventory()
+
+def count_double_bookings(user_id):
+    """Return the number of pairs of test bookings that share a room night"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            SELECT COUNT(*)
+            FROM Booking a
+            JOIN Booking b ON a.Room_ID = b.Room_ID AND a.Booking_ID < b.Booking_ID
+             AND a.Check_IN_Date < b.Check_Out_Date AND b.Check_IN_Date < a.Check_Out_Date
+            WHERE a.User_ID = %s AND b.User_ID = %s
+              AND a.Booking_Status <> 'Cancelled' AND b.Booking_Status <> 'Cancelled'
+            """,
+            (user_id, user_id)
+        )
+        overlaps = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM Booking WHERE User_ID = %s", (user_id,))
+        total = cursor.fetchone()[0]
+        cursor.close()
+        return overlaps, total
+    finally:
+        connection.close()
+
+def writer(user_id, requests, days, results, errors):
+    """Book random stays, sending each request twice with the same key"""
+    first_day = date.today() + timedelta(days=1)
+    for _ in range(requests):
+        check_in = first_day + timedelta(days=random.randrange(days))
+        check_out = check_in + timedelta(days=random.randint(1, 4))
+        key = uuid.uuid4().hex
+        try:
+            first = reservations.book_room(user_id, BENCH_ROOM_TYPE, check_in, check_out, 100, idempotency_key=key)
+            repeat = reservations.book_room(user_id, BENCH_ROOM_TYPE, check_in, check_out, 100, idempotency_key=key)
+        except mysql.connector.Error as err:
+            errors.append(str(err))
+            continue
+        results.append((first, repeat))
+
+def run(writers, requests, rooms, days):
+    """Run the stress test and print the results"""
+    # One connection per writer so the pool itself isn't the bottleneck
+    db._pool = db.ConnectionPool(db.DB_CONFIG, size=writers + 1)
+
+    cleanup()
+    user_id = setup(rooms)
+    invalidate_inventory()
+
+    results, errors = [], []
+    threads = [threading.Thread(target=writer, args=(user_id, requests, days, results, errors))
+               for _ in range(writers)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    overlaps, total = count_double_bookings(user_id)
+    booked = sum(1 for first, _ in results if first)
+    mismatched = sum(1 for first, repeat in results if first != repeat)
+
+    print(f"Writers:            {writers} x {requests} requests ({rooms} rooms, {days} days)")
+    print(f"Booked:             {booked} ({len(results) - booked} sold out)")
+    print(f"Bookings in DB:     {total}")
+    print(f"Double bookings:    {overlaps}")
+    print(f"Idempotency errors: {mismatched + (total - booked)}")
+    print(f"Errors:             {len(errors)}")
+    print(f"Counters:           {reservations.stats}")
+    print(f"Throughput:         {booked / elapsed:.1f} bookings/sec ({elapsed:.2f} s)")
+
+    cleanup()
+    return overlaps == 0 and mismatched == 0 and total == booked and not errors
+
+# Direct execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent booking stress test")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--rooms", type=int, default=5)
+    parser.add_argument("--days", type=int, default=60)
+    args = parser.parse_args()
+
+    try:
+        ok = run(args.writers, args.requests, args.rooms, args.days)
+    except mysql.connector.Error as err:
+        print(f"Database Error: {err}")
+        ok = False
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
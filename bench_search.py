@@ -0,0 +1,120 @@
+from search import SearchIndex
+from inventory import RoomInventory
+from generate_data import CITIES, NAME_WORDS, HOTEL_KINDS, ROOM_TYPES
+from datetime import date, timedelta
+import argparse
+import random
+import sys
+import time
+
+# ------------------- Search Latency Benchmark -------------------
+# Builds a SearchIndex over synthetic hotels and rooms (no database needed),
+# books a share of the room nights in a RoomInventory, then times searches
+# by city, state, hotel name and partially typed words with random dates
+# and guest counts.
+#
+# Usage: python bench_search.py [--rooms 100000] [--queries 2000] [--target-ms 20]
+
+def generate_rows(room_count, rooms_per_hotel):
+    """Return (rows, hotel_count) in the shape SearchIndex.build() expects"""
+    rows = []
+    hotel_id = 0
+    room_id = 0
+    while room_id < room_count:
+        hotel_id += 1
+        city, state = random.choice(CITIES)
+        name = f"{random.choice(NAME_WORDS)} {random.choice(NAME_WORDS)} {random.choice(HOTEL_KINDS)}"
+        stars = random.randint(2, 5)
+        for _ in range(min(rooms_per_hotel, room_count - room_id)):
+            room_id += 1
+            room_type, max_guests, base_price = random.choice(ROOM_TYPES)
+            price = round(base_price * (0.6 + stars * 0.2) * random.uniform(0.9, 1.1), 2)
+            rows.append((room_id, room_type, price, max_guests, hotel_id, name, f"{city}, {state}", stars))
+    return rows, hotel_id
+
+def book_randomly(inventory, room_count, days, occupancy):
+    """Fill the inventory with back-to-back stays until about occupancy of the nights are sold"""
+    first_day = date.today()
+    booking_id = 0
+    for room_id in range(1, room_count + 1):
+        day = 0
+        while day < days:
+            stay = random.randint(1, 5)
+            if random.random() < occupancy:
+                booking_id += 1
+                check_in = first_day + timedelta(days=day)
+                inventory.add_booking(booking_id, room_id, check_in, check_in + timedelta(days=stay))
+            day += stay
+    return booking_id
+
+def random_query():
+    """Return a search term like the ones typed into the home page"""
+    city, state = random.choice(CITIES)
+    kind = random.random()
+    if kind < 0.4:
+        return city
+    if kind < 0.55:
+        return state
+    if kind < 0.7:
+        return f"{city} {state}"
+    if kind < 0.85:
+        return f"{random.choice(NAME_WORDS)} {random.choice(HOTEL_KINDS)}"
+    # Partially typed city
+    return city[:max(3, len(city) // 2)]
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction of a sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def run(room_count, rooms_per_hotel, query_count, days, occupancy, target_ms):
+    """Run the benchmark and print the latency distribution"""
+    random.seed(42)
+
+    rows, hotel_count = generate_rows(room_count, rooms_per_hotel)
+    started = time.perf_counter()
+    index = SearchIndex()
+    index.build(rows)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    inventory = RoomInventory()
+    bookings = book_randomly(inventory, room_count, days, occupancy)
+
+    latencies = []
+    result_counts = []
+    first_day = date.today()
+    for _ in range(query_count):
+        check_in = first_day + timedelta(days=random.randrange(days - 7))
+        check_out = check_in + timedelta(days=random.randint(1, 7))
+        guests = random.randint(1, 4)
+        query = random_query()
+
+        started = time.perf_counter()
+        results = index.search(query, check_in, check_out, guests, inventory=inventory)
+        latencies.append((time.perf_counter() - started) * 1000)
+        result_counts.append(len(results))
+
+    latencies.sort()
+    p99 = percentile(latencies, 0.99)
+
+    print(f"Index:    {room_count} rooms in {hotel_count} hotels, {len(index.tokens)} tokens, built in {build_ms:.0f} ms")
+    print(f"Bookings: {bookings} over {days} days")
+    print(f"Queries:  {query_count}, avg {sum(result_counts) / len(result_counts):.1f} results")
+    print(f"Latency:  p50 {percentile(latencies, 0.5):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, "
+          f"p99 {p99:.2f} ms, max {latencies[-1]:.2f} ms")
+    print(f"Target:   p99 < {target_ms} ms")
+    return p99 < target_ms
+
+# Direct execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hotel search latency benchmark")
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--rooms-per-hotel", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--occupancy", type=float, default=0.6)
+    parser.add_argument("--target-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    ok = run(args.rooms, args.rooms_per_hotel, args.queries, args.days, args.occupancy, args.target_ms)
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
@@ -1,70 +1,40 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import mysql.connector
-import subprocess
+from db import connect_db
+from instrument import timed
+from analytics import invalidate_dashboard_stats
+from reservations import book_room
+import router
+import session
+import tasks
 import sys
 from datetime import datetime, timedelta
 import os
-from tkcalendar import DateEntry  # You may need to install this: pip install tkcalendar
-
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",  # Replace with your MySQL username
-        password="new_password",  # Replace with your MySQL password
-        database="hotel_book"  # Replace with your database name
-    )
+import hashlib
+import uuid
+from date_picker import DatePicker
 
 # ------------------- Global Variables -------------------
 current_user = None
 hotel_id = None
 room_id = None
 room_prices = {}  # To store room prices for calculation
+booking_form_token = uuid.uuid4().hex  # Renewed after every successful booking
 
 # ------------------- User Session Management -------------------
 def load_user_session():
-    """Load user information from database"""
+    """Load the logged-in user's profile from the signed session token"""
     global current_user
     
-    # Check if any user_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-            
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                return True
-                
-        except (ValueError, IndexError, mysql.connector.Error) as err:
-            print(f"Error loading user session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    # The token is checked locally (no database round trip)
+    current_user = session.current("user")
+    return current_user is not None
 
 # ------------------- Navigation Functions -------------------
 def open_page(page_name):
-    """Open another page and close the current one"""
+    """Switch to another page in the same window"""
     try:
-        # Pass the current user ID to the next page if a user is logged in
-        user_param = [str(current_user['user_id'])] if current_user else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + user_param
-        
-        subprocess.Popen(command)
-        app.destroy()  # Close the current window
+        router.show(page_name)
     except Exception as e:
         messagebox.showerror("Navigation Error", f"Unable to open {page_name} page: {e}")
 
@@ -84,16 +54,21 @@ def logout():
     """Log out the current user and return to login page"""
     global current_user
     current_user = None
-    open_page("login")
+    router.logout("login")
 
 # ------------------- Hotel & Room Functions -------------------
 def load_hotel_details(hotel_id_param=None):
-    """Load hotel details from database"""
+    """Load hotel details from database in the background"""
     global hotel_id
     
-    # Use parameter or check command line arguments
+    # Room picked from the home page search results, if any
+    request = router.session.pop("booking_request", None)
+    
+    # Use parameter, the searched room or check command line arguments
     if hotel_id_param:
         hotel_id = hotel_id_param
+    elif request:
+        hotel_id = request["room_id"]
     elif len(sys.argv) > 2:
         try:
             hotel_id = int(sys.argv[2])
@@ -104,6 +79,15 @@ def load_hotel_details(hotel_id_param=None):
         # Default hotel ID if none provided
         hotel_id = 1
     
+    tasks.submit(fetch_hotel_details, hotel_id, key="hotel_details", spinner=booking_spinner,
+                 on_success=lambda result: show_hotel_details(result, request))
+
+@timed()
+def fetch_hotel_details(hotel_id):
+    """Load the room and the bookable room types (runs on a worker thread, errors are raised)
+
+    Returns (hotel_data, room_types); hotel_data is None if the room doesn't exist.
+    """
     try:
         connection = connect_db()
         cursor = connection.cursor(dictionary=True)
@@ -118,50 +102,83 @@ def load_hotel_details(hotel_id_param=None):
             (hotel_id,)
         )
         hotel_data = cursor.fetchone()
+        if not hotel_data:
+            return None, []
+        
+        # Load available room types for this hotel
+        # Availability depends on the dates, so it is checked when the booking is confirmed
+        cursor.execute(
+            """
+            SELECT Room_Type, MIN(Price_per_Night) AS Price_per_Night
+            FROM Room 
+            WHERE Availability_status = 'Available'
+            GROUP BY Room_Type
+            ORDER BY Price_per_Night
+            """
+        )
+        return hotel_data, cursor.fetchall()
         
-        if hotel_data:
-            # Set hotel name and location (adjust based on your schema)
-            hotel_name_label.configure(text=f"{hotel_data['Room_Type']}")
-            hotel_location_label.configure(text=f"📍 123 Main Street, Mt. Pleasant, Michigan")
-            
-            # Load available room types for this hotel
-            cursor.execute(
-                """
-                SELECT Room_ID, Room_Type, Price_per_Night 
-                FROM Room 
-                WHERE Availability_status = 'Available'
-                """
-            )
-            room_types = cursor.fetchall()
-            
-            # Store room prices for calculation
-            global room_prices
-            room_prices = {room['Room_Type']: room['Price_per_Night'] for room in room_types}
-            
-            # Format room types for dropdown
-            room_type_options = [f"{room['Room_Type']} - ${room['Price_per_Night']}/night" for room in room_types]
-            
-            if room_type_options:
-                room_type_dropdown.configure(values=room_type_options)
-                room_type_dropdown.set(room_type_options[0])
-                
-                # Set default values in summary
-                update_booking_summary()
-            else:
-                room_type_dropdown.configure(values=["No rooms available"])
-                room_type_dropdown.set("No rooms available")
-                
-        else:
-            messagebox.showerror("Error", "Hotel not found")
-            go_to_home()
-            
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
+def show_hotel_details(result, request=None):
+    """Fill the page with the details loaded by fetch_hotel_details()"""
+    global room_prices
+    
+    hotel_data, room_types = result
+    if not hotel_data:
+        messagebox.showerror("Error", "Hotel not found")
+        go_to_home()
+        return
+    
+    # Set hotel name and location (adjust based on your schema)
+    hotel_name_label.configure(text=f"{hotel_data['Room_Type']}")
+    hotel_location_label.configure(text=f"📍 123 Main Street, Mt. Pleasant, Michigan")
+    
+    # Store room prices for calculation
+    room_prices = {room['Room_Type']: room['Price_per_Night'] for room in room_types}
+    
+    # Format room types for dropdown
+    room_type_options = [f"{room['Room_Type']} - ${room['Price_per_Night']}/night" for room in room_types]
+    
+    if room_type_options:
+        room_type_dropdown.configure(values=room_type_options)
+        room_type_dropdown.set(room_type_options[0])
+        
+        # Set default values in summary
+        update_booking_summary()
+    else:
+        room_type_dropdown.configure(values=["No rooms available"])
+        room_type_dropdown.set("No rooms available")
+    
+    if request:
+        apply_booking_request(request)
+
+def set_entry_date(entry, value):
+    """Show a date in a DateEntry or in the plain-entry fallback"""
+    if hasattr(entry, 'set_date'):
+        entry.set_date(value)
+    else:
+        entry.delete(0, "end")
+        entry.insert(0, value.strftime("%m/%d/%Y"))
+
+def apply_booking_request(request):
+    """Fill the form with the room type, dates and guests chosen in the search"""
+    for option in room_type_dropdown.cget("values"):
+        if option.startswith(f"{request['room_type']} - $"):
+            room_type_dropdown.set(option)
+            break
+    
+    if request.get("check_in") and request.get("check_out"):
+        set_entry_date(checkin_entry, request["check_in"])
+        set_entry_date(checkout_entry, request["check_out"])
+    
+    guests_entry.delete(0, "end")
+    guests_entry.insert(0, str(request.get("guests", 1)))
+    update_booking_summary()
+
 # ------------------- Booking Functions -------------------
 def calculate_total_price():
     """Calculate the total price based on room type and nights"""
@@ -230,6 +247,16 @@ def update_booking_summary(event=None):
     summary_nights_label.configure(text=f"Total Nights: {nights if nights else 0}")
     summary_total_label.configure(text=f"Total Price: ${total_price if total_price else 0}")
 
+def booking_idempotency_key(room_type, check_in, check_out):
+    """Key that identifies this booking request, so a repeated confirm can't book twice"""
+    request = f"{booking_form_token}|{current_user['user_id']}|{room_type}|{check_in:%Y-%m-%d}|{check_out:%Y-%m-%d}"
+    return hashlib.sha256(request.encode()).hexdigest()
+
+def new_booking_form():
+    """Start a new booking request after the previous one went through"""
+    global booking_form_token
+    booking_form_token = uuid.uuid4().hex
+
 def confirm_booking():
     """Process the booking confirmation"""
     # Check if user is logged in
@@ -300,62 +327,38 @@ def confirm_booking():
     if not confirm:
         return
     
-    # Save booking to database
-    try:
-        connection = connect_db()
-        cursor = connection.cursor()
-        
-        # Get room ID for the selected room type
-        cursor.execute(
-            "SELECT Room_ID FROM Room WHERE Room_Type = %s AND Availability_status = 'Available' LIMIT 1",
-            (room_type,)
-        )
-        room_result = cursor.fetchone()
-        
-        if not room_result:
-            messagebox.showerror("Booking Error", "Selected room is no longer available")
-            return
-            
-        room_id = room_result[0]
-        
-        # Insert booking record
-        cursor.execute(
-            """
-            INSERT INTO Booking (User_ID, Room_ID, Check_IN_Date, Check_Out_Date, 
-                               Total_Cost, Booking_Status)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """,
-            (current_user['user_id'], room_id, check_in.strftime('%Y-%m-%d'), 
-             check_out.strftime('%Y-%m-%d'), total_price, 'Confirmed')
-        )
-        
-        # Update room availability
-        cursor.execute(
-            "UPDATE Room SET Availability_status = 'Booked' WHERE Room_ID = %s",
-            (room_id,)
-        )
-        
-        connection.commit()
-        messagebox.showinfo("Success", "Booking confirmed successfully!")
-        
-        # Go to bookings page
-        go_to_bookings()
-        
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+    # Save booking to database in the background (picks a room of this type that is
+    # free for these dates; under contention it waits and retries)
+    confirm_btn.configure(state="disabled")
+    tasks.submit(book_room, current_user['user_id'], room_type, check_in, check_out, total_price,
+                 idempotency_key=booking_idempotency_key(room_type, check_in, check_out),
+                 key="confirm_booking", spinner=booking_spinner,
+                 on_success=lambda booking: booking_finished(booking, room_type, check_in, check_out),
+                 on_error=booking_failed)
+
+def booking_finished(booking, room_type, check_in, check_out):
+    """Report the result of book_room() once it is done"""
+    confirm_btn.configure(state="normal")
+    
+    if not booking:
+        messagebox.showerror("Booking Error", 
+                           f"No {room_type} room is available from {check_in.strftime('%m/%d/%Y')} "
+                           f"to {check_out.strftime('%m/%d/%Y')}")
+        return
+    
+    new_booking_form()
+    invalidate_dashboard_stats()
+    messagebox.showinfo("Success", "Booking confirmed successfully!")
+    
+    # Go to bookings page
+    go_to_bookings()
 
-# ----------------- Initialize App -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
+def booking_failed(error):
+    confirm_btn.configure(state="normal")
+    tasks.show_error(error)
 
-app = ctk.CTk()
-app.title("Hotel Booking - Room Reservation")
-app.geometry("1200x700")
-app.resizable(False, False)
+# ----------------- Initialize App -----------------
+app = router.get_app()
 
 # Try to load user session
 if not load_user_session():
@@ -363,8 +366,8 @@ if not load_user_session():
     open_page("login")
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("book", "Hotel Booking - Room Reservation", "1200x700",
+                                on_show=load_hotel_details)
 
 # ----------------- Sidebar (Navigation) -----------------
 sidebar = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=200, corner_radius=0)
@@ -433,37 +436,21 @@ form_content.pack(fill="both", expand=True, padx=20, pady=10)
 checkin_label = ctk.CTkLabel(form_content, text="Check-in Date", font=("Arial", 14, "bold"))
 checkin_label.grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
 
-try:
-    # Try to use DateEntry
-    checkin_entry = DateEntry(form_content, width=12, background='darkblue',
-                            foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
-    checkin_entry.grid(row=1, column=0, sticky="w", padx=10, pady=(0, 15))
-    # Set today as default
-    checkin_entry.set_date(datetime.today())
-except:
-    # Fallback to standard entry
-    checkin_entry = ctk.CTkEntry(form_content, width=220, placeholder_text="mm/dd/yyyy")
-    checkin_entry.grid(row=1, column=0, sticky="w", padx=10, pady=(0, 15))
-    # Set today as default
-    checkin_entry.insert(0, datetime.today().strftime("%m/%d/%Y"))
+# Date picker (tkcalendar is loaded after the page is drawn, see date_picker.py), today by default
+checkin_entry = DatePicker(form_content, width=12, entry_width=220, background='darkblue',
+                           foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy',
+                           value=datetime.today())
+checkin_entry.grid(row=1, column=0, sticky="w", padx=10, pady=(0, 15))
 
 # Check-out Date
 checkout_label = ctk.CTkLabel(form_content, text="Check-out Date", font=("Arial", 14, "bold"))
 checkout_label.grid(row=0, column=1, sticky="w", padx=10, pady=(10, 5))
 
-try:
-    # Try to use DateEntry
-    checkout_entry = DateEntry(form_content, width=12, background='darkblue',
-                             foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
-    checkout_entry.grid(row=1, column=1, sticky="w", padx=10, pady=(0, 15))
-    # Set tomorrow as default
-    checkout_entry.set_date(datetime.today() + timedelta(days=1))
-except:
-    # Fallback to standard entry
-    checkout_entry = ctk.CTkEntry(form_content, width=220, placeholder_text="mm/dd/yyyy")
-    checkout_entry.grid(row=1, column=1, sticky="w", padx=10, pady=(0, 15))
-    # Set tomorrow as default
-    checkout_entry.insert(0, (datetime.today() + timedelta(days=1)).strftime("%m/%d/%Y"))
+# Tomorrow by default
+checkout_entry = DatePicker(form_content, width=12, entry_width=220, background='darkblue',
+                            foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy',
+                            value=datetime.today() + timedelta(days=1))
+checkout_entry.grid(row=1, column=1, sticky="w", padx=10, pady=(0, 15))
 
 # Guests
 guests_label = ctk.CTkLabel(form_content, text="Guests", font=("Arial", 14, "bold"))
@@ -503,7 +490,11 @@ confirm_btn = ctk.CTkButton(form_content, text="Confirm Booking",
                           fg_color="#FFC107", text_color="black", 
                           hover_color="#FFD54F",
                           height=45, width=280, command=confirm_booking)
-confirm_btn.grid(row=6, column=0, columnspan=2, pady=30)
+confirm_btn.grid(row=6, column=0, columnspan=2, pady=(30, 5))
+
+# Shown while the room is loaded and while a booking is being made
+booking_spinner = tasks.Spinner(form_content)
+booking_spinner.grid(row=7, column=0, columnspan=2, pady=(0, 20))
 
 # Right side - Booking Summary
 summary_frame = ctk.CTkFrame(booking_container, fg_color="white", border_width=1, 
@@ -556,4 +547,4 @@ load_hotel_details()
 
 # Run the application
 if __name__ == "__main__":
-    app.mainloop()
\ No newline at end of file
+    router.run("book")
\ No newline at end of file
@@ -0,0 +1,195 @@
+from db import connect_db
+from instrument import timed
+
+# ------------------- Booking List Query Builder -------------------
+# Builds the SQL behind the Manage Bookings table so that search, date range,
+# status, sort order and pagination all run in MySQL and only one page of
+# rows is ever sent back.
+
+BOOKING_PAGE_SIZE = 50
+
+# Sort option -> (SQL column, result key, direction)
+# Booking_ID is always the tie-breaker so every row has a unique position.
+SORT_ORDERS = {
+    "Newest Check-in": ("b.Check_IN_Date", "Check_IN_Date", "DESC"),
+    "Oldest Check-in": ("b.Check_IN_Date", "Check_IN_Date", "ASC"),
+    "Highest Amount": ("b.Total_Cost", "Total_Cost", "DESC"),
+    "Lowest Amount": ("b.Total_Cost", "Total_Cost", "ASC"),
+}
+DEFAULT_SORT = "Newest Check-in"
+
+BOOKING_COLUMNS = """
+    SELECT b.Booking_ID, CONCAT(u.first_name, ' ', u.last_name) AS Customer,
+           r.Room_Type, b.Check_IN_Date, b.Check_Out_Date,
+           b.Total_Cost, b.Booking_Status
+    FROM Booking b
+    JOIN Users u ON b.User_ID = u.user_id
+    JOIN Room r ON b.Room_ID = r.Room_ID
+"""
+
+def escape_like(term):
+    """Escape LIKE wildcards so the search term is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def build_booking_filters(search_term="", start_date=None, end_date=None, status="All"):
+    """Build the WHERE conditions and parameters for the booking filters"""
+    conditions = []
+    params = []
+
+    if search_term:
+        pattern = f"%{escape_like(search_term)}%"
+        conditions.append("(CONCAT(u.first_name, ' ', u.last_name) LIKE %s OR r.Room_Type LIKE %s)")
+        params.extend([pattern, pattern])
+
+    if start_date:
+        conditions.append("b.Check_IN_Date >= %s")
+        params.append(start_date)
+
+    if end_date:
+        conditions.append("b.Check_IN_Date <= %s")
+        params.append(end_date)
+
+    if status and status != "All":
+        conditions.append("b.Booking_Status = %s")
+        params.append(status)
+
+    return conditions, params
+
+def build_booking_query(search_term="", start_date=None, end_date=None, status="All",
+                        sort=DEFAULT_SORT, after=None, limit=BOOKING_PAGE_SIZE):
+    """Build the SQL and parameters for one page of the filtered booking list
+
+    after is the keyset cursor returned by keyset_cursor() for the last row
+    of the previous page, or None for the first page. With limit=None the
+    whole filtered list is selected (used by the export).
+    """
+    column, _, direction = SORT_ORDERS.get(sort, SORT_ORDERS[DEFAULT_SORT])
+    conditions, params = build_booking_filters(search_term, start_date, end_date, status)
+
+    # Keyset pagination: continue strictly after the last row already shown
+    if after is not None:
+        last_value, last_id = after
+        op = "<" if direction == "DESC" else ">"
+        conditions.append(f"({column} {op} %s OR ({column} = %s AND b.Booking_ID {op} %s))")
+        params.extend([last_value, last_value, last_id])
+
+    query = BOOKING_COLUMNS
+    if conditions:
+        query += "    WHERE " + "\n      AND ".join(conditions) + "\n"
+    query += f"    ORDER BY {column} {direction}, b.Booking_ID {direction}"
+    if limit is not None:
+        query += "\n    LIMIT %s"
+        params.append(limit)
+
+    return query, params
+
+def keyset_cursor(booking, sort=DEFAULT_SORT):
+    """Return the cursor that continues the list after this booking row"""
+    _, key, _ = SORT_ORDERS.get(sort, SORT_ORDERS[DEFAULT_SORT])
+    return (booking[key], booking['Booking_ID'])
+
+BOOKING_STATUSES = ("Confirmed", "Pending", "Cancelled")
+
+def build_status_count_query(search_term="", start_date=None, end_date=None, status="All", **_):
+    """Build the SQL and parameters counting the filtered bookings by status
+
+    Uses the same filters as the booking list; sort order and pagination
+    don't change the counts, so they are ignored. Users and Room are only
+    joined when the search term needs them.
+    """
+    conditions, params = build_booking_filters(search_term, start_date, end_date, status)
+
+    query = "    SELECT b.Booking_Status, COUNT(*)\n    FROM Booking b\n"
+    if search_term:
+        query += "    JOIN Users u ON b.User_ID = u.user_id\n    JOIN Room r ON b.Room_ID = r.Room_ID\n"
+    if conditions:
+        query += "    WHERE " + "\n      AND ".join(conditions) + "\n"
+    query += "    GROUP BY b.Booking_Status"
+
+    return query, params
+
+# ------------------- Booking Loaders -------------------
+@timed()
+def load_bookings(filters=None, after=None, limit=BOOKING_PAGE_SIZE):
+    """Load one page of bookings matching the filters from database
+
+    Returns the bookings on the page and the keyset cursor of the next page
+    (None when this is the last page). Runs on a worker thread (see tasks.py),
+    so database errors are raised to the caller instead of shown here.
+    """
+    filters = filters or {}
+    
+    # Ask for one extra row to find out whether there is a next page
+    query, params = build_booking_query(after=after, limit=limit + 1, **filters)
+    
+    try:
+        connection = connect_db()
+        cursor = connection.cursor(dictionary=True)
+        
+        cursor.execute(query, params)
+        bookings = cursor.fetchall()
+        
+        page_after = None
+        if len(bookings) > limit:
+            bookings = bookings[:limit]
+            page_after = keyset_cursor(bookings[-1], filters.get("sort", DEFAULT_SORT))
+        
+        return bookings, page_after
+        
+    finally:
+        if 'connection' in locals() and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+@timed()
+def load_booking_details(booking_id):
+    """Load details for a specific booking (runs on a worker thread)"""
+    try:
+        connection = connect_db()
+        cursor = connection.cursor(dictionary=True)
+        
+        # Query to get detailed booking info
+        cursor.execute(
+            """
+            SELECT b.*, u.first_name, u.last_name, u.email, u.phone, 
+                   r.Room_Type, r.Price_per_Night
+            FROM Booking b
+            JOIN Users u ON b.User_ID = u.user_id
+            JOIN Room r ON b.Room_ID = r.Room_ID
+            WHERE b.Booking_ID = %s
+            """,
+            (booking_id,)
+        )
+        
+        booking = cursor.fetchone()
+        return booking
+        
+    finally:
+        if 'connection' in locals() and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+@timed()
+def load_status_counts(filters=None):
+    """Count the bookings matching the filters by status (runs on a worker thread)
+
+    Returns {status: count} with every status present, so the counts cover
+    the whole filtered list and not just the pages loaded so far.
+    """
+    query, params = build_status_count_query(**(filters or {}))
+    
+    try:
+        connection = connect_db()
+        cursor = connection.cursor()
+        
+        cursor.execute(query, params)
+        counts = dict.fromkeys(BOOKING_STATUSES, 0)
+        for status, count in cursor.fetchall():
+            counts[status] = count
+        
+        return counts
+        
+    finally:
+        if 'connection' in locals() and connection.is_connected():
+            cursor.close()
+            connection.close()
@@ -0,0 +1,188 @@
+from db import connect_db
+from instrument import timed
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+
+# ------------------- Password Hashing -------------------
+# Passwords are stored as salted scrypt hashes:
+#     scrypt$<n>$<r>$<p>$<salt>$<hash>
+# scrypt is memory-hard, so guessing passwords from a leaked table costs
+# memory as well as time. The cost parameters are per deployment: they are
+# read from KDF_FILE, which "python credentials.py --calibrate" writes after
+# timing the hash on this machine (the defaults are used until then).
+#
+# Older rows hold an unsalted SHA-256 hex digest. They are still accepted,
+# and authenticate() replaces them with a scrypt hash on the next successful
+# login; hashes made with older cost parameters are upgraded the same way.
+# Bulk imports (user_import.py) rely on this: they hash at IMPORT_COST, which
+# is cheap enough for tens of thousands of rows per second, and each user's
+# hash is brought up to the deployment's cost at their first login.
+#
+# Checking a password takes about as long as the target login latency, so
+# the login pages run authenticate() on the task pool (see tasks.py).
+
+KDF_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kdf.json")
+DEFAULT_COST = {"n": 2 ** 14, "r": 8, "p": 1}
+IMPORT_COST = {"n": 2 ** 4, "r": 1, "p": 1}  # Until the first login (about 25 us per hash)
+SALT_BYTES = 16
+HASH_BYTES = 32
+LEGACY_HASH = re.compile(r"[0-9a-f]{64}")
+
+# Account kind -> (table, email column, password column, ID column)
+ACCOUNTS = {
+    "user": ("Users", "email", "password", "user_id"),
+    "admin": ("Admin", "AdminEmail", "AdminPassword", "Admin_ID"),
+}
+
+_cost = None
+_dummy_hash = None
+
+def get_cost():
+    """Return the scrypt cost parameters for this deployment"""
+    global _cost
+    if _cost is None:
+        _cost = dict(DEFAULT_COST)
+        if os.path.isfile(KDF_FILE):
+            with open(KDF_FILE, encoding="utf-8") as kdf_file:
+                _cost.update({key: int(value) for key, value in json.load(kdf_file).items() if key in _cost})
+    return _cost
+
+def derive(password, salt, n, r, p):
+    # scrypt needs 128 * n * r bytes; allow twice that
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r, dklen=HASH_BYTES)
+
+def encode(data):
+    return base64.b64encode(data).decode().rstrip("=")
+
+def decode(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+def hash_password(password, cost=None):
+    """Return a salted scrypt hash of a password, ready to store"""
+    cost = cost or get_cost()
+    salt = os.urandom(SALT_BYTES)
+    key = derive(password, salt, cost["n"], cost["r"], cost["p"])
+    return f"scrypt${cost['n']}${cost['r']}${cost['p']}${encode(salt)}${encode(key)}"
+
+def verify_password(password, stored):
+    """Check a password against a stored hash
+
+    Returns (matches, needs_rehash); needs_rehash is True for legacy SHA-256
+    hashes and for scrypt hashes made with other cost parameters.
+    """
+    if stored and LEGACY_HASH.fullmatch(stored):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored), True
+
+    try:
+        scheme, n, r, p, salt, key = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        if scheme != "scrypt":
+            return False, False
+        matches = hmac.compare_digest(derive(password, decode(salt), n, r, p), decode(key))
+    except (AttributeError, ValueError):
+        return False, False
+
+    cost = get_cost()
+    return matches, (n, r, p) != (cost["n"], cost["r"], cost["p"])
+
+def dummy_hash():
+    """Hash checked when the email is unknown, so both cases take as long"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(encode(os.urandom(SALT_BYTES)))
+    return _dummy_hash
+
+# ------------------- Login -------------------
+@timed()
+def authenticate(kind, email, password):
+    """Return the account row for an email and password, or None (runs on a worker thread)
+
+    kind is "user" or "admin". The password hash is left out of the row.
+    Legacy or outdated hashes are replaced after a successful check.
+    Database errors are raised to the caller.
+    """
+    table, email_column, password_column, id_column = ACCOUNTS[kind]
+    try:
+        connection = connect_db()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(f"SELECT * FROM {table} WHERE {email_column} = %s", (email,))
+        account = cursor.fetchone()
+
+        stored = account[password_column] if account else dummy_hash()
+        matches, needs_rehash = verify_password(password, stored)
+        if not account or not matches:
+            return None
+
+        if needs_rehash:
+            # Only replace the hash if nobody changed the password meanwhile
+            cursor.execute(
+                f"UPDATE {table} SET {password_column} = %s WHERE {id_column} = %s AND {password_column} = %s",
+                (hash_password(password), account[id_column], stored)
+            )
+            connection.commit()
+
+        del account[password_column]
+        return account
+
+    finally:
+        if 'connection' in locals() and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+# ------------------- Cost Calibration -------------------
+def time_hash(cost, runs=3):
+    """Median milliseconds to hash a password with the given cost"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        hash_password("calibration password", cost)
+        times.append((time.perf_counter() - started) * 1000)
+    return sorted(times)[len(times) // 2]
+
+def calibrate(target_ms, r=8, p=1, max_log_n=17):
+    """Return the highest-cost parameters that hash within target_ms, printing each step"""
+    chosen = None
+    print(f"  {'n':>8} {'r':>3} {'p':>3} {'memory':>9} {'ms':>9}")
+    for log_n in range(10, max_log_n + 1):
+        cost = {"n": 2 ** log_n, "r": r, "p": p}
+        ms = time_hash(cost)
+        print(f"  {cost['n']:>8} {r:>3} {p:>3} {128 * cost['n'] * r // 1024:>7} KB {ms:>9.1f}")
+        if ms > target_ms:
+            break
+        chosen = cost
+    return chosen
+
+# Direct execution
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Password hashing cost calibration")
+    parser.add_argument("--calibrate", action="store_true", help="time the hash and pick the cost")
+    parser.add_argument("--target-ms", type=float, default=250, help="login latency to aim for")
+    parser.add_argument("--write", action="store_true", help=f"save the chosen cost to {os.path.basename(KDF_FILE)}")
+    args = parser.parse_args()
+
+    if not args.calibrate:
+        cost = get_cost()
+        print(f"Current cost: {cost} ({time_hash(cost):.1f} ms per hash)")
+        sys.exit(0)
+
+    print(f"Timing scrypt against a {args.target_ms:g} ms target:")
+    cost = calibrate(args.target_ms)
+    if cost is None:
+        print("Even the lowest cost is slower than the target")
+        sys.exit(1)
+
+    print(f"\nChosen cost: {cost}")
+    if args.write:
+        with open(KDF_FILE, "w", encoding="utf-8") as kdf_file:
+            json.dump(cost, kdf_file, indent=2)
+        print(f"Written to {KDF_FILE}; existing hashes are upgraded as users log in")
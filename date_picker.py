@@ -0,0 +1,101 @@
+import customtkinter as ctk
+from datetime import date, datetime
+
+# ------------------- Lazy Date Picker -------------------
+# tkcalendar takes longer to import than most pages take to draw. A
+# DatePicker first shows a plain entry holding the date, so the page can be
+# drawn without tkcalendar. Once Tk is idle it imports tkcalendar and swaps
+# in a DateEntry. If tkcalendar isn't installed, the plain entry simply
+# stays, which is the fallback the pages always had.
+#
+# The picker passes the calls the pages make (get, get_date, set_date,
+# delete, insert, bind, ...) to whichever widget is showing.
+#
+# An optional picker (filters) starts empty and can be cleared with
+# set_date(None); get_date() then returns None, meaning "any date".
+
+# tkcalendar date_pattern -> strftime format
+PATTERN_FORMATS = {
+    "mm/dd/yyyy": "%m/%d/%Y",
+    "yyyy-mm-dd": "%Y-%m-%d",
+}
+
+class DatePicker:
+    """Date field that becomes a tkcalendar DateEntry after the page is drawn"""
+
+    def __init__(self, parent, width=12, entry_width=200, date_pattern="mm/dd/yyyy", value=None,
+                 optional=False, **date_entry_options):
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.optional = optional
+        self.date_pattern = date_pattern
+        self.format = PATTERN_FORMATS.get(date_pattern, "%m/%d/%Y")
+        self.date_entry_options = dict(date_entry_options, width=width, date_pattern=date_pattern)
+
+        # Plain entry until tkcalendar is loaded
+        self.widget = ctk.CTkEntry(self.frame, width=entry_width, placeholder_text=date_pattern)
+        self.widget.pack(fill="x")
+        # Start on today, like a DateEntry does (optional pickers start empty)
+        if value is None and not optional:
+            value = date.today()
+        self.set_date(value)
+
+        self.frame.after_idle(self.upgrade)
+
+    def __getattr__(self, name):
+        return getattr(self.widget, name)
+
+    # ---------- Placement ----------
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    # ---------- Value ----------
+    def get(self):
+        return self.widget.get()
+
+    def get_date(self):
+        """Return the selected date (None if the field is empty or, before the upgrade, not a valid date)"""
+        if not self.widget.get().strip():
+            return None
+        if hasattr(self.widget, 'get_date'):
+            return self.widget.get_date()
+        try:
+            return datetime.strptime(self.widget.get().strip(), self.format).date()
+        except ValueError:
+            return None
+
+    def set_date(self, value):
+        """Show a date; None empties the field"""
+        if value is not None and hasattr(self.widget, 'set_date'):
+            self.widget.set_date(value)
+            return
+        self.widget.delete(0, 'end')
+        if value is not None:
+            self.widget.insert(0, value.strftime(self.format) if hasattr(value, 'strftime') else str(value))
+
+    # ---------- Upgrade ----------
+    def upgrade(self):
+        """Replace the plain entry with a DateEntry, keeping its date"""
+        if not self.frame.winfo_exists():
+            return
+
+        # Let the rest of the page finish drawing before the import
+        self.frame.update_idletasks()
+        try:
+            from tkcalendar import DateEntry
+        except ImportError:
+            return
+
+        value = self.get_date()
+        entry = self.widget
+        self.widget = DateEntry(self.frame, **self.date_entry_options)
+        if self.optional:
+            # DateEntry puts its last date back when the field is left empty - allow empty instead
+            validate = self.widget._validate_date
+            self.widget.configure(validatecommand=self.widget.register(
+                lambda: not self.widget.get().strip() or validate()))
+        self.set_date(value)
+        self.widget.pack(fill="x")
+        entry.destroy()
@@ -0,0 +1,210 @@
+import mysql.connector
+import instrument
+import threading
+import time
+from contextlib import contextmanager
+
+# ------------------- Database Configuration -------------------
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",  # Replace with your MySQL username
+    "password": "new_password",  # Replace with your MySQL password
+    "database": "hotel_book"  # Replace with your database name
+}
+
+POOL_SIZE = 5  # Maximum number of open connections
+POOL_TIMEOUT = 10  # Seconds to wait for a free connection before giving up
+HEALTH_CHECK_AFTER = 30  # Ping connections that have been idle longer than this
+
+# ------------------- Connection Pool -------------------
+class PooledConnection:
+    """Wrapper around a MySQL connection that goes back to the pool on close()"""
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        """Open a cursor whose statements are timed (see instrument.py)"""
+        return instrument.wrap_cursor(self._connection.cursor(*args, **kwargs))
+
+    def is_connected(self):
+        # Borrowed connections report as connected until they are handed back,
+        # so the usual "if connection.is_connected(): close()" cleanup still runs
+        return not self._returned and self._connection.is_connected()
+
+    def close(self):
+        """Return the connection to the pool instead of closing it"""
+        if not self._returned:
+            self._returned = True
+            self._pool.release(self._connection)
+
+    def discard(self):
+        """Close the connection for good instead of returning it
+
+        For connections that can't be reused, e.g. one still streaming the
+        rows of an unbuffered query that was abandoned halfway.
+        """
+        if not self._returned:
+            self._returned = True
+            try:
+                self._connection.close()
+            except mysql.connector.Error:
+                pass
+            self._pool._discard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections with idle health checks"""
+
+    def __init__(self, config, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self._idle = []  # (connection, time it was returned)
+        self._open = 0
+        self._condition = threading.Condition()
+        self.stats = {
+            "hits": 0,          # Borrow served by an idle connection
+            "misses": 0,        # Borrow had to open a new connection
+            "waits": 0,         # Borrow had to wait for a connection to be returned
+            "wait_time": 0.0,   # Total seconds spent waiting
+            "timeouts": 0,      # Borrow gave up after POOL_TIMEOUT
+            "reconnects": 0,    # Idle connection failed its health check
+        }
+
+    def acquire(self):
+        """Borrow a connection, opening a new one if the pool is not full"""
+        with self._condition:
+            if not self._idle and self._open >= self.size:
+                self.stats["waits"] += 1
+                started = time.perf_counter()
+                deadline = started + self.timeout
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        self.stats["wait_time"] += time.perf_counter() - started
+                        raise mysql.connector.errors.PoolError(
+                            "No database connection available (pool exhausted)")
+                    self._condition.wait(remaining)
+                self.stats["wait_time"] += time.perf_counter() - started
+
+            if self._idle:
+                connection, returned_at = self._idle.pop()
+                self.stats["hits"] += 1
+            else:
+                connection, returned_at = None, None
+                self._open += 1
+                self.stats["misses"] += 1
+
+        if connection is None:
+            try:
+                connection = mysql.connector.connect(**self.config)
+            except mysql.connector.Error:
+                self._discard()
+                raise
+        elif time.monotonic() - returned_at > HEALTH_CHECK_AFTER:
+            connection = self._check_health(connection)
+
+        return PooledConnection(self, connection)
+
+    def _check_health(self, connection):
+        """Ping an idle connection and reconnect if the server dropped it"""
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except mysql.connector.Error:
+            self.stats["reconnects"] += 1
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+            try:
+                return mysql.connector.connect(**self.config)
+            except mysql.connector.Error:
+                self._discard()
+                raise
+
+    def release(self, connection):
+        """Put a connection back in the pool"""
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if connection.in_transaction:
+                connection.rollback()
+        except mysql.connector.Error:
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+            self._discard()
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self):
+        """Forget a connection that could not be opened or reused"""
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for connection, _ in idle:
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the shared connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG)
+    return _pool
+
+# ------------------- Public Helpers -------------------
+def connect_db():
+    """Borrow a connection from the pool (close() returns it)"""
+    return get_pool().acquire()
+
+@contextmanager
+def get_connection():
+    """Borrow a connection for the duration of a with-block"""
+    connection = connect_db()
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+def pool_stats():
+    """Return the pool hit/miss/wait counters"""
+    pool = get_pool()
+    with pool._condition:
+        stats = dict(pool.stats)
+        stats["open"] = pool._open
+        stats["idle"] = len(pool._idle)
+        stats["size"] = pool.size
+    return stats
@@ -0,0 +1,144 @@
+import mysql.connector
+from db import connect_db
+from instrument import timed
+from booking_queries import build_booking_query
+from user_queries import build_user_query
+import csv
+import json
+import os
+import sys
+import time
+
+# ------------------- Streaming Export -------------------
+# Writes the Manage Bookings and Manage Users views to CSV or JSON lines.
+# The rows are read with an unbuffered cursor, so MySQL streams them as
+# they are fetched. They are written EXPORT_CHUNK at a time and never held
+# all at once, so memory stays flat however many rows there are. The same
+# filters as the page are applied (booking_queries.build_booking_query,
+# user_queries.build_user_query).
+#
+# The file is written under a temporary name and renamed when complete, so
+# a failed export never leaves a partial file behind. The pages run the
+# export on the task pool (see tasks.py) and show its rows per second.
+#
+# Usage: python export.py bookings bookings.csv [--search TERM] [--status Pending]
+#                         [--start 2024-01-01] [--end 2024-12-31] [--sort "Highest Amount"]
+#        python export.py users users.jsonl [--search TERM]
+
+EXPORT_CHUNK = 2000  # Rows fetched and written at a time
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+def export_format(path):
+    """Return "csv" or "jsonl" for an output path"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported export type '{extension}' (use .csv or .jsonl)")
+    return FORMATS[extension]
+
+def chunk_writer(output, fmt, columns):
+    """Return a function writing a list of row tuples to output"""
+    if fmt == "csv":
+        writer = csv.writer(output)
+        writer.writerow(columns)
+        return writer.writerows
+
+    def write_lines(rows):
+        output.write("".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows))
+    return write_lines
+
+def export_query(query, params, path, progress=None, chunk_size=EXPORT_CHUNK):
+    """Stream the rows of a query to a CSV or JSON lines file; returns the export stats
+
+    progress(stats) is called after every chunk (on the calling thread).
+    Errors are raised; the output file is only created when the export
+    completes.
+    """
+    fmt = export_format(path)
+    temporary = f"{path}.part"
+    stats = {"rows": 0, "bytes": 0, "elapsed_s": 0.0, "rows_per_s": 0.0, "path": path}
+    started = time.perf_counter()
+    finished = False
+
+    try:
+        connection = connect_db()
+        cursor = connection.cursor(buffered=False)
+        cursor.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+
+        with open(temporary, "w", encoding="utf-8", newline="") as output:
+            write = chunk_writer(output, fmt, columns)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                write(rows)
+                stats["rows"] += len(rows)
+                stats["bytes"] = output.tell()
+                report(stats, started, progress)
+
+        os.replace(temporary, path)
+        finished = True
+        report(stats, started, progress)
+        return stats
+
+    finally:
+        if 'connection' in locals() and connection.is_connected():
+            if finished:
+                cursor.close()
+                connection.close()
+            else:
+                # Unread rows may still be on the way - don't put this connection back in the pool
+                connection.discard()
+        if not finished and os.path.exists(temporary):
+            os.remove(temporary)
+
+def report(stats, started, progress):
+    """Update the timing stats and pass them to the progress callback"""
+    stats["elapsed_s"] = round(time.perf_counter() - started, 2)
+    stats["rows_per_s"] = round(stats["rows"] / stats["elapsed_s"], 1) if stats["elapsed_s"] else 0.0
+    if progress:
+        progress(dict(stats))
+
+# ------------------- Views -------------------
+@timed()
+def export_bookings(filters, path, progress=None):
+    """Export the bookings matching the Manage Bookings filters (see get_filters)"""
+    query, params = build_booking_query(limit=None, **(filters or {}))
+    return export_query(query, params, path, progress)
+
+@timed()
+def export_users(search_term, path, progress=None):
+    """Export the users matching the Manage Users search term"""
+    query, params = build_user_query(search_term)
+    return export_query(query, params, path, progress)
+
+def print_progress(stats):
+    print(f"  {stats['rows']:>10} rows {stats['bytes'] / 1048576:>9.1f} MB {stats['rows_per_s']:>10.0f} rows/s",
+          end="\r")
+
+# Direct execution
+if __name__ == "__main__":
+    import argparse
+    from datetime import date
+
+    parser = argparse.ArgumentParser(description="Export bookings or users to CSV or JSON lines")
+    parser.add_argument("view", choices=["bookings", "users"])
+    parser.add_argument("path", help=".csv or .jsonl file to write")
+    parser.add_argument("--search", default="")
+    parser.add_argument("--status", default="All")
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    parser.add_argument("--sort", default="Newest Check-in")
+    args = parser.parse_args()
+
+    try:
+        if args.view == "bookings":
+            stats = export_bookings({"search_term": args.search, "start_date": args.start, "end_date": args.end,
+                                     "status": args.status, "sort": args.sort}, args.path, print_progress)
+        else:
+            stats = export_users(args.search, args.path, print_progress)
+    except (OSError, ValueError, mysql.connector.Error) as err:
+        print(f"\nExport failed: {err}")
+        sys.exit(1)
+
+    print(f"\nExported {stats['rows']} rows to {stats['path']} in {stats['elapsed_s']} s")
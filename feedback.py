@@ -1,70 +1,38 @@
 import customtkinter as ctk
 from tkinter import messagebox
 import mysql.connector
-import subprocess
-import sys
+from db import connect_db
+import router
+import session
 from datetime import datetime
 
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",  # Replace with your MySQL username
-        password="new_password",  # Replace with your MySQL password
-        database="hotel_book"  # Replace with your database name
-    )
-
 # ------------------- Global Variables -------------------
 current_user = None
 selected_rating = 0
 
 # ------------------- User Session Management -------------------
 def load_user_session():
-    """Load user information from database"""
+    """Load the logged-in user's profile from the signed session token"""
     global current_user
     
-    # Check if any user_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-            
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                # Pre-fill name field with user's name if available
-                if name_entry:
-                    name_entry.delete(0, 'end')
-                    name_entry.insert(0, f"{user_data['first_name']} {user_data['last_name']}")
-                return True
-                
-        except (ValueError, IndexError, mysql.connector.Error) as err:
-            print(f"Error loading user session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    # The token is checked locally (no database round trip)
+    current_user = session.current("user")
+    if current_user is None:
+        return False
+    prefill_name_entry()
+    return True
+
+def prefill_name_entry():
+    """Pre-fill the name field with the logged-in user's name"""
+    if current_user and name_entry:
+        name_entry.delete(0, 'end')
+        name_entry.insert(0, f"{current_user['first_name']} {current_user['last_name']}")
 
 # ------------------- Navigation Functions -------------------
 def open_page(page_name):
-    """Open another page and close the current one"""
+    """Switch to another page in the same window"""
     try:
-        # Pass the current user ID to the next page if a user is logged in
-        user_param = [str(current_user['user_id'])] if current_user else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + user_param
-        
-        subprocess.Popen(command)
-        app.destroy()  # Close the current window
+        router.show(page_name)
     except Exception as e:
         messagebox.showerror("Navigation Error", f"Unable to open {page_name} page: {e}")
 
@@ -84,7 +52,7 @@ def logout():
     """Log out the current user and return to login page"""
     global current_user
     current_user = None
-    open_page("login")
+    router.logout("login")
 
 # ------------------- Rating Functions -------------------
 def set_rating(rating):
@@ -133,7 +101,7 @@ def submit_feedback():
         # If we don't have a user ID but have a name, try to look up the user
         if not user_id:
             cursor.execute(
-                "SELECT user_id FROM Users WHERE CONCAT(first_name, ' ', last_name) = %s LIMIT 1",
+                "SELECT user_id FROM Users WHERE Full_Name = %s LIMIT 1",
                 (name,)
             )
             user_result = cursor.fetchone()
@@ -169,17 +137,12 @@ def submit_feedback():
             connection.close()
 
 # ----------------- Initialize App -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
-app = ctk.CTk()
-app.title("Hotel Booking - Feedback")
-app.geometry("1200x700")
-app.resizable(False, False)
+app = router.get_app()
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+# Shown again after a login or a profile edit: pick up the current user
+main_frame = router.create_page("feedback", "Hotel Booking - Feedback", "1200x700",
+                                on_show=load_user_session)
 
 # ----------------- Sidebar (Navigation) -----------------
 sidebar = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=200, corner_radius=0)
@@ -285,4 +248,4 @@ load_user_session()
 
 # Run the application
 if __name__ == "__main__":
-    app.mainloop()
\ No newline at end of file
+    router.run("feedback")
\ No newline at end of file
@@ -0,0 +1,291 @@
+import mysql.connector
+from db import connect_db
+from datetime import date, timedelta
+import rollup
+import user_counters
+import argparse
+import random
+import sys
+import time
+
+# ------------------- Synthetic Dataset Generator -------------------
+# Bulk-loads a realistic amount of users, hotels, rooms and bookings so the
+# app and bench_app.py can be run at scale. Rows are written with
+# executemany() in batches (mysql.connector turns each batch into one
+# multi-row INSERT) with explicit IDs starting after the current maximum, so
+# bookings and their Room_Night rows can be written together.
+#
+# Each room gets a run of back-to-back stays that never overlap, spread from
+# about two years in the past to a year ahead. Cancelled bookings get no
+# Room_Night rows, like a real cancellation. Daily_Rollup and the per-user
+# counters are rebuilt at the end.
+#
+# Usage: python generate_data.py [--users 10000] [--hotels 200] [--rooms-per-hotel 50]
+#                                [--bookings 100000] [--batch 5000] [--seed 42]
+#        python generate_data.py --clean
+#
+# Generated users have emails ending in GENERATED_EMAIL_DOMAIN and generated
+# hotels have GENERATED_TAG as their description; --clean removes them and
+# everything that belongs to them.
+
+GENERATED_EMAIL_DOMAIN = "generated.example.invalid"
+GENERATED_TAG = "[generated benchmark data]"
+DAYS_BACK = 730  # Stays start this many days before today...
+DAYS_AHEAD = 365  # ...and run up to this many days after it
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+               "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+               "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Nancy", "Matthew", "Lisa",
+               "Anthony", "Betty", "Mark", "Sandra", "Steven", "Ashley", "Paul", "Emily"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+              "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+              "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker"]
+STREETS = ["Main St", "Oak Ave", "Maple Dr", "Cedar Ln", "Park Blvd", "Lake Rd", "Hill St", "Elm St"]
+CITIES = [
+    ("Chicago", "Illinois"), ("Miami Beach", "Florida"), ("Aspen", "Colorado"),
+    ("Mt. Pleasant", "Michigan"), ("Malibu", "California"), ("Detroit", "Michigan"),
+    ("Orlando", "Florida"), ("Denver", "Colorado"), ("San Diego", "California"),
+    ("Los Angeles", "California"), ("New York", "New York"), ("Boston", "Massachusetts"),
+    ("Seattle", "Washington"), ("Portland", "Oregon"), ("Austin", "Texas"),
+    ("Dallas", "Texas"), ("Houston", "Texas"), ("Phoenix", "Arizona"),
+    ("Las Vegas", "Nevada"), ("Nashville", "Tennessee"), ("Atlanta", "Georgia"),
+    ("Savannah", "Georgia"), ("New Orleans", "Louisiana"), ("Minneapolis", "Minnesota"),
+    ("Madison", "Wisconsin"), ("Grand Rapids", "Michigan"), ("Traverse City", "Michigan"),
+    ("Salt Lake City", "Utah"), ("Honolulu", "Hawaii"), ("Anchorage", "Alaska"),
+]
+NAME_WORDS = ["Grand", "Royal", "Harbor", "Park", "Plaza", "Garden", "Summit", "Lakeside",
+              "Riverside", "Central", "Golden", "Silver", "Maple", "Cedar", "Pine", "Oak"]
+HOTEL_KINDS = ["Hotel", "Inn", "Resort", "Lodge", "Suites", "Villa"]
+ROOM_TYPES = [("Single Room", 1, 90), ("Double Room", 2, 140), ("Deluxe Room", 3, 210),
+              ("Family Suite", 5, 320), ("Penthouse", 4, 600)]
+
+def next_id(cursor, table, column):
+    """Return the first ID after the current maximum of a table"""
+    cursor.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+    return cursor.fetchone()[0]
+
+def insert_batches(connection, cursor, sql, rows, batch):
+    """Insert rows with executemany() in batches, committing after each one"""
+    for start in range(0, len(rows), batch):
+        cursor.executemany(sql, rows[start:start + batch])
+        connection.commit()
+
+def generate_users(connection, cursor, count, batch):
+    """Insert count users; returns their IDs"""
+    first_id = next_id(cursor, "Users", "user_id")
+    rows = []
+    for user_id in range(first_id, first_id + count):
+        first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+        city, state = random.choice(CITIES)
+        rows.append((
+            user_id, first, last,
+            f"{first.lower()}.{last.lower()}.{user_id}@{GENERATED_EMAIL_DOMAIN}",
+            f"555-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
+            "-",  # No valid password hash, so generated users can't log in
+            f"{random.randint(1, 9999)} {random.choice(STREETS)}, {city}, {state}",
+        ))
+    insert_batches(connection, cursor,
+                   """
+                   INSERT INTO Users (user_id, first_name, last_name, email, phone, password, user_address)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s)
+                   """,
+                   rows, batch)
+    return list(range(first_id, first_id + count))
+
+def generate_hotels(connection, cursor, hotel_count, rooms_per_hotel, batch):
+    """Insert hotels with their rooms and room categories; returns [(room_id, price)]"""
+    hotel_id = next_id(cursor, "Hotel", "Hotel_ID")
+    room_id = next_id(cursor, "Room", "Room_ID")
+    hotels, rooms, categories = [], [], []
+
+    for _ in range(hotel_count):
+        city, state = random.choice(CITIES)
+        name = f"{random.choice(NAME_WORDS)} {random.choice(NAME_WORDS)} {random.choice(HOTEL_KINDS)} {city}"
+        stars = random.randint(2, 5)
+        hotels.append((hotel_id, name, f"{city}, {state}", GENERATED_TAG, stars))
+
+        cheapest = {}
+        for _ in range(rooms_per_hotel):
+            room_type, max_guests, base_price = random.choice(ROOM_TYPES)
+            price = round(base_price * (0.6 + stars * 0.2) * random.uniform(0.9, 1.1), 2)
+            rooms.append((room_id, f"{name} - {room_type}", price, "Available", hotel_id, max_guests))
+            cheapest[room_type] = min(price, cheapest.get(room_type, price))
+            room_id += 1
+        categories.extend((hotel_id, room_type, price) for room_type, price in cheapest.items())
+        hotel_id += 1
+
+    insert_batches(connection, cursor,
+                   "INSERT INTO Hotel (Hotel_ID, hotel_name, location, description, star_rating) "
+                   "VALUES (%s, %s, %s, %s, %s)",
+                   hotels, batch)
+    insert_batches(connection, cursor,
+                   """
+                   INSERT INTO Room (Room_ID, Room_Type, Price_per_Night, Availability_status, Hotel_ID, Max_Guests)
+                   VALUES (%s, %s, %s, %s, %s, %s)
+                   """,
+                   rooms, batch)
+    insert_batches(connection, cursor,
+                   "INSERT INTO RoomCategory (Hotel_ID, category_name, base_price) VALUES (%s, %s, %s)",
+                   categories, batch)
+    return [(room[0], room[2]) for room in rooms]
+
+def generate_bookings(connection, cursor, count, rooms, user_ids, batch):
+    """Insert count non-overlapping bookings (and their Room_Night rows) spread over rooms"""
+    booking_id = next_id(cursor, "Booking", "Booking_ID")
+    today = date.today()
+    first_day = today - timedelta(days=DAYS_BACK)
+    per_room, extra = divmod(count, len(rooms))
+
+    bookings, nights = [], []
+    written = 0
+
+    def flush():
+        cursor.executemany(
+            """
+            INSERT INTO Booking (Booking_ID, User_ID, Room_ID, Check_IN_Date, Check_Out_Date,
+                                 Total_Cost, Booking_Status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """,
+            bookings
+        )
+        if nights:
+            cursor.executemany(
+                "INSERT INTO Room_Night (Room_ID, Stay_Date, Booking_ID) VALUES (%s, %s, %s)",
+                nights
+            )
+        connection.commit()
+        bookings.clear()
+        nights.clear()
+
+    for index, (room_id, price) in enumerate(rooms):
+        room_bookings = per_room + (1 if index < extra else 0)
+        if not room_bookings:
+            continue
+
+        # Spread this room's stays evenly over the whole period
+        spacing = max(2, (DAYS_BACK + DAYS_AHEAD) // room_bookings)
+        day = first_day + timedelta(days=random.randrange(spacing))
+        for _ in range(room_bookings):
+            stay = random.randint(1, max(1, min(7, spacing - 1)))
+            check_in, check_out = day, day + timedelta(days=stay)
+
+            if check_in > today and random.random() < 0.15:
+                status = "Pending"
+            elif random.random() < 0.08:
+                status = "Cancelled"
+            else:
+                status = "Confirmed"
+
+            bookings.append((booking_id, random.choice(user_ids), room_id, check_in, check_out,
+                             round(float(price) * stay, 2), status))
+            if status != "Cancelled":
+                nights.extend((room_id, check_in + timedelta(days=night), booking_id)
+                              for night in range(stay))
+
+            booking_id += 1
+            written += 1
+            day = check_out + timedelta(days=random.randint(0, max(0, spacing - stay - 1)))
+
+            if len(bookings) >= batch:
+                flush()
+                print(f"  {written}/{count} bookings", end="\r")
+
+    if bookings:
+        flush()
+    print()
+    return written
+
+def generate(users, hotels, rooms_per_hotel, bookings, batch, seed):
+    """Generate the whole dataset and print what was loaded"""
+    random.seed(seed)
+    started = time.perf_counter()
+
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        # The generated rows are consistent by construction, so skip per-row checks
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+
+        print(f"Users:    {users}")
+        user_ids = generate_users(connection, cursor, users, batch)
+        print(f"Hotels:   {hotels} with {rooms_per_hotel} rooms each")
+        rooms = generate_hotels(connection, cursor, hotels, rooms_per_hotel, batch)
+        print(f"Bookings: {bookings}")
+        written = generate_bookings(connection, cursor, bookings, rooms, user_ids, batch) if rooms else 0
+
+        cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        cursor.close()
+    finally:
+        connection.close()
+
+    print("Rebuilding Daily_Rollup and user counters...")
+    rollup.rebuild_rollup()
+    user_counters.reconcile_user_counters()
+
+    elapsed = time.perf_counter() - started
+    total = users + hotels + len(rooms) + written
+    print(f"Loaded {total} rows in {elapsed:.1f} s ({total / elapsed:.0f} rows/sec)")
+
+def delete_in_batches(connection, cursor, sql, params, batch):
+    """Run a DELETE ... LIMIT batch until it removes nothing"""
+    deleted = 0
+    while True:
+        cursor.execute(f"{sql} LIMIT {int(batch)}", params)
+        connection.commit()
+        if cursor.rowcount <= 0:
+            return deleted
+        deleted += cursor.rowcount
+
+def clean(batch):
+    """Remove every generated row (bookings and nights go with their users/rooms)"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        email_pattern = f"%@{GENERATED_EMAIL_DOMAIN}"
+
+        # Bookings first, in batches, so no single transaction gets huge
+        bookings = delete_in_batches(
+            connection, cursor,
+            "DELETE FROM Booking WHERE User_ID IN (SELECT user_id FROM Users WHERE email LIKE %s)"
+            " OR Room_ID IN (SELECT r.Room_ID FROM Room r JOIN Hotel h ON r.Hotel_ID = h.Hotel_ID"
+            " WHERE h.description = %s)",
+            (email_pattern, GENERATED_TAG), batch)
+        users = delete_in_batches(connection, cursor, "DELETE FROM Users WHERE email LIKE %s",
+                                  (email_pattern,), batch)
+        cursor.execute(
+            "DELETE r FROM Room r JOIN Hotel h ON r.Hotel_ID = h.Hotel_ID WHERE h.description = %s",
+            (GENERATED_TAG,)
+        )
+        rooms = cursor.rowcount
+        cursor.execute("DELETE FROM Hotel WHERE description = %s", (GENERATED_TAG,))
+        hotels = cursor.rowcount
+        connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+    rollup.rebuild_rollup()
+    user_counters.reconcile_user_counters()
+    print(f"Removed {users} users, {hotels} hotels, {rooms} rooms and {bookings} bookings.")
+
+# Direct execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a synthetic hotel dataset")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--hotels", type=int, default=200)
+    parser.add_argument("--rooms-per-hotel", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clean", action="store_true", help="remove previously generated data")
+    args = parser.parse_args()
+
+    try:
+        if args.clean:
+            clean(args.batch)
+        else:
+            generate(args.users, args.hotels, args.rooms_per_hotel, args.bookings, args.batch, args.seed)
+    except mysql.connector.Error as err:
+        print(f"Database Error: {err}")
+        sys.exit(1)
@@ -0,0 +1,77 @@
+from credentials import hash_password
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+# ------------------- Password Hashing Pool -------------------
+# Hashes passwords for the bulk import (user_import.py) in worker processes.
+# A spawned worker first re-imports its parent's __main__, which in the app
+# is a page module that builds its window. So the process pool lives in a
+# helper process started from this module ("python hash_pool.py"), and its
+# workers only ever re-import this module. Batches of passwords are sent to
+# the helper as JSON lines on stdin; their hashes come back the same way,
+# in the order the batches were sent.
+
+class HashPool:
+    """Helper process hashing batches of passwords in a process pool"""
+
+    def __init__(self, workers, cost=None):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--workers", str(workers), "--cost", json.dumps(cost)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8"
+        )
+        self.results = queue.Queue()
+        # Read the hashes as they come, so the helper never blocks writing them
+        threading.Thread(target=self.read_results, daemon=True).start()
+
+    def read_results(self):
+        for line in self.process.stdout:
+            self.results.put(json.loads(line))
+        self.results.put(None)  # The helper exited
+
+    def hash_batch(self, passwords):
+        """Send a batch of passwords; returns an iterator of their hashes
+
+        Batches must be read in the order they were sent.
+        """
+        self.process.stdin.write(json.dumps(passwords) + "\n")
+        self.process.stdin.flush()
+        return self.receive()
+
+    def receive(self):
+        hashes = self.results.get()
+        if hashes is None:
+            self.results.put(None)
+            raise RuntimeError("The password hashing process stopped")
+        yield from hashes
+
+    def close(self):
+        """Stop the helper process (batches not read yet are dropped)"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.terminate()
+        self.process.wait()
+
+# Direct execution (the helper process started by HashPool)
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hash JSON batches of passwords read from stdin")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cost", type=json.loads, help="scrypt cost as JSON (default: the deployment's)")
+    args = parser.parse_args()
+    hash_with_cost = functools.partial(hash_password, cost=args.cost)
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        for line in sys.stdin:
+            passwords = json.loads(line)
+            chunksize = max(1, len(passwords) // (args.workers * 4))
+            sys.stdout.write(json.dumps(list(pool.map(hash_with_cost, passwords, chunksize=chunksize))) + "\n")
+            sys.stdout.flush()
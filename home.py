@@ -1,72 +1,32 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import mysql.connector
-import subprocess
-import sys
+from search import search_rooms
+from hotels import get_popular_hotels, start_popular_hotels_refresh
+import router
+import session
+import tasks
 from datetime import datetime, timedelta
 import os
-from tkcalendar import DateEntry
+from date_picker import DatePicker
 import re
 
 # Global variable to store the current user's information
 current_user = None
 
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",  # Replace with your MySQL username
-        password="new_password",  # Replace with your MySQL password
-        database="hotel_book"  # Replace with your database name
-    )
-
 # ------------------- User Session Management -------------------
-def load_user_session(user_id=None):
-    """Load user information from database"""
+def load_user_session():
+    """Load the logged-in user's profile from the signed session token"""
     global current_user
     
-    # If no user_id is provided, check if any was passed as a command line argument
-    if user_id is None and len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-        except (ValueError, IndexError):
-            user_id = None
-    
-    if user_id:
-        try:
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                return True
-            
-        except mysql.connector.Error as err:
-            print(f"Database Error: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    # The token is checked locally (no database round trip)
+    current_user = session.current("user")
+    return current_user is not None
 
 # ------------------- Navigation Functions -------------------
 def open_page(page_name):
-    """Open another page and close the current one"""
+    """Switch to another page in the same window"""
     try:
-        # Pass the current user ID to the next page if a user is logged in
-        user_param = [str(current_user['user_id'])] if current_user else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + user_param
-        
-        subprocess.Popen(command)
-        app.destroy()  # Close the current window
+        router.show(page_name)
     except Exception as e:
         messagebox.showerror("Navigation Error", f"Unable to open {page_name} page: {e}")
 
@@ -86,7 +46,7 @@ def logout():
     """Log out the current user and return to login page"""
     global current_user
     current_user = None
-    open_page("login")
+    router.logout("login")
 
 # ------------------- Hotel Search Function -------------------
 def search_hotels():
@@ -118,19 +78,82 @@ def search_hotels():
             messagebox.showwarning("Input Error", "Number of guests must be a number.")
             return
             
-        # Perform the search - for now just show a message
-        messagebox.showinfo("Search Results", 
-                          f"Searching for hotels in {location}\n"
-                          f"Check-in: {check_in.strftime('%m/%d/%Y') if check_in else 'Not specified'}\n"
-                          f"Check-out: {check_out.strftime('%m/%d/%Y') if check_out else 'Not specified'}\n"
-                          f"Guests: {guests if guests else 'Not specified'}")
+        # Dates are datetime when typed in, date when picked from the calendar
+        if isinstance(check_in, datetime):
+            check_in = check_in.date()
+        if isinstance(check_out, datetime):
+            check_out = check_out.date()
+        
+        check_in, check_out = check_in or None, check_out or None
+        guests_count = int(guests) if guests else 1
         
-        # Here you would typically redirect to a search results page
-        # open_page("search_results")  # Uncomment when you have this page
+        # Search in the background; a newer search replaces this one
+        tasks.submit(search_rooms, location, check_in, check_out, guests_count,
+                     key="search", spinner=search_spinner,
+                     on_success=lambda results: show_search_results(results, location, check_in, check_out, guests_count))
     
     except Exception as e:
         messagebox.showerror("Search Error", str(e))
 
+def show_search_results(results, location, check_in, check_out, guests):
+    """Replace the popular hotels with the search results"""
+    for widget in results_list.winfo_children():
+        widget.destroy()
+    
+    stay = f" · {check_in.strftime('%m/%d/%Y')} - {check_out.strftime('%m/%d/%Y')}" if check_in and check_out else ""
+    results_title.configure(text=f"{len(results)} result{'s' if len(results) != 1 else ''} for \"{location}\"{stay}")
+    
+    if not results:
+        ctk.CTkLabel(results_list, text="No available rooms match your search.\nTry another location or different dates.", 
+                   font=("Arial", 14), text_color="gray").pack(pady=40)
+    
+    for result in results:
+        create_result_row(results_list, result, check_in, check_out, guests).pack(fill="x", padx=5, pady=4)
+    
+    hotels_section.pack_forget()
+    results_section.pack(fill="both", expand=True, padx=30, pady=10)
+
+def clear_search_results():
+    """Go back to the popular hotels"""
+    results_section.pack_forget()
+    hotels_section.pack(fill="both", expand=True, padx=30, pady=10)
+
+def create_result_row(parent, result, check_in, check_out, guests):
+    """Create one row of the search results"""
+    row = ctk.CTkFrame(parent, fg_color="white", border_width=1, border_color="#D5D8DC")
+    
+    info = ctk.CTkFrame(row, fg_color="white")
+    info.pack(side="left", fill="x", expand=True, padx=10, pady=8)
+    
+    ctk.CTkLabel(info, text=f"{result['hotel_name']}  {'★' * result['stars']}", 
+               font=("Arial", 13, "bold")).pack(anchor="w")
+    ctk.CTkLabel(info, text=f"📍 {result['location']}    🛏 {result['room_type']}", 
+               font=("Arial", 11), text_color="gray").pack(anchor="w")
+    
+    book_btn = ctk.CTkButton(row, text="Book", font=("Arial", 11), 
+                           fg_color="#0F2D52", hover_color="#1E4D88", width=70, height=28,
+                           command=lambda: book_search_result(result, check_in, check_out, guests))
+    book_btn.pack(side="right", padx=10)
+    
+    price_text = f"${result['price']:.2f} / night"
+    if check_in and check_out:
+        price_text += f"\n${result['total']:.2f} total"
+    ctk.CTkLabel(row, text=price_text, font=("Arial", 11, "bold"), text_color="#1E90FF", 
+               justify="right").pack(side="right", padx=10)
+    
+    return row
+
+def book_search_result(result, check_in, check_out, guests):
+    """Open the booking page for a room from the search results"""
+    router.session["booking_request"] = {
+        "room_id": result["room_id"],
+        "room_type": result["room_type"],
+        "check_in": check_in,
+        "check_out": check_out,
+        "guests": guests
+    }
+    open_page("book")
+
 # ------------------- View Hotel Details -------------------
 def view_hotel_details(hotel_name):
     """Open the hotel details page for the selected hotel"""
@@ -140,69 +163,50 @@ def view_hotel_details(hotel_name):
         messagebox.showinfo("Hotel Details", f"Viewing details for {hotel_name}")
         
         # Example of how you might navigate to a hotel details page
-        # subprocess.Popen([sys.executable, "hotel_details.py", str(hotel_id)])
-        # app.destroy()
+        # open_page("hotel_details")
     except Exception as e:
         messagebox.showerror("Navigation Error", f"Unable to view hotel details: {e}")
 
 # ------------------- Load Popular Hotels -------------------
-def load_popular_hotels():
-    """Load popular hotels from the database"""
-    hotels = []
-    try:
-        connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
-        
-        # Query to get popular hotels with their details
-        cursor.execute(
-            """
-            SELECT h.Hotel_ID, h.hotel_name, h.location, 
-                   h.description, h.star_rating, 
-                   MIN(rc.base_price) as min_price
-            FROM Hotel h
-            JOIN RoomCategory rc ON h.Hotel_ID = rc.Hotel_ID
-            GROUP BY h.Hotel_ID
-            ORDER BY h.star_rating DESC, min_price
-            LIMIT 3
-            """
-        )
-        hotels_data = cursor.fetchall()
-        
-        # Format hotel data
-        for hotel in hotels_data:
-            # Fetch some amenities for the hotel
-            cursor.execute(
-                """
-                SELECT GROUP_CONCAT(a.amenity_name SEPARATOR ' | ') as amenities
-                FROM Hotel_Amenities ha
-                JOIN Amenities a ON ha.Amenity_ID = a.Amenity_ID
-                WHERE ha.Hotel_ID = %s
-                LIMIT 3
-                """, 
-                (hotel['Hotel_ID'],)
-            )
-            amenities_result = cursor.fetchone()
-            
-            # Format amenities
-            amenities = amenities_result['amenities'] if amenities_result and amenities_result['amenities'] else "📶 Free WiFi | 🏊 Pool | 🚗 Free Parking"
-            
-            # Add hotel to the list
-            hotels.append((
-                hotel['hotel_name'],
-                f"{hotel['description'][:100]}...",
-                amenities,
-                f"${hotel['min_price']:.2f} per night"
-            ))
-            
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Could not load hotels: {err}")
-        print(f"Database Error: {err}")
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+def format_hotel(hotel):
+    """Turn a cached hotel row into the (name, description, amenities, price) card data"""
+    amenities = " | ".join(hotel['amenities']) if hotel['amenities'] else "📶 Free WiFi | 🏊 Pool | 🚗 Free Parking"
+    return (
+        hotel['hotel_name'],
+        f"{(hotel['description'] or '')[:100]}...",
+        amenities,
+        f"${hotel['min_price']:.2f} per night"
+    )
+
+def render_popular_hotels():
+    """Draw the popular hotel cards from the cache (refreshed in the background)"""
+    hotels, error = get_popular_hotels()
+    
+    # First load still running - check again shortly instead of waiting on it
+    if hotels is None and error is None:
+        main_frame.after(100, render_popular_hotels)
+        return
     
-    return hotels
+    for widget in hotel_cards.winfo_children():
+        widget.destroy()
+    
+    # Create hotel cards or show message if no hotels found
+    if hotels:
+        for hotel in hotels:
+            card = create_hotel_card(hotel_cards, format_hotel(hotel))
+            card.pack(side="left", padx=10, pady=10)
+    else:
+        # Display a message when no hotels are found
+        message = (f"Could not load hotels: {error}" if error else
+                   "No hotels found in the database.\nPlease add hotels through the admin interface.")
+        no_hotels_label = ctk.CTkLabel(
+            hotel_cards, 
+            text=message, 
+            font=("Arial", 14), 
+            text_color="gray"
+        )
+        no_hotels_label.pack(pady=50)
+
 # ------------------- Create Hotel Card -------------------
 def create_hotel_card(parent, hotel_data):
     """Create a hotel card widget"""
@@ -231,20 +235,13 @@ def create_hotel_card(parent, hotel_data):
 # No default hotels - all hotels are fetched from database
 
 # ----------------- Setup -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
-app = ctk.CTk()
-app.title("Hotel Booking - Home")
-app.geometry("1200x700")
-app.resizable(False, False)
+app = router.get_app()
 
 # Try to load user session
 load_user_session()
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("home", "Hotel Booking - Home", "1200x700", on_show=render_popular_hotels)
 
 # ----------------- Sidebar (Navigation) -----------------
 sidebar = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=200, corner_radius=0)
@@ -305,29 +302,18 @@ location_entry.grid(row=1, column=0, sticky="w", padx=(0, 20))
 checkin_label = ctk.CTkLabel(search_grid, text="📅 Check-in Date", font=("Arial", 12, "bold"))
 checkin_label.grid(row=0, column=1, sticky="w", padx=(0, 20))
 
-# Try to use DateEntry if available, otherwise use normal entry
-try:
-    # For date picker, you need: pip install tkcalendar
-    import tkcalendar
-    checkin_entry = DateEntry(search_grid, width=12, background='darkblue',
-                            foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
-    checkin_entry.grid(row=1, column=1, sticky="w", padx=(0, 20))
-except ImportError:
-    checkin_entry = ctk.CTkEntry(search_grid, width=200, placeholder_text="mm/dd/yyyy")
-    checkin_entry.grid(row=1, column=1, sticky="w", padx=(0, 20))
+# Date picker (tkcalendar is loaded after the page is drawn, see date_picker.py)
+checkin_entry = DatePicker(search_grid, width=12, entry_width=200, background='darkblue',
+                           foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
+checkin_entry.grid(row=1, column=1, sticky="w", padx=(0, 20))
 
 # Check-out Date Field
 checkout_label = ctk.CTkLabel(search_grid, text="📅 Check-out Date", font=("Arial", 12, "bold"))
 checkout_label.grid(row=0, column=2, sticky="w", padx=(0, 20))
 
-try:
-    # For date picker
-    checkout_entry = DateEntry(search_grid, width=12, background='darkblue',
-                             foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
-    checkout_entry.grid(row=1, column=2, sticky="w", padx=(0, 20))
-except ImportError:
-    checkout_entry = ctk.CTkEntry(search_grid, width=200, placeholder_text="mm/dd/yyyy")
-    checkout_entry.grid(row=1, column=2, sticky="w", padx=(0, 20))
+checkout_entry = DatePicker(search_grid, width=12, entry_width=200, background='darkblue',
+                            foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
+checkout_entry.grid(row=1, column=2, sticky="w", padx=(0, 20))
 
 # Guests Field
 guests_label = ctk.CTkLabel(search_grid, text="👥 Guests", font=("Arial", 12, "bold"))
@@ -341,6 +327,10 @@ search_btn = ctk.CTkButton(search_grid, text="Search Rooms", font=("Arial", 12,
                          height=35, width=150, command=search_hotels)
 search_btn.grid(row=1, column=4, padx=(20, 0))
 
+# Shown while a search runs in the background
+search_spinner = tasks.Spinner(search_grid, text="Searching...")
+search_spinner.grid(row=2, column=4, padx=(20, 0), pady=(5, 0))
+
 # ----------------- Popular Hotels Section -----------------
 hotels_section = ctk.CTkFrame(content_frame, fg_color="white")
 hotels_section.pack(fill="both", expand=True, padx=30, pady=10)
@@ -348,28 +338,33 @@ hotels_section.pack(fill="both", expand=True, padx=30, pady=10)
 ctk.CTkLabel(hotels_section, text="Popular Hotels", 
            font=("Arial", 20, "bold"), text_color="#2C3E50").pack(anchor="w", pady=(0, 15))
 
+# ----------------- Search Results Section (shown instead of popular hotels) -----------------
+results_section = ctk.CTkFrame(content_frame, fg_color="white")
+
+results_header = ctk.CTkFrame(results_section, fg_color="white")
+results_header.pack(fill="x", pady=(0, 10))
+
+results_title = ctk.CTkLabel(results_header, text="", font=("Arial", 20, "bold"), text_color="#2C3E50")
+results_title.pack(side="left")
+
+ctk.CTkButton(results_header, text="Back to Popular Hotels", font=("Arial", 11), 
+            fg_color="transparent", text_color="#1E90FF", hover_color="#EBF5FB", width=160,
+            command=clear_search_results).pack(side="right")
+
+results_list = ctk.CTkScrollableFrame(results_section, fg_color="white")
+results_list.pack(fill="both", expand=True)
+
 # Hotel Cards Container
 hotel_cards = ctk.CTkFrame(hotels_section, fg_color="transparent")
 hotel_cards.pack(fill="both", expand=True)
 
-# Load hotels from database
-hotels = load_popular_hotels()
-
-# Create hotel cards or show message if no hotels found
-if hotels:
-    for i, hotel_data in enumerate(hotels):
-        card = create_hotel_card(hotel_cards, hotel_data)
-        card.pack(side="left", padx=10, pady=10)
-else:
-    # Display a message when no hotels are found
-    no_hotels_label = ctk.CTkLabel(
-        hotel_cards, 
-        text="No hotels found in the database.\nPlease add hotels through the admin interface.", 
-        font=("Arial", 14), 
-        text_color="gray"
-    )
-    no_hotels_label.pack(pady=50)
+# Placeholder until the first load has finished
+ctk.CTkLabel(hotel_cards, text="Loading hotels...", font=("Arial", 14), text_color="gray").pack(pady=50)
+
+# Load hotels in the background and draw them when they arrive
+start_popular_hotels_refresh()
+render_popular_hotels()
 
 # Run the application
 if __name__ == "__main__":
-    app.mainloop()
\ No newline at end of file
+    router.run("home")
\ No newline at end of file
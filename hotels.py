@@ -0,0 +1,113 @@
+import mysql.connector
+from db import connect_db
+from instrument import timed
+import threading
+
+# ------------------- Popular Hotels -------------------
+# The home page shows a few popular hotels with their cheapest room and some
+# amenities. They are loaded with two set-based queries (hotels, then the
+# amenities of all of them with one IN (...) batch) and kept in a cache that
+# a background thread refreshes, so the page can draw its cards from memory.
+
+POPULAR_HOTELS_LIMIT = 3
+AMENITIES_PER_HOTEL = 3
+POPULAR_REFRESH_INTERVAL = 300  # Seconds between background refreshes
+
+_popular_lock = threading.Lock()
+_popular_hotels = None  # Last loaded list, or None before the first load
+_popular_error = None  # Error of the last failed load, if any
+_refresh_thread = None
+_refresh_now = threading.Event()
+
+@timed()
+def load_popular_hotels(limit=POPULAR_HOTELS_LIMIT):
+    """Load the top hotels and their amenities from the database
+
+    Returns a list of dicts with Hotel_ID, hotel_name, location, description,
+    star_rating, min_price and amenities (list of names).
+    """
+    connection = connect_db()
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT h.Hotel_ID, h.hotel_name, h.location,
+                   h.description, h.star_rating,
+                   MIN(rc.base_price) as min_price
+            FROM Hotel h
+            JOIN RoomCategory rc ON h.Hotel_ID = rc.Hotel_ID
+            GROUP BY h.Hotel_ID
+            ORDER BY h.star_rating DESC, min_price
+            LIMIT %s
+            """,
+            (limit,)
+        )
+        hotels = cursor.fetchall()
+
+        for hotel in hotels:
+            hotel['amenities'] = []
+
+        # Amenities for every hotel in one batch
+        if hotels:
+            by_id = {hotel['Hotel_ID']: hotel for hotel in hotels}
+            placeholders = ", ".join(["%s"] * len(by_id))
+            cursor.execute(
+                f"""
+                SELECT ha.Hotel_ID, a.amenity_name
+                FROM Hotel_Amenities ha
+                JOIN Amenities a ON ha.Amenity_ID = a.Amenity_ID
+                WHERE ha.Hotel_ID IN ({placeholders})
+                ORDER BY ha.Hotel_ID, a.Amenity_ID
+                """,
+                list(by_id)
+            )
+            for row in cursor.fetchall():
+                amenities = by_id[row['Hotel_ID']]['amenities']
+                if len(amenities) < AMENITIES_PER_HOTEL:
+                    amenities.append(row['amenity_name'])
+
+        cursor.close()
+        return hotels
+    finally:
+        connection.close()
+
+def refresh_popular_hotels():
+    """Reload the cached popular hotels; returns True on success"""
+    global _popular_hotels, _popular_error
+    try:
+        hotels = load_popular_hotels()
+    except mysql.connector.Error as err:
+        print(f"Could not refresh popular hotels: {err}")
+        with _popular_lock:
+            _popular_error = err
+        return False
+
+    with _popular_lock:
+        _popular_hotels = hotels
+        _popular_error = None
+    return True
+
+def get_popular_hotels():
+    """Return (hotels, error) from the cache; hotels is None until the first load finishes"""
+    with _popular_lock:
+        hotels = [dict(hotel) for hotel in _popular_hotels] if _popular_hotels is not None else None
+        return hotels, _popular_error
+
+def _refresh_loop(interval):
+    while True:
+        refresh_popular_hotels()
+        _refresh_now.wait(interval)
+        _refresh_now.clear()
+
+def start_popular_hotels_refresh(interval=POPULAR_REFRESH_INTERVAL):
+    """Start the background refresher (once); the first load begins immediately"""
+    global _refresh_thread
+    with _popular_lock:
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(target=_refresh_loop, args=(interval,),
+                                               name="popular-hotels", daemon=True)
+            _refresh_thread.start()
+
+def invalidate_popular_hotels():
+    """Ask the background refresher to reload now (call after hotel/room/amenity changes)"""
+    _refresh_now.set()
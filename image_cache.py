@@ -0,0 +1,103 @@
+import os
+import threading
+import tasks
+
+# ------------------- Image Cache -------------------
+# The launcher and login pages all show city_hotel.png scaled down. Instead
+# of decoding and LANCZOS-resizing the full picture every time a page is
+# built, scaled variants are cached by (file, size, file modification time):
+#   - in memory, as PIL images (and as PhotoImages once shown),
+#   - on disk in CACHE_DIR, so the next launch only decodes the small copy.
+# Loading runs on the task pool (see tasks.py), so a page is drawn right
+# away and the picture fills in when it is ready. Editing the source file
+# changes its modification time, so stale variants are never used.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".image_cache")
+
+_lock = threading.Lock()
+_images = {}  # Cache key -> resized PIL image
+_photos = {}  # Cache key -> PhotoImage (Tk thread only)
+
+def cache_key(path, size):
+    """Return (absolute path, size, modification time); raises OSError if the file is missing"""
+    path = os.path.abspath(path)
+    return path, tuple(size), os.stat(path).st_mtime_ns
+
+def variant_path(key):
+    """File in CACHE_DIR holding the resized variant for a cache key"""
+    path, (width, height), mtime = key
+    name, _ = os.path.splitext(os.path.basename(path))
+    return os.path.join(CACHE_DIR, f"{name}_{width}x{height}_{mtime}.png")
+
+def load_image(path, size):
+    """Return the picture resized to size as a PIL image (runs on a worker thread)"""
+    from PIL import Image
+
+    key = cache_key(path, size)
+    with _lock:
+        if key in _images:
+            return _images[key]
+
+    cached = variant_path(key)
+    if os.path.isfile(cached):
+        image = Image.open(cached)
+        image.load()
+    else:
+        image = Image.open(key[0]).resize(key[1], Image.LANCZOS)
+        save_variant(image, cached)
+
+    with _lock:
+        _images[key] = image
+    return image
+
+def save_variant(image, cached):
+    """Write a resized variant to the disk cache, dropping older variants of the same size"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        prefix = os.path.basename(cached).rsplit("_", 1)[0] + "_"
+        for old in os.listdir(CACHE_DIR):
+            if old.startswith(prefix) and old != os.path.basename(cached):
+                os.remove(os.path.join(CACHE_DIR, old))
+
+        # Write to a temporary file first so a half-written PNG is never read
+        temporary = f"{cached}.{threading.get_ident()}.tmp"
+        image.save(temporary, format="PNG")
+        os.replace(temporary, cached)
+    except OSError as err:
+        print(f"Could not cache image variant: {err}")
+
+def show_image(label, path, size, on_error=None):
+    """Show the picture resized to size on a label, loading it in the background if needed
+
+    on_error(error) is called on the Tk thread if the picture can't be loaded
+    (missing file, Pillow not installed, ...).
+    """
+    try:
+        key = cache_key(path, size)
+    except OSError as err:
+        if on_error:
+            on_error(err)
+        return
+
+    # Already shown once during this run
+    if key in _photos:
+        set_label_image(label, _photos[key])
+        return
+
+    def loaded(image):
+        from PIL import ImageTk
+
+        if key not in _photos:
+            _photos[key] = ImageTk.PhotoImage(image)
+        set_label_image(label, _photos[key])
+
+    tasks.submit(load_image, path, size, on_success=loaded, on_error=on_error or print_error)
+
+def set_label_image(label, photo):
+    if label.winfo_exists():
+        label.configure(image=photo)
+        # Keep a reference to avoid garbage collection
+        label.image = photo
+
+def print_error(err):
+    print(f"Error loading image: {err}")
@@ -0,0 +1,322 @@
+import atexit
+import functools
+import json
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# ------------------- Instrumentation -------------------
+# Records how long queries and page actions take so we can see which ones
+# slow down as the tables grow:
+#   - every cursor handed out by db.connect_db() is wrapped in a
+#     TimedCursor, which times each statement and counts the rows it
+#     returned or changed,
+#   - functions decorated with @timed("name") record their own latency
+#     (load_bookings, book_room, get_monthly_data, ...),
+#   - statements slower than SLOW_QUERY_MS are kept in a slow-query log and
+#     EXPLAINed on a separate connection when the metrics are exported.
+#     Their parameters are only held in memory for the EXPLAIN; the export
+#     lists their types, and statements on password columns keep none.
+# Latencies go into fixed log-scale histograms, so recording is a dict lookup
+# and a bisect no matter how long the app runs. The metrics are written as
+# JSON to METRICS_FILE when the app exits (or by calling export()), and
+# "python instrument.py" prints a report of that file.
+
+ENABLED = True
+METRICS_FILE = "metrics.json"
+SLOW_QUERY_MS = 200  # Statements slower than this are logged and EXPLAINed
+SLOW_QUERY_LOG_SIZE = 100  # Most recent slow statements kept
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)  # Histogram upper bounds
+SECRET_SQL = re.compile(r"password", re.IGNORECASE)  # Statements whose parameters are never kept
+
+_lock = threading.Lock()
+_queries = {}  # Normalized SQL -> Histogram
+_actions = {}  # Action name -> Histogram
+_slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_current = threading.local()  # Name of the @timed action running on this thread
+
+# ------------------- Histogram -------------------
+class Histogram:
+    """Latency histogram with row counts"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # Last bucket is "slower than every bound"
+
+    def record(self, elapsed_ms, rows=0, error=False):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.errors += error
+        self.buckets[bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction of calls"""
+        target = fraction * self.count
+        seen = 0
+        for i, hits in enumerate(self.buckets):
+            seen += hits
+            if hits and seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return 0
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "rows": self.rows,
+            "avg_rows": round(self.rows / self.count, 1) if self.count else 0,
+            "buckets": self.bucket_counts(),
+        }
+
+    def bucket_counts(self):
+        """Non-empty buckets labelled by their bounds"""
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {label: hits for label, hits in zip(labels, self.buckets) if hits}
+
+# ------------------- Recording -------------------
+def normalize_sql(sql):
+    """Collapse whitespace and IN-list placeholders so one query shape is one entry"""
+    sql = " ".join(str(sql).split())
+    return re.sub(r"%s(?:\s*,\s*%s)+", "%s, ...", sql)
+
+def record_query(sql, elapsed_ms, rows=0, error=False, params=None):
+    """Add one statement's timing to its histogram (and the slow log if needed); returns its key"""
+    key = normalize_sql(sql)
+    if not ENABLED:
+        return key
+    with _lock:
+        _queries.setdefault(key, Histogram()).record(elapsed_ms, rows, error)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            values = list(params.values() if isinstance(params, dict) else params or ())
+            _slow_queries.append({
+                "sql": key,
+                "statement": str(sql),
+                "params": None if SECRET_SQL.search(key) else params,
+                "param_types": [type(value).__name__ for value in values],
+                "elapsed_ms": round(elapsed_ms, 3),
+                "action": getattr(_current, "action", None),
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            })
+    return key
+
+def add_rows(key, rows):
+    """Add rows fetched after the statement was timed (key is the normalized SQL)"""
+    if not ENABLED or rows <= 0:
+        return
+    with _lock:
+        histogram = _queries.get(key)
+        if histogram:
+            histogram.rows += rows
+
+def record_action(name, elapsed_ms, error=False):
+    """Add one action's timing to its histogram"""
+    if not ENABLED:
+        return
+    with _lock:
+        _actions.setdefault(name, Histogram()).record(elapsed_ms, error=error)
+
+def timed(name=None):
+    """Decorator recording how long each call of the function takes"""
+    def decorate(func):
+        action = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            outer = getattr(_current, "action", None)
+            _current.action = action
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                record_action(action, (time.perf_counter() - started) * 1000, failed)
+                _current.action = outer
+        return wrapper
+    return decorate
+
+# ------------------- Timed Cursor -------------------
+class TimedCursor:
+    """Cursor wrapper that times execute()/executemany() and counts rows"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._key = None  # Normalized SQL of the last statement
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _run(self, method, sql, params, *args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = method(sql, params, *args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # Changed rows for writes; SELECT rows are counted as they are fetched
+            rows = 0 if failed or self._cursor.description else self._cursor.rowcount
+            self._key = record_query(sql, elapsed_ms, rows, failed,
+                                     None if method == self._cursor.executemany else params)
+
+    def execute(self, sql, params=None, *args, **kwargs):
+        return self._run(self._cursor.execute, sql, params, *args, **kwargs)
+
+    def executemany(self, sql, params, *args, **kwargs):
+        return self._run(self._cursor.executemany, sql, params, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            add_rows(self._key, 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        add_rows(self._key, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        add_rows(self._key, len(rows))
+        return rows
+
+def wrap_cursor(cursor):
+    """Return cursor wrapped in a TimedCursor when instrumentation is on"""
+    return TimedCursor(cursor) if ENABLED else cursor
+
+# ------------------- Export -------------------
+def explain(sql, params=None):
+    """Return the EXPLAIN plan of a statement as a list of dicts"""
+    from db import get_connection
+
+    with get_connection() as connection:
+        # Use the raw cursor so the EXPLAIN itself isn't recorded
+        cursor = connection._connection.cursor(dictionary=True)
+        try:
+            cursor.execute("EXPLAIN " + sql, params)
+            return [{key: value for key, value in row.items()} for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+def explain_slow_queries():
+    """EXPLAIN every logged slow statement that doesn't have a plan yet"""
+    with _lock:
+        pending = [entry for entry in _slow_queries if "plan" not in entry]
+
+    for entry in pending:
+        if (not re.match(r"\s*(SELECT|UPDATE|DELETE)\b", entry["statement"], re.IGNORECASE)
+                or (entry["param_types"] and entry["params"] is None)):
+            entry["plan"] = None
+            continue
+        try:
+            entry["plan"] = explain(entry["statement"], entry["params"])
+        except Exception as err:
+            entry["plan"] = f"EXPLAIN failed: {err}"
+
+def snapshot():
+    """Return every metric as a JSON-ready dict"""
+    from db import pool_stats
+
+    with _lock:
+        queries = {sql: histogram.to_dict() for sql, histogram in _queries.items()}
+        actions = {name: histogram.to_dict() for name, histogram in _actions.items()}
+        # Parameter values stay in memory; only their types are written out
+        slow_queries = [{key: value for key, value in entry.items() if key != "params"}
+                        for entry in _slow_queries]
+    return {
+        "exported_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "slow_query_ms": SLOW_QUERY_MS,
+        "actions": dict(sorted(actions.items(), key=lambda item: -item[1]["total_ms"])),
+        "queries": dict(sorted(queries.items(), key=lambda item: -item[1]["total_ms"])),
+        "slow_queries": slow_queries,
+        "pool": pool_stats(),
+    }
+
+def export(path=None):
+    """Write the metrics (with EXPLAIN plans of slow queries) to a JSON file"""
+    path = path or METRICS_FILE
+    try:
+        explain_slow_queries()
+    except Exception as err:
+        print(f"Could not EXPLAIN slow queries: {err}")
+    with open(path, "w", encoding="utf-8") as metrics_file:
+        json.dump(snapshot(), metrics_file, indent=2, default=str)
+    return path
+
+def reset():
+    """Forget everything recorded so far"""
+    with _lock:
+        _queries.clear()
+        _actions.clear()
+        _slow_queries.clear()
+
+def _export_at_exit():
+    if ENABLED and (_queries or _actions):
+        try:
+            export()
+        except Exception as err:
+            print(f"Could not export metrics: {err}")
+
+atexit.register(_export_at_exit)
+
+# ------------------- Report -------------------
+def print_report(metrics, top=15):
+    """Print the slowest actions and queries of an exported metrics file"""
+    print(f"Metrics exported at {metrics['exported_at']}\n")
+
+    print(f"{'Action':<45} {'calls':>7} {'avg ms':>9} {'p95 ms':>8} {'max ms':>9}")
+    for name, stats in list(metrics["actions"].items())[:top]:
+        print(f"{name[:45]:<45} {stats['count']:>7} {stats['avg_ms']:>9} {stats['p95_ms']:>8} {stats['max_ms']:>9}")
+
+    print(f"\n{'Query':<60} {'calls':>7} {'avg ms':>9} {'max ms':>9} {'avg rows':>9}")
+    for sql, stats in list(metrics["queries"].items())[:top]:
+        print(f"{sql[:60]:<60} {stats['count']:>7} {stats['avg_ms']:>9} {stats['max_ms']:>9} {stats['avg_rows']:>9}")
+
+    print(f"\nSlow queries (>= {metrics['slow_query_ms']} ms): {len(metrics['slow_queries'])}")
+    for entry in metrics["slow_queries"][-top:]:
+        print(f"  {entry['elapsed_ms']} ms in {entry['action'] or '-'}: {entry['sql'][:100]}")
+        if isinstance(entry.get("plan"), list):
+            for step in entry["plan"]:
+                print(f"      {step.get('table')}: type={step.get('type')} key={step.get('key')} "
+                      f"rows={step.get('rows')} {step.get('Extra') or ''}")
+
+    pool = metrics["pool"]
+    print(f"\nPool: {pool['hits']} hits, {pool['misses']} misses, {pool['waits']} waits "
+          f"({pool['wait_time']:.3f} s), {pool['timeouts']} timeouts")
+
+# Direct execution: python instrument.py [metrics.json]
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else METRICS_FILE
+    try:
+        with open(path, encoding="utf-8") as metrics_file:
+            print_report(json.load(metrics_file))
+    except FileNotFoundError:
+        print(f"No metrics file at {path} (it is written when the app exits)")
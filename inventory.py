@@ -0,0 +1,184 @@
+from db import connect_db
+from bisect import bisect_left
+from datetime import timedelta
+import threading
+import time
+
+# ------------------- Room Availability Engine -------------------
+# Room_Night holds one row per room per booked night; its primary key
+# (Room_ID, Stay_Date) makes it impossible to store two bookings for the
+# same room on the same night. RoomInventory mirrors it in memory as a
+# sorted list of booked [check_in, check_out) intervals per room, so
+# "which rooms of type X are free for these dates" is answered with a
+# binary search per room instead of a database round trip.
+
+INVENTORY_MAX_AGE = 30  # Seconds before the in-memory index is reloaded from the database
+
+def stay_nights(check_in, check_out):
+    """Return every night of a stay (check-out day not included)"""
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+
+class RoomInventory:
+    """In-memory interval index of booked nights per room"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.rooms_by_type = {}  # Room_Type -> [Room_ID, ...]
+        self.room_prices = {}  # Room_ID -> Price_per_Night
+        self.starts = {}  # Room_ID -> sorted check-in dates of its bookings
+        self.ends = {}  # Room_ID -> check-out dates, same order as starts
+        self.bookings = {}  # Booking_ID -> (Room_ID, check_in, check_out)
+        self.loaded_at = 0.0
+
+    def load(self):
+        """Load rooms and booked nights from the database"""
+        connection = connect_db()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT Room_ID, Room_Type, Price_per_Night
+                FROM Room
+                WHERE Availability_status = 'Available'
+                ORDER BY Price_per_Night, Room_ID
+                """
+            )
+            rooms = cursor.fetchall()
+
+            # Each booking's nights are consecutive, so MIN/MAX give its interval
+            cursor.execute(
+                """
+                SELECT Booking_ID, Room_ID, MIN(Stay_Date), MAX(Stay_Date)
+                FROM Room_Night
+                GROUP BY Booking_ID, Room_ID
+                ORDER BY Room_ID, MIN(Stay_Date)
+                """
+            )
+            intervals = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+
+        with self.lock:
+            self.rooms_by_type = {}
+            self.room_prices = {}
+            self.starts = {}
+            self.ends = {}
+            self.bookings = {}
+
+            for room_id, room_type, price in rooms:
+                self.rooms_by_type.setdefault(room_type, []).append(room_id)
+                self.room_prices[room_id] = price
+                self.starts[room_id] = []
+                self.ends[room_id] = []
+
+            for booking_id, room_id, first_night, last_night in intervals:
+                self.bookings[booking_id] = (room_id, first_night, last_night + timedelta(days=1))
+                self.starts.setdefault(room_id, []).append(first_night)
+                self.ends.setdefault(room_id, []).append(last_night + timedelta(days=1))
+
+            self.loaded_at = time.monotonic()
+
+    def is_free(self, room_id, check_in, check_out):
+        """Return True if the room has no booked night in [check_in, check_out)"""
+        with self.lock:
+            starts = self.starts.get(room_id, [])
+            # Last booking that starts before our check-out is the only one that can overlap
+            i = bisect_left(starts, check_out)
+            return i == 0 or self.ends[room_id][i - 1] <= check_in
+
+    def free_rooms(self, room_type, check_in, check_out):
+        """Return the IDs of rooms of this type that are free for [check_in, check_out)"""
+        with self.lock:
+            return [room_id for room_id in self.rooms_by_type.get(room_type, [])
+                    if self.is_free(room_id, check_in, check_out)]
+
+    def free_rooms_bulk(self, room_type, date_ranges):
+        """Answer free_rooms for many (check_in, check_out) ranges at once"""
+        with self.lock:
+            return [self.free_rooms(room_type, check_in, check_out)
+                    for check_in, check_out in date_ranges]
+
+    def available_counts(self, check_in, check_out):
+        """Return the number of free rooms per room type for the given dates"""
+        with self.lock:
+            return {room_type: len(self.free_rooms(room_type, check_in, check_out))
+                    for room_type in self.rooms_by_type}
+
+    def add_booking(self, booking_id, room_id, check_in, check_out):
+        """Record a booking that was just written to Room_Night
+
+        Keyed by booking_id: if a reload already picked the booking up, its
+        interval is replaced rather than added twice.
+        """
+        with self.lock:
+            self.remove_booking(booking_id)
+            starts = self.starts.setdefault(room_id, [])
+            ends = self.ends.setdefault(room_id, [])
+            i = bisect_left(starts, check_in)
+            starts.insert(i, check_in)
+            ends.insert(i, check_out)
+            self.bookings[booking_id] = (room_id, check_in, check_out)
+
+    def remove_booking(self, booking_id):
+        """Forget a booking whose nights were released (does nothing if it isn't indexed)"""
+        with self.lock:
+            booking = self.bookings.pop(booking_id, None)
+            if not booking:
+                return
+            room_id, check_in, _ = booking
+            starts = self.starts.get(room_id, [])
+            i = bisect_left(starts, check_in)
+            if i < len(starts) and starts[i] == check_in:
+                del starts[i]
+                del self.ends[room_id][i]
+
+
+_inventory = RoomInventory()
+
+def get_inventory(max_age=INVENTORY_MAX_AGE):
+    """Return the shared availability index, reloading it when it is stale"""
+    if time.monotonic() - _inventory.loaded_at > max_age:
+        _inventory.load()
+    return _inventory
+
+def invalidate_inventory():
+    """Force a reload on the next get_inventory() call"""
+    _inventory.loaded_at = 0.0
+
+# ------------------- Night Reservation (database) -------------------
+def reserve_nights(cursor, room_id, booking_id, check_in, check_out):
+    """Insert one Room_Night row per night; fails with a duplicate key if any night is taken"""
+    cursor.executemany(
+        "INSERT INTO Room_Night (Room_ID, Stay_Date, Booking_ID) VALUES (%s, %s, %s)",
+        [(room_id, night, booking_id) for night in stay_nights(check_in, check_out)]
+    )
+
+def release_nights(cursor, booking_id):
+    """Free every night held by a booking"""
+    cursor.execute("DELETE FROM Room_Night WHERE Booking_ID = %s", (booking_id,))
+
+def backfill_room_nights(cursor):
+    """Fill Room_Night from existing bookings (used once when the table is created)"""
+    cursor.execute(
+        """
+        SELECT Booking_ID, Room_ID, Check_IN_Date, Check_Out_Date
+        FROM Booking
+        WHERE Booking_Status <> 'Cancelled'
+        ORDER BY Booking_ID
+        """
+    )
+    rows = []
+    for booking_id, room_id, check_in, check_out in cursor.fetchall():
+        rows.extend((room_id, night, booking_id) for night in stay_nights(check_in, check_out))
+
+    # Older data could hold overlapping stays for one room; keep the earliest booking
+    if rows:
+        cursor.executemany(
+            "INSERT IGNORE INTO Room_Night (Room_ID, Stay_Date, Booking_ID) VALUES (%s, %s, %s)",
+            rows
+        )
+
+    # Rooms are no longer taken out of sale by a booking
+    cursor.execute("UPDATE Room SET Availability_status = 'Available' WHERE Availability_status = 'Booked'")
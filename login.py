@@ -1,36 +1,24 @@
 import customtkinter as ctk
 from tkinter import messagebox
 import mysql.connector
-import hashlib
-import subprocess
-import sys
-
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="new_password",
-        database="hotel_book"
-    )
-
-# ------------------- Password Hashing -------------------
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+from db import connect_db
+import credentials
+import image_cache
+import router
+import session
+import tasks
 
 # ------------------- Open Sign Up Page -------------------
 def open_signup(event=None):
     try:
-        subprocess.Popen([sys.executable, "signup.py"])
-        app.destroy()  # Close the current login window
+        router.show("signup")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open signup page: {e}")
 
 # ------------------- Open Admin Login -------------------
 def open_admin_login():
     try:
-        subprocess.Popen([sys.executable, "admin_login.py"])
-        app.destroy()  # Close the current login window
+        router.show("admin_login")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open admin login: {e}")
 
@@ -72,44 +60,40 @@ def login_user():
         messagebox.showwarning("Input Error", "Please enter both email and password.")
         return
 
-    hashed_password = hash_password(password)
+    # Checking the password is deliberately slow, so it runs in the background
+    login_btn.configure(state="disabled")
+    tasks.submit(credentials.authenticate, "user", email, password, key="user_login", spinner=login_spinner,
+                 on_success=lambda user: login_user_finished(user, email), on_error=login_user_failed)
 
-    try:
-        connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT user_id, first_name, last_name FROM Users WHERE email = %s AND password = %s",
-            (email, hashed_password)
-        )
-        user = cursor.fetchone()
+def login_user_finished(user, email):
+    """Open the home page once the password has been checked"""
+    login_btn.configure(state="normal")
 
-        if user:
-            messagebox.showinfo("Success", f"Welcome {user['first_name']} {user['last_name']}!")
-            
-            # Remember the login if checkbox is checked
-            if remember_var.get():
-                # In a real app, you would use a more secure method
-                # For this example, we'll just simulate remembering the login
-                print(f"Remembering login for: {email}")
-            
-            # Open home page with user ID
-            app.destroy()  # Close the login window
-            open_home_page(user['user_id'])
-        else:
-            messagebox.showerror("Login Failed", "Invalid Email or Password.")
-    
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+    if user:
+        messagebox.showinfo("Success", f"Welcome {user['first_name']} {user['last_name']}!")
+        
+        # Remember the login if checkbox is checked
+        if remember_var.get():
+            # In a real app, you would use a more secure method
+            # For this example, we'll just simulate remembering the login
+            print(f"Remembering login for: {email}")
+        
+        # Open home page with the user's profile as the session
+        password_entry.delete(0, 'end')
+        open_home_page(user)
+    else:
+        messagebox.showerror("Login Failed", "Invalid Email or Password.")
+
+def login_user_failed(error):
+    login_btn.configure(state="normal")
+    tasks.show_error(error)
 
 # ------------------- Open Home Page -------------------
-def open_home_page(user_id):
+def open_home_page(user):
     try:
-        # Launch the home page and pass the user ID
-        subprocess.Popen([sys.executable, "home.py", str(user_id)])
+        # Sign the profile into a session token so the next pages don't need to query it again
+        session.login("user", user)
+        router.show("home")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open home page: {e}")
 
@@ -118,66 +102,37 @@ def handle_enter(event):
     login_user()
 
 # ----------------- Setup -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
-app = ctk.CTk()
-app.title("Hotel Booking Login")
-app.geometry("1000x800")
-app.resizable(False, False)
+app = router.get_app()
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("login", "Hotel Booking Login", "1000x800")
 
 # ----------------- Left Frame (Illustration) -----------------
 left_frame = ctk.CTkFrame(main_frame, fg_color="#3A546E", width=500, corner_radius=0)
 left_frame.pack(side="left", fill="both", expand=True)
 
-# Load and display the PNG image
-try:
-    from PIL import Image, ImageTk
-    
-    # Create a frame for the image
-    image_frame = ctk.CTkFrame(left_frame, fg_color="#3A546E")
-    image_frame.pack(fill="both", expand=True)
-    
-    # Create a label to hold the image
-    image_label = ctk.CTkLabel(image_frame, text="", fg_color="#3A546E")
-    image_label.pack(fill="both", expand=True)
-    
-    try:
-        # Replace 'city_image.png' with the actual name of your PNG file
-        image_path = "city_hotel.png"  # Update this with your PNG file name
-        
-        # Load and resize the image
-        hotel_image = Image.open(image_path)
-        
-        # Get the dimensions of the frame
-        width, height = 400, 300
-        
-        # Resize the image while maintaining aspect ratio
-        hotel_image = hotel_image.resize((width, height), Image.LANCZOS)
-        
-        # Convert to PhotoImage for display
-        hotel_photo = ImageTk.PhotoImage(hotel_image)
-        
-        # Set the image to the label
-        image_label.configure(image=hotel_photo)
-        
-        # Keep a reference to avoid garbage collection
-        image_label.image = hotel_photo
-    
-    except Exception as e:
-        print(f"Error loading image: {e}")
+# Picture, scaled and loaded in the background (see image_cache.py)
+# Create a frame for the image
+image_frame = ctk.CTkFrame(left_frame, fg_color="#3A546E")
+image_frame.pack(fill="both", expand=True)
+
+# Create a label to hold the image
+image_label = ctk.CTkLabel(image_frame, text="", fg_color="#3A546E")
+image_label.pack(fill="both", expand=True)
+
+def hotel_image_failed(err):
+    """Show why the picture could not be loaded"""
+    print(f"Error loading image: {err}")
+    if isinstance(err, ImportError):
+        # Fallback if PIL is not installed
+        image_label.configure(text="PIL module not found\nPlease install PIL/Pillow with:\npip install Pillow", 
+                              font=("Arial", 14), text_color="white")
+    else:
         # Fallback text if image can't be loaded
         image_label.configure(text="Hotel Image Not Found\n\nPlease place your PNG file in the same directory\nand update the image path in the code.", 
                               font=("Arial", 14), text_color="white")
-except ImportError:
-    # Fallback if PIL is not installed
-    error_label = ctk.CTkLabel(left_frame, text="PIL module not found\nPlease install PIL/Pillow with:\npip install Pillow", 
-                             font=("Arial", 14), text_color="white")
-    error_label.pack(pady=300)
+
+image_cache.show_image(image_label, "city_hotel.png", (400, 300), on_error=hotel_image_failed)
 
 # ----------------- Right Frame (Login Form) -----------------
 right_frame = ctk.CTkFrame(main_frame, fg_color="white", corner_radius=0)
@@ -223,7 +178,10 @@ forgot_password_link.bind("<Button-1>", forgot_password)
 login_btn = ctk.CTkButton(content_frame, text="Login", font=("Arial", 14, "bold"), 
                         fg_color="#0F2D52", hover_color="#1E4D88", 
                         width=400, height=45, corner_radius=5, command=login_user)
-login_btn.pack(pady=(0, 20))
+login_btn.pack(pady=(0, 5))
+
+login_spinner = tasks.Spinner(content_frame, text="Signing in...", font=("Arial", 10))
+login_spinner.pack(pady=(0, 15))
 
 # Sign Up
 signup_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
@@ -249,4 +207,5 @@ version_label = ctk.CTkLabel(content_frame, text="v1.0.0", text_color="#6c757d",
 version_label.pack(pady=(30, 0))
 
 # Run App
-app.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    router.run("login")
\ No newline at end of file
@@ -1,141 +1,48 @@
+import time
+STARTED = time.perf_counter()  # Taken before the heavy imports, for the cold-start report
+
 import customtkinter as ctk
 from tkinter import messagebox
 import mysql.connector
-import subprocess
-import sys
+import db
+import migrations
+from hotels import start_popular_hotels_refresh
+import router
+import tasks
+import instrument
+import image_cache
 import os
-import hashlib
-from PIL import Image, ImageTk
+from credentials import hash_password
 
 # ------------------- Database Setup Functions -------------------
 def connect_mysql():
     """Connect to MySQL without specifying a database"""
-    try:
-        return mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="new_password"
-        )
-    except mysql.connector.Error as err:
-        return None
+    server_config = {key: value for key, value in db.DB_CONFIG.items() if key != "database"}
+    return mysql.connector.connect(**server_config)
 
 def setup_database():
-    """Create database and tables if they don't exist"""
+    """Create the database if needed and apply any missing migrations (errors are raised)"""
     try:
         # Connect to MySQL (without specifying a database)
         connection = connect_mysql()
         cursor = connection.cursor()
         
         # Create database if it doesn't exist
-        cursor.execute("CREATE DATABASE IF NOT EXISTS hotel_book")
-        cursor.execute("USE hotel_book")
-        
-        # Create Users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Users (
-                user_id INT AUTO_INCREMENT PRIMARY KEY,
-                first_name VARCHAR(50) NOT NULL,
-                last_name VARCHAR(50) NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
-                phone VARCHAR(20),
-                password VARCHAR(255) NOT NULL,
-                user_address VARCHAR(255),
-                user_role VARCHAR(20) DEFAULT 'customer'
-            )
-        """)
-        
-        # Create Admin table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Admin (
-                Admin_ID INT AUTO_INCREMENT PRIMARY KEY,
-                AdminName VARCHAR(100) NOT NULL,
-                AdminEmail VARCHAR(100) UNIQUE NOT NULL,
-                AdminPassword VARCHAR(255) NOT NULL
-            )
-        """)
-        
-        # Create Room table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Room (
-                Room_ID INT AUTO_INCREMENT PRIMARY KEY,
-                Room_Type VARCHAR(50) NOT NULL,
-                Price_per_Night DECIMAL(10, 2) NOT NULL,
-                Availability_status VARCHAR(20) DEFAULT 'Available',
-                Updated_By INT,
-                FOREIGN KEY (Updated_By) REFERENCES Admin(Admin_ID) ON DELETE SET NULL
-            )
-        """)
-        
-        # Create Booking table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Booking (
-                Booking_ID INT AUTO_INCREMENT PRIMARY KEY,
-                User_ID INT NOT NULL,
-                Room_ID INT NOT NULL,
-                Check_IN_Date DATE NOT NULL,
-                Check_Out_Date DATE NOT NULL,
-                Total_Cost DECIMAL(10, 2) NOT NULL,
-                Booking_Status VARCHAR(20) DEFAULT 'Pending',
-                FOREIGN KEY (User_ID) REFERENCES Users(user_id) ON DELETE CASCADE,
-                FOREIGN KEY (Room_ID) REFERENCES Room(Room_ID) ON DELETE CASCADE
-            )
-        """)
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db.DB_CONFIG['database']}")
+        cursor.execute(f"USE {db.DB_CONFIG['database']}")
         
-        # Create Review table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Review (
-                Review_ID INT AUTO_INCREMENT PRIMARY KEY,
-                User_ID INT,
-                Rating INT NOT NULL CHECK (Rating BETWEEN 1 AND 5),
-                Comments TEXT,
-                Review_Date DATE,
-                FOREIGN KEY (User_ID) REFERENCES Users(user_id) ON DELETE SET NULL
-            )
-        """)
+        # Create or upgrade the tables (see migrations.py)
+        migrations.migrate(connection)
         
-        # Create Report table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS Report (
-                Report_ID INT AUTO_INCREMENT PRIMARY KEY,
-                Generated_By INT,
-                Generate_Time DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (Generated_By) REFERENCES Admin(Admin_ID) ON DELETE SET NULL
-            )
-        """)
-        
-        # Commit the changes
-        connection.commit()
-        return True
-        
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Setup Error", f"Error setting up database: {err}")
-        return False
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
-def connect_db():
-    """Connect to the hotel_booking database"""
-    try:
-        return mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="new_password",
-            database="hotel_book"
-        )
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
-        return None
-
-def hash_password(password):
-    """Hash a password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
 def add_sample_data():
-    """Add sample admin, rooms, and users if tables are empty"""
+    """Add sample admin, rooms, hotels, amenities and users if tables are empty (errors are raised)"""
     try:
-        connection = connect_db()
+        connection = db.connect_db()
         cursor = connection.cursor()
         
         # Check if Admin table is empty
@@ -157,23 +64,90 @@ def add_sample_data():
         if room_count == 0:
             # Add sample rooms/hotels
             room_data = [
-                ("Luxury Grand Hotel - Single Room", 150.00, "Available", 1),
-                ("Luxury Grand Hotel - Double Room", 250.00, "Available", 1),
-                ("Luxury Grand Hotel - Suite", 350.00, "Available", 1),
-                ("Ocean View Resort - Standard Room", 200.00, "Available", 1),
-                ("Ocean View Resort - Deluxe Room", 300.00, "Available", 1),
-                ("Mountain Retreat Lodge - Cabin", 180.00, "Available", 1),
-                ("Mountain Retreat Lodge - Family Suite", 280.00, "Available", 1),
-                ("City Center Hotel - Economy Room", 120.00, "Available", 1),
-                ("City Center Hotel - Business Room", 220.00, "Available", 1),
-                ("Beachfront Villa - Standard", 400.00, "Available", 1)
+                ("Luxury Grand Hotel - Single Room", 150.00, "Available", 1, 1),
+                ("Luxury Grand Hotel - Double Room", 250.00, "Available", 1, 2),
+                ("Luxury Grand Hotel - Suite", 350.00, "Available", 1, 4),
+                ("Ocean View Resort - Standard Room", 200.00, "Available", 1, 2),
+                ("Ocean View Resort - Deluxe Room", 300.00, "Available", 1, 3),
+                ("Mountain Retreat Lodge - Cabin", 180.00, "Available", 1, 4),
+                ("Mountain Retreat Lodge - Family Suite", 280.00, "Available", 1, 6),
+                ("City Center Hotel - Economy Room", 120.00, "Available", 1, 2),
+                ("City Center Hotel - Business Room", 220.00, "Available", 1, 2),
+                ("Beachfront Villa - Standard", 400.00, "Available", 1, 4)
             ]
             
             cursor.executemany(
-                "INSERT INTO Room (Room_Type, Price_per_Night, Availability_status, Updated_By) VALUES (%s, %s, %s, %s)",
+                """
+                INSERT INTO Room (Room_Type, Price_per_Night, Availability_status, Updated_By, Max_Guests) 
+                VALUES (%s, %s, %s, %s, %s)
+                """,
                 room_data
             )
         
+        # Add the sample hotels if Hotel table is empty
+        cursor.execute("SELECT COUNT(*) FROM Hotel")
+        hotel_count = cursor.fetchone()[0]
+        
+        if hotel_count == 0:
+            hotel_data = [
+                ("Luxury Grand Hotel", "Chicago, Illinois", "Five-star comfort on the Magnificent Mile with a rooftop spa and fine dining.", 5),
+                ("Ocean View Resort", "Miami Beach, Florida", "Beachfront resort with ocean-facing balconies, three pools and a private beach.", 4),
+                ("Mountain Retreat Lodge", "Aspen, Colorado", "Rustic lodge with ski-in access, log cabins and a fireside lounge.", 4),
+                ("City Center Hotel", "Mt. Pleasant, Michigan", "Modern downtown hotel close to the university, shops and restaurants.", 3),
+                ("Beachfront Villa", "Malibu, California", "Private villas right on the sand with a terrace and sunset views.", 5)
+            ]
+            
+            for hotel_name, location, description, star_rating in hotel_data:
+                cursor.execute(
+                    "INSERT INTO Hotel (hotel_name, location, description, star_rating) VALUES (%s, %s, %s, %s)",
+                    (hotel_name, location, description, star_rating)
+                )
+                
+                # Sample rooms carry the hotel name in their room type
+                cursor.execute(
+                    "UPDATE Room SET Hotel_ID = %s WHERE Hotel_ID IS NULL AND Room_Type LIKE %s",
+                    (cursor.lastrowid, f"{hotel_name} - %")
+                )
+            
+            # One room category per sample room type, priced like the room
+            cursor.execute(
+                """
+                INSERT INTO RoomCategory (Hotel_ID, category_name, base_price)
+                SELECT Hotel_ID, SUBSTRING_INDEX(Room_Type, ' - ', -1), MIN(Price_per_Night)
+                FROM Room
+                WHERE Hotel_ID IS NOT NULL
+                GROUP BY Hotel_ID, Room_Type
+                """
+            )
+        
+        # Add sample amenities if Amenities table is empty
+        cursor.execute("SELECT COUNT(*) FROM Amenities")
+        amenity_count = cursor.fetchone()[0]
+        
+        if amenity_count == 0:
+            amenity_data = [
+                ("📶 Free WiFi",), ("🏊 Pool",), ("🚗 Free Parking",), 
+                ("🍳 Breakfast",), ("💆 Spa",), ("🏋️ Gym",), ("🏖️ Beach Access",)
+            ]
+            cursor.executemany("INSERT INTO Amenities (amenity_name) VALUES (%s)", amenity_data)
+            
+            hotel_amenities = [
+                ("Luxury Grand Hotel", "💆 Spa"), ("Luxury Grand Hotel", "🏋️ Gym"), ("Luxury Grand Hotel", "📶 Free WiFi"),
+                ("Ocean View Resort", "🏖️ Beach Access"), ("Ocean View Resort", "🏊 Pool"), ("Ocean View Resort", "🍳 Breakfast"),
+                ("Mountain Retreat Lodge", "🚗 Free Parking"), ("Mountain Retreat Lodge", "🍳 Breakfast"),
+                ("City Center Hotel", "📶 Free WiFi"), ("City Center Hotel", "🏋️ Gym"),
+                ("Beachfront Villa", "🏖️ Beach Access"), ("Beachfront Villa", "🏊 Pool")
+            ]
+            cursor.executemany(
+                """
+                INSERT IGNORE INTO Hotel_Amenities (Hotel_ID, Amenity_ID)
+                SELECT h.Hotel_ID, a.Amenity_ID
+                FROM Hotel h, Amenities a
+                WHERE h.hotel_name = %s AND a.amenity_name = %s
+                """,
+                hotel_amenities
+            )
+        
         # Add a test user if Users table is empty
         cursor.execute("SELECT COUNT(*) FROM Users")
         user_count = cursor.fetchone()[0]
@@ -190,39 +164,86 @@ def add_sample_data():
             )
         
         connection.commit()
-        return True
         
-    except mysql.connector.Error as err:
-        messagebox.showerror("Sample Data Error", f"Error adding sample data: {err}")
-        print(f"Error adding sample data: {err}")
-        return False
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
+def prepare_database():
+    """Bring the database up to date (runs on a worker thread)
+
+    A single query on Schema_Version tells whether the schema is current; if
+    it is, all DDL and seeding is skipped. Returns True if setup work ran.
+    """
+    if migrations.schema_is_current():
+        return False
+    
+    setup_database()
+    add_sample_data()
+    return True
+
+# ------------------- Startup -------------------
+def startup_ms():
+    """Milliseconds since the process started loading main.py"""
+    return (time.perf_counter() - STARTED) * 1000
+
+def window_shown():
+    """The launcher is on screen - report it and start the database work"""
+    app.update_idletasks()
+    first_paint = startup_ms()
+    instrument.record_action("startup.first_window", first_paint)
+    
+    # Check if all required files exist
+    check_required_files()
+    
+    tasks.submit(prepare_database, on_success=database_ready, on_error=database_failed,
+                 spinner=database_spinner)
+
+def database_ready(setup_ran):
+    """Enable the launcher once the database is usable"""
+    ready = startup_ms()
+    # Startups that had to build or update the schema are kept apart
+    instrument.record_action("startup.database_setup" if setup_ran else "startup.database_ready", ready)
+    
+    # Start loading the home page's popular hotels in the background
+    start_popular_hotels_refresh()
+    
+    set_launcher_enabled(True)
+    startup_label.configure(text=f"Ready in {ready:.0f} ms")
+
+def database_failed(err):
+    """Let the user in anyway, but say the database could not be set up"""
+    print(f"Database Setup Error: {err}")
+    messagebox.showerror("Setup Error", f"Failed to set up the database: {err}\n\n"
+                         "The application may not function correctly.")
+    set_launcher_enabled(True)
+    startup_label.configure(text="Database unavailable")
+
+def set_launcher_enabled(enabled):
+    """Enable or disable the buttons that need the database"""
+    for button in (login_btn, signup_btn, admin_btn):
+        button.configure(state="normal" if enabled else "disabled")
+
 # ------------------- Navigation Functions -------------------
 def open_login():
     """Open the login page"""
     try:
-        subprocess.Popen([sys.executable, "login.py"])
-        app.destroy()  # Close the current window
+        router.show("login")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open login page: {e}")
 
 def open_signup():
     """Open the signup page"""
     try:
-        subprocess.Popen([sys.executable, "signup.py"])
-        app.destroy()  # Close the current window
+        router.show("signup")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open signup page: {e}")
 
 def open_admin_login():
     """Open the admin login page"""
     try:
-        subprocess.Popen([sys.executable, "admin_login.py"])
-        app.destroy()  # Close the current window
+        router.show("admin_login")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open admin login page: {e}")
 
@@ -252,65 +273,31 @@ def check_required_files():
 # ------------------- Main Application -------------------
 def main():
     """Main application function"""
-    global app, content_frame
-    
-    # Setup the database and add sample data
-    if not setup_database():
-        messagebox.showerror("Setup Error", "Failed to set up the database. The application may not function correctly.")
-    else:
-        if not add_sample_data():
-            messagebox.showwarning("Data Warning", "Failed to add sample data. The application will continue, but some features may not work as expected.")
+    global app, content_frame, login_btn, signup_btn, admin_btn, startup_label, database_spinner
     
-    # Check if all required files exist
-    check_required_files()
+    # The window is built and shown first; the database is checked and set up
+    # in the background once it is on screen (see window_shown)
     
-    # Create the main application window
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking System - Launcher")
-    app.geometry("1000x700")
-    app.resizable(False, False)
+    # Create the main application window (every page is shown inside it)
+    app = router.get_app()
     
     # Main Container
-    main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-    main_frame.pack(expand=True, fill="both")
+    main_frame = router.create_page("main", "Hotel Booking System - Launcher", "1000x700")
     
     # Left Side - Image
     left_frame = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=400, corner_radius=0)
     left_frame.pack(side="left", fill="both", expand=True)
     
-    # Try to load the hotel image
-    try:
-        # Create a label to hold the image
-        image_label = ctk.CTkLabel(left_frame, text="", fg_color="#2C3E50")
-        image_label.pack(fill="both", expand=True)
-        
-        try:
-            # Try to load the image
-            image_path = "city_hotel.png"
-            hotel_image = Image.open(image_path)
-            
-            # Resize the image
-            width, height = 400, 300
-            hotel_image = hotel_image.resize((width, height), Image.LANCZOS)
-            
-            # Convert to PhotoImage for display
-            hotel_photo = ImageTk.PhotoImage(hotel_image)
-            
-            # Set the image to the label
-            image_label.configure(image=hotel_photo)
-            
-            # Keep a reference to avoid garbage collection
-            image_label.image = hotel_photo
-        except:
-            # Display a placeholder if image can't be loaded
-            image_label.configure(text="Hotel Booking System", font=("Arial", 24, "bold"), text_color="white")
-    except:
-        # Handle case where PIL may not be installed
-        ctk.CTkLabel(left_frame, text="Hotel Booking System", 
-                   font=("Arial", 24, "bold"), text_color="white").pack(pady=300)
+    # Hotel picture, scaled and loaded in the background (see image_cache.py)
+    image_label = ctk.CTkLabel(left_frame, text="", fg_color="#2C3E50")
+    image_label.pack(fill="both", expand=True)
+    
+    def image_failed(err):
+        # Display a placeholder if image can't be loaded
+        print(f"Error loading image: {err}")
+        image_label.configure(text="Hotel Booking System", font=("Arial", 24, "bold"), text_color="white")
+    
+    image_cache.show_image(image_label, "city_hotel.png", (400, 300), on_error=image_failed)
     
     # Right Side - Launcher Options
     right_frame = ctk.CTkFrame(main_frame, fg_color="white", corner_radius=0)
@@ -353,8 +340,20 @@ def main():
     ctk.CTkLabel(content_frame, text="Hotel Booking System v1.0.0", font=("Arial", 12), text_color="gray").pack(pady=(50, 0))
     ctk.CTkLabel(content_frame, text="© 2023 All Rights Reserved", font=("Arial", 10), text_color="gray").pack(pady=(5, 0))
     
+    # Database status while it is being checked
+    database_spinner = tasks.Spinner(content_frame, text="Connecting to database...", font=("Arial", 10))
+    database_spinner.pack(pady=(5, 0))
+    startup_label = ctk.CTkLabel(content_frame, text="", font=("Arial", 10), text_color="gray")
+    startup_label.pack()
+    
+    # Pages behind these buttons need the database
+    set_launcher_enabled(False)
+    
+    # Start the database work once the window has been drawn
+    app.after(0, window_shown)
+    
     # Run the application
-    app.mainloop()
+    router.run("main")
 
 # Run the application
 if __name__ == "__main__":
@@ -1,67 +1,48 @@
 import customtkinter as ctk
-from tkinter import messagebox, ttk
+from tkinter import messagebox, filedialog
 import mysql.connector
-import subprocess
-import sys
+from mysql.connector import errorcode
+from db import connect_db
+from instrument import timed
+from analytics import invalidate_dashboard_stats
+import rollup
+import user_counters
+from inventory import get_inventory, reserve_nights, release_nights
+from booking_queries import (BOOKING_PAGE_SIZE, SORT_ORDERS, DEFAULT_SORT, load_bookings, load_booking_details,
+                            load_status_counts)
+from export import export_bookings
+from virtual_table import VirtualTable
+import router
+import session
+import tasks
 from datetime import datetime
-from tkcalendar import DateEntry  # You may need to install this: pip install tkcalendar
-
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="new_password",
-        database="hotel_book"
-    )
+from date_picker import DatePicker
 
 # ------------------- Global Variables -------------------
 current_admin = None
 selected_booking = None
+next_cursor = None  # Keyset cursor for the page after the last loaded one
+loaded_filters = {}  # Filters the loaded pages were read with (next_cursor belongs to them)
+booking_counts = {}  # Status -> number of bookings matching the current filters
+counted_status = "All"  # Status filter the counts were loaded for
+saving = False  # A status change or deletion is being saved
+exporting = False  # An export is running
+export_progress = {}  # Latest stats reported by the running export (written by its worker thread)
 
 # ------------------- Admin Session Management -------------------
 def load_admin_session():
-    """Load admin information from database"""
+    """Load the logged-in admin's profile from the signed session token"""
     global current_admin
     
-    # Check if any admin_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            admin_id = int(sys.argv[1])
-            
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Admin WHERE Admin_ID = %s",
-                (admin_id,)
-            )
-            admin_data = cursor.fetchone()
-            
-            if admin_data:
-                current_admin = admin_data
-                return True
-                
-        except (ValueError, IndexError, mysql.connector.Error) as err:
-            print(f"Error loading admin session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    # The token is checked locally (no database round trip)
+    current_admin = session.current("admin")
+    return current_admin is not None
 
 # ------------------- Navigation Functions -------------------
 def open_page(page_name):
-    """Open another page and close the current one"""
+    """Switch to another page in the same window"""
     try:
-        # Pass the current admin ID to the next page if an admin is logged in
-        admin_param = [str(current_admin['Admin_ID'])] if current_admin else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + admin_param
-        
-        subprocess.Popen(command)
-        app.destroy()  # Close the current window
+        router.show(page_name)
     except Exception as e:
         print(f"Navigation Error: {e}")
         messagebox.showerror("Navigation Error", f"Unable to open {page_name} page: {e}")
@@ -79,78 +60,33 @@ def logout():
     """Log out the current admin and return to login page"""
     global current_admin
     current_admin = None
-    open_page("login")
+    router.logout("login")
 
 # ------------------- Booking Management Functions -------------------
-def load_bookings():
-    """Load all bookings from database"""
-    bookings = []
-    
-    try:
-        connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
-        
-        # Query to get bookings with user and room info
-        cursor.execute(
-            """
-            SELECT b.Booking_ID, CONCAT(u.first_name, ' ', u.last_name) AS Customer,
-                   r.Room_Type, b.Check_IN_Date, b.Check_Out_Date, 
-                   b.Total_Cost, b.Booking_Status
-            FROM Booking b
-            JOIN Users u ON b.User_ID = u.user_id
-            JOIN Room r ON b.Room_ID = r.Room_ID
-            ORDER BY b.Check_IN_Date DESC
-            """
-        )
-        
-        bookings = cursor.fetchall()
-        return bookings
-        
-    except mysql.connector.Error as err:
-        print(f"Error loading bookings: {err}")
-        messagebox.showerror("Database Error", f"Error loading bookings: {err}")
-        return []
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+@timed()
+def update_booking_status(booking_id, status):
+    """Update the status of a booking (runs on a worker thread, errors are raised)
 
-def load_booking_details(booking_id):
-    """Load details for a specific booking"""
+    Returns the previous status, None if the booking no longer exists, or
+    False if it can't be reinstated because its room was booked meanwhile.
+    """
     try:
         connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
+        cursor = connection.cursor()
         
-        # Query to get detailed booking info
+        # Lock the booking and remember its current status for the rollup
         cursor.execute(
             """
-            SELECT b.*, u.first_name, u.last_name, u.email, u.phone, 
-                   r.Room_Type, r.Price_per_Night
-            FROM Booking b
-            JOIN Users u ON b.User_ID = u.user_id
-            JOIN Room r ON b.Room_ID = r.Room_ID
-            WHERE b.Booking_ID = %s
+            SELECT Room_ID, Check_IN_Date, Check_Out_Date, Booking_Status
+            FROM Booking WHERE Booking_ID = %s FOR UPDATE
             """,
             (booking_id,)
         )
-        
         booking = cursor.fetchone()
-        return booking
-        
-    except mysql.connector.Error as err:
-        print(f"Error loading booking details: {err}")
-        messagebox.showerror("Database Error", f"Error loading booking details: {err}")
-        return None
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
-
-def update_booking_status(booking_id, status):
-    """Update the status of a booking"""
-    try:
-        connection = connect_db()
-        cursor = connection.cursor()
+        if booking is None:
+            connection.rollback()
+            return None
+        room_id, check_in, check_out, old_status = booking
         
         # Update booking status
         cursor.execute(
@@ -162,137 +98,209 @@ def update_booking_status(booking_id, status):
             (status, booking_id)
         )
         
-        # If cancelling, make the room available again
-        if status == "Cancelled":
-            cursor.execute(
-                """
-                UPDATE Room r
-                JOIN Booking b ON r.Room_ID = b.Room_ID
-                SET r.Availability_status = 'Available'
-                WHERE b.Booking_ID = %s
-                """,
-                (booking_id,)
-            )
+        # Keep the daily revenue rollup in step (cancelled bookings don't count)
+        rollup.apply_status_change(cursor, booking_id, old_status, status)
+        
+        # Cancelling frees the booked nights; reinstating takes them back if still free
+        if status == "Cancelled" and old_status != "Cancelled":
+            release_nights(cursor, booking_id)
+        elif old_status == "Cancelled" and status != "Cancelled":
+            try:
+                reserve_nights(cursor, room_id, booking_id, check_in, check_out)
+            except mysql.connector.IntegrityError as err:
+                if err.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                connection.rollback()
+                return False
         
         connection.commit()
-        messagebox.showinfo("Success", f"Booking #{booking_id} status updated to {status}")
-        return True
+        invalidate_dashboard_stats()
+        
+        # Keep the in-memory availability index in step
+        if status == "Cancelled" and old_status != "Cancelled":
+            get_inventory().remove_booking(booking_id)
+        elif old_status == "Cancelled" and status != "Cancelled":
+            get_inventory().add_booking(booking_id, room_id, check_in, check_out)
+        
+        return old_status
         
-    except mysql.connector.Error as err:
-        print(f"Error updating booking status: {err}")
-        messagebox.showerror("Database Error", f"Error updating booking status: {err}")
-        return False
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
+@timed()
 def delete_booking(booking_id):
-    """Delete a booking and make the room available again"""
+    """Delete a booking and free its room nights (runs on a worker thread, errors are raised)
+
+    Returns the deleted booking's status, or None if it no longer exists.
+    """
     try:
         connection = connect_db()
         cursor = connection.cursor()
         
-        # Get the room ID before deleting the booking
-        cursor.execute("SELECT Room_ID FROM Booking WHERE Booking_ID = %s", (booking_id,))
-        room_id = cursor.fetchone()[0]
-        
-        # Delete the booking
-        cursor.execute("DELETE FROM Booking WHERE Booking_ID = %s", (booking_id,))
-        
-        # Make the room available again
+        # Get the status, owner and cost before deleting the booking
         cursor.execute(
-            "UPDATE Room SET Availability_status = 'Available' WHERE Room_ID = %s",
-            (room_id,)
+            "SELECT Booking_Status, User_ID, Total_Cost FROM Booking WHERE Booking_ID = %s FOR UPDATE",
+            (booking_id,)
         )
+        booking = cursor.fetchone()
+        if booking is None:
+            connection.rollback()
+            return None
+        status, user_id, total_cost = booking
+        
+        # Take the booking off the user's counters
+        user_counters.apply_booking(cursor, user_id, total_cost, -1)
+        
+        # Take the booking out of the daily revenue rollup
+        if status != "Cancelled":
+            rollup.apply_booking(cursor, booking_id, -1)
+        
+        # Delete the booking (its Room_Night rows go with it)
+        cursor.execute("DELETE FROM Booking WHERE Booking_ID = %s", (booking_id,))
         
         connection.commit()
-        messagebox.showinfo("Success", f"Booking #{booking_id} has been deleted")
-        return True
+        invalidate_dashboard_stats()
+        get_inventory().remove_booking(booking_id)
+        return status
         
-    except mysql.connector.Error as err:
-        print(f"Error deleting booking: {err}")
-        messagebox.showerror("Database Error", f"Error deleting booking: {err}")
-        return False
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
 # ------------------- UI Functions -------------------
+def get_filters():
+    """Read the current filter values from the filter section
+
+    An empty date field is None, i.e. no limit on that side of the range.
+    """
+    return {
+        "search_term": search_entry.get().strip(),
+        "start_date": start_date_entry.get_date(),
+        "end_date": end_date_entry.get_date(),
+        "status": status_var.get(),
+        "sort": sort_var.get()
+    }
+
+def booking_row(booking):
+    """Return the table values and status tag for a booking"""
+    # Format dates and values
+    check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
+    check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
+    
+    # Format amount
+    amount = f"${booking['Total_Cost']}"
+    
+    # Status tag for color coding
+    status = booking['Booking_Status']
+    
+    return (
+        booking['Booking_ID'],
+        booking['Customer'],
+        booking['Room_Type'],
+        check_in,
+        check_out,
+        amount,
+        status
+    ), (status.lower(),)
+
+def show_bookings(bookings, append=False, keep_position=False):
+    """Put bookings in the table (only the visible rows are drawn)"""
+    rows = [booking_row(booking) for booking in bookings]
+    values = [row for row, _ in rows]
+    tags = [tag for _, tag in rows]
+    ids = [booking['Booking_ID'] for booking in bookings]
+    
+    if append:
+        booking_table.append_rows(values, ids, tags, has_more=next_cursor is not None)
+    else:
+        booking_table.set_rows(values, ids, tags, has_more=next_cursor is not None, keep_position=keep_position)
+    
+    # Update loaded-rows label
+    more = " (scroll for more)" if next_cursor is not None else ""
+    loaded_label.configure(text=f"Showing {len(booking_table)} bookings{more}")
+
 def populate_booking_table():
-    """Populate the booking table with data from database"""
-    # Clear existing rows
-    for row in booking_table.get_children():
-        booking_table.delete(row)
-    
-    # Load bookings and add to table
-    bookings = load_bookings()
-    
-    for booking in bookings:
-        # Format dates and values
-        check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
-        check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
-        
-        # Format amount
-        amount = f"${booking['Total_Cost']}"
-        
-        # Status tag for color coding
-        status = booking['Booking_Status']
-        status_tag = status.lower()
-        
-        # Insert into table with status tag
-        booking_table.insert('', 'end', iid=booking['Booking_ID'], values=(
-            booking['Booking_ID'],
-            booking['Customer'],
-            booking['Room_Type'],
-            check_in,
-            check_out,
-            amount,
-            status
-        ), tags=(status_tag,))
-    
-    # Update status counts
+    """Populate the booking table with the first page of bookings"""
+    global loaded_filters
+    
+    # Later pages and reloads keep these, even if the filter fields are edited meanwhile
+    filters = loaded_filters = get_filters()
+    tasks.submit(load_bookings, filters, key="bookings", spinner=table_spinner,
+                 on_success=lambda result: show_page(result))
+    
+    # Count the whole filtered list by status alongside the first page
+    tasks.submit(load_status_counts, filters, key="status_counts",
+                 on_success=lambda counts: set_status_counts(counts, filters["status"]))
+
+def load_more_bookings():
+    """Load the next page when the table is scrolled near its last row"""
+    tasks.submit(load_bookings, loaded_filters, next_cursor, key="bookings", spinner=table_spinner,
+                 on_success=lambda result: show_page(result, append=True),
+                 on_error=load_more_failed)
+
+def load_more_failed(error):
+    """Let the table ask for the next page again after a failed load"""
+    booking_table.fetching = False
+    tasks.show_error(error)
+
+def reload_current_page():
+    """Reload the bookings loaded so far (after a booking changed), keeping the scroll position"""
+    tasks.submit(load_bookings, loaded_filters, limit=max(len(booking_table), BOOKING_PAGE_SIZE),
+                 key="bookings", spinner=table_spinner,
+                 on_success=lambda result: show_page(result, keep_position=True))
+
+def show_page(result, append=False, keep_position=False):
+    """Show a page loaded by load_bookings() in the background"""
+    global next_cursor
+    
+    bookings, next_cursor = result
+    show_bookings(bookings, append=append, keep_position=keep_position)
+
+# ------------------- Status Counts -------------------
+# The counts come from one GROUP BY query over the current filters (see
+# load_status_counts). After that, confirming, cancelling or deleting a
+# booking moves it between the counts here instead of counting again.
+def set_status_counts(counts, status_filter):
+    """Replace the counts with ones loaded by load_status_counts()"""
+    global counted_status
+    
+    booking_counts.clear()
+    booking_counts.update(counts)
+    counted_status = status_filter
+    update_status_counts()
+
+def adjust_status_count(status, delta):
+    """Add delta to a status count (a booking changed status or was deleted)"""
+    # A booking moved out of the filtered status no longer matches the view
+    if counted_status != "All" and status != counted_status:
+        return
+    booking_counts[status] = max(0, booking_counts.get(status, 0) + delta)
     update_status_counts()
 
 def update_status_counts():
     """Update the status count labels"""
-    # Count bookings by status
-    bookings = booking_table.get_children()
-    total = len(bookings)
-    
-    confirmed = 0
-    pending = 0
-    cancelled = 0
-    
-    for booking_id in bookings:
-        status = booking_table.item(booking_id, 'values')[6]
-        if status == "Confirmed":
-            confirmed += 1
-        elif status == "Pending":
-            pending += 1
-        elif status == "Cancelled":
-            cancelled += 1
-    
-    # Update labels
-    total_count_label.configure(text=f"Total: {total}")
-    confirmed_count_label.configure(text=f"Confirmed: {confirmed}")
-    pending_count_label.configure(text=f"Pending: {pending}")
-    cancelled_count_label.configure(text=f"Cancelled: {cancelled}")
+    total_count_label.configure(text=f"Total: {sum(booking_counts.values())}")
+    confirmed_count_label.configure(text=f"Confirmed: {booking_counts.get('Confirmed', 0)}")
+    pending_count_label.configure(text=f"Pending: {booking_counts.get('Pending', 0)}")
+    cancelled_count_label.configure(text=f"Cancelled: {booking_counts.get('Cancelled', 0)}")
 
 def show_booking_details(event):
     """Show details for the selected booking"""
-    global selected_booking
-    
-    selected_id = booking_table.focus()
+    selected_id = booking_table.selected_id()
     if not selected_id:
         return
     
-    # Convert to integer
-    booking_id = int(selected_id)
+    # Load booking details in the background
+    tasks.submit(load_booking_details, int(selected_id), key="booking_details", spinner=table_spinner,
+                 on_success=show_booking_panel)
+
+def show_booking_panel(booking):
+    """Fill the detail panel with a booking loaded by show_booking_details()"""
+    global selected_booking
     
-    # Load booking details
-    booking = load_booking_details(booking_id)
     if not booking:
         return
     
@@ -332,16 +340,7 @@ def confirm_booking():
     if not selected_booking:
         return
     
-    # Update booking status
-    if update_booking_status(selected_booking['Booking_ID'], "Confirmed"):
-        # Refresh booking table
-        populate_booking_table()
-        
-        # Update details panel
-        selected_booking['Booking_Status'] = "Confirmed"
-        details_status.configure(text=f"Status: {selected_booking['Booking_Status']}")
-        confirm_btn.configure(state="disabled")
-        cancel_btn.configure(state="normal")
+    set_booking_status("Confirmed")
 
 def cancel_booking():
     """Cancel the selected booking"""
@@ -357,20 +356,58 @@ def cancel_booking():
     if not confirmed:
         return
     
-    # Update booking status
-    if update_booking_status(selected_booking['Booking_ID'], "Cancelled"):
-        # Refresh booking table
-        populate_booking_table()
-        
-        # Update details panel
-        selected_booking['Booking_Status'] = "Cancelled"
+    set_booking_status("Cancelled")
+
+def set_booking_status(status):
+    """Save a new status for the selected booking in the background"""
+    global saving
+    
+    if saving:
+        return
+    
+    saving = True
+    booking_id = selected_booking['Booking_ID']
+    tasks.submit(update_booking_status, booking_id, status, key="save_booking", spinner=table_spinner,
+                 on_success=lambda old_status: status_updated(booking_id, status, old_status),
+                 on_error=lambda err: save_failed("updating booking status", err))
+
+def status_updated(booking_id, status, old_status):
+    """Show a status change saved by update_booking_status()"""
+    global saving
+    
+    saving = False
+    if old_status is None:
+        messagebox.showerror("Booking Not Found", f"Booking #{booking_id} no longer exists")
+        reload_current_page()
+        return
+    if old_status is False:
+        messagebox.showerror("Room Unavailable", 
+                           f"Booking #{booking_id} can't be reinstated: the room has been "
+                           f"booked by someone else for some of these dates")
+        return
+    
+    # Move the booking between the status counts
+    if status != old_status:
+        adjust_status_count(old_status, -1)
+        adjust_status_count(status, 1)
+    
+    messagebox.showinfo("Success", f"Booking #{booking_id} status updated to {status}")
+    
+    # Refresh booking table
+    reload_current_page()
+    
+    # Update details panel (unless another booking was selected meanwhile)
+    if selected_booking and selected_booking['Booking_ID'] == booking_id:
+        selected_booking['Booking_Status'] = status
         details_status.configure(text=f"Status: {selected_booking['Booking_Status']}")
-        confirm_btn.configure(state="normal")
-        cancel_btn.configure(state="disabled")
+        confirm_btn.configure(state="disabled" if status == "Confirmed" else "normal")
+        cancel_btn.configure(state="disabled" if status == "Cancelled" else "normal")
 
 def delete_booking_ui():
-    """Delete the selected booking (with confirmation)"""
-    if not selected_booking:
+    """Delete the selected booking (with confirmation) in the background"""
+    global saving
+    
+    if not selected_booking or saving:
         return
     
     # Confirm with user
@@ -383,112 +420,105 @@ def delete_booking_ui():
     if not confirmed:
         return
     
-    # Delete the booking
-    if delete_booking(selected_booking['Booking_ID']):
-        # Refresh booking table
-        populate_booking_table()
-        
-        # Hide details panel
+    saving = True
+    booking_id = selected_booking['Booking_ID']
+    tasks.submit(delete_booking, booking_id, key="save_booking", spinner=table_spinner,
+                 on_success=lambda status: booking_deleted(booking_id, status),
+                 on_error=lambda err: save_failed("deleting booking", err))
+
+def booking_deleted(booking_id, status):
+    """Show a deletion done by delete_booking()"""
+    global saving, selected_booking
+    
+    saving = False
+    if status is None:
+        messagebox.showerror("Booking Not Found", f"Booking #{booking_id} no longer exists")
+    else:
+        adjust_status_count(status, -1)
+        messagebox.showinfo("Success", f"Booking #{booking_id} has been deleted")
+    
+    # Refresh booking table
+    reload_current_page()
+    
+    # Hide details panel (unless another booking was selected meanwhile)
+    if selected_booking and selected_booking['Booking_ID'] == booking_id:
         details_frame.pack_forget()
-        
-        # Reset selected booking
-        global selected_booking
         selected_booking = None
 
-def filter_bookings():
-    """Filter bookings based on search term and date range"""
-    search_term = search_entry.get().lower()
-    try:
-        start_date = start_date_entry.get_date() if hasattr(start_date_entry, 'get_date') else None
-        end_date = end_date_entry.get_date() if hasattr(end_date_entry, 'get_date') else None
-    except:
-        start_date = None
-        end_date = None
-    
-    status_filter = status_var.get()
-    
-    # Clear existing rows
-    for row in booking_table.get_children():
-        booking_table.delete(row)
-    
-    # Load all bookings
-    bookings = load_bookings()
-    
-    # Apply filters
-    filtered_bookings = []
-    for booking in bookings:
-        # Apply search term filter (customer name or room type)
-        if search_term and search_term not in booking['Customer'].lower() and search_term not in booking['Room_Type'].lower():
-            continue
-        
-        # Apply date range filter
-        booking_date = booking['Check_IN_Date']
-        if isinstance(booking_date, str):
-            try:
-                booking_date = datetime.strptime(booking_date, '%Y-%m-%d')
-            except:
-                booking_date = None
-        
-        if start_date and booking_date and booking_date < start_date:
-            continue
-        
-        if end_date and booking_date and booking_date > end_date:
-            continue
-        
-        # Apply status filter
-        if status_filter != "All" and booking['Booking_Status'] != status_filter:
-            continue
-        
-        filtered_bookings.append(booking)
+def save_failed(action, err):
+    global saving
     
-    # Add filtered bookings to table
-    for booking in filtered_bookings:
-        # Format dates and values
-        check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
-        check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
-        
-        # Format amount
-        amount = f"${booking['Total_Cost']}"
-        
-        # Status tag for color coding
-        status = booking['Booking_Status']
-        status_tag = status.lower()
-        
-        # Insert into table with status tag
-        booking_table.insert('', 'end', iid=booking['Booking_ID'], values=(
-            booking['Booking_ID'],
-            booking['Customer'],
-            booking['Room_Type'],
-            check_in,
-            check_out,
-            amount,
-            status
-        ), tags=(status_tag,))
-    
-    # Update status counts
-    update_status_counts()
+    saving = False
+    print(f"Error {action}: {err}")
+    messagebox.showerror("Database Error", f"Error {action}: {err}")
+
+def filter_bookings():
+    """Filter bookings based on search term, date range and status
+
+    The filters run in MySQL, so only the first matching page is loaded.
+    """
+    populate_booking_table()
 
 def reset_filters():
     """Reset all filters and show all bookings"""
     search_entry.delete(0, 'end')
-    try:
-        start_date_entry.set_date(None)
-        end_date_entry.set_date(None)
-    except:
-        pass
+    start_date_entry.set_date(None)
+    end_date_entry.set_date(None)
     status_var.set("All")
+    sort_var.set(DEFAULT_SORT)
     
     # Refresh booking table
     populate_booking_table()
 
-# ----------------- Initialize App -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
+# ------------------- Export -------------------
+def export_bookings_ui():
+    """Export the bookings matching the filters of the list shown to CSV or JSON lines"""
+    global exporting
+    
+    path = filedialog.asksaveasfilename(
+        title="Export Bookings",
+        defaultextension=".csv",
+        filetypes=[("CSV", "*.csv"), ("JSON lines", "*.jsonl")]
+    )
+    if not path:
+        return
+    
+    exporting = True
+    export_progress.clear()
+    export_btn.configure(state="disabled")
+    tasks.submit(export_bookings, loaded_filters, path, progress=export_progress.update,
+                 key="export_bookings", on_success=export_finished, on_error=export_failed)
+    show_export_progress()
+
+def show_export_progress():
+    """Show the running export's throughput until it finishes"""
+    if not exporting:
+        return
+    if export_progress:
+        export_label.configure(text=f"Exporting: {export_progress['rows']:,} rows "
+                                    f"({export_progress['rows_per_s']:,.0f} rows/s)")
+    else:
+        export_label.configure(text="Exporting...")
+    export_label.after(250, show_export_progress)
+
+def export_finished(stats):
+    global exporting
+    
+    exporting = False
+    export_btn.configure(state="normal")
+    export_label.configure(text=f"Exported {stats['rows']:,} rows ({stats['rows_per_s']:,.0f} rows/s)")
+    messagebox.showinfo("Export Finished", f"Exported {stats['rows']:,} bookings in {stats['elapsed_s']} s to:\n{stats['path']}")
+
+def export_failed(error):
+    global exporting
+    
+    exporting = False
+    export_btn.configure(state="normal")
+    export_label.configure(text="")
+    messagebox.showerror("Export Failed", f"Error exporting bookings: {error}")
 
-app = ctk.CTk()
-app.title("Hotel Booking - Manage Bookings")
-app.geometry("1200x700")
-app.resizable(False, False)
+# ----------------- Initialize App -----------------
+app = router.get_app()
 
 # Try to load admin session
 if not load_admin_session():
@@ -496,8 +526,8 @@ if not load_admin_session():
     open_page("admin_login")
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("manage_booking", "Hotel Booking - Manage Bookings", "1200x700",
+                                on_show=reload_current_page)
 
 # ----------------- Sidebar (Navigation) -----------------
 sidebar = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=200, corner_radius=0)
@@ -573,26 +603,16 @@ ctk.CTkLabel(date_frame, text="Date Range", font=("Arial", 12)).pack(anchor="w")
 date_fields = ctk.CTkFrame(date_frame, fg_color="white")
 date_fields.pack(fill="x")
 
-# Try to use DateEntry
-try:
-    start_date_entry = DateEntry(date_fields, width=10, background='darkblue', 
-                                foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
-    start_date_entry.pack(side="left", padx=(0, 5))
-
-    ctk.CTkLabel(date_fields, text="to", font=("Arial", 10)).pack(side="left", padx=5)
-
-    end_date_entry = DateEntry(date_fields, width=10, background='darkblue', 
-                            foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
-    end_date_entry.pack(side="left", padx=(5, 0))
-except:
-    # Fallback to standard entries
-    start_date_entry = ctk.CTkEntry(date_fields, width=100, placeholder_text="YYYY-MM-DD")
-    start_date_entry.pack(side="left", padx=(0, 5))
+# Date pickers (tkcalendar is loaded after the page is drawn, see date_picker.py)
+start_date_entry = DatePicker(date_fields, width=10, entry_width=100, background='darkblue', 
+                              foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd', optional=True)
+start_date_entry.pack(side="left", padx=(0, 5))
 
-    ctk.CTkLabel(date_fields, text="to", font=("Arial", 10)).pack(side="left", padx=5)
+ctk.CTkLabel(date_fields, text="to", font=("Arial", 10)).pack(side="left", padx=5)
 
-    end_date_entry = ctk.CTkEntry(date_fields, width=100, placeholder_text="YYYY-MM-DD")
-    end_date_entry.pack(side="left", padx=(5, 0))
+end_date_entry = DatePicker(date_fields, width=10, entry_width=100, background='darkblue', 
+                            foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd', optional=True)
+end_date_entry.pack(side="left", padx=(5, 0))
 
 # Status filter
 status_frame = ctk.CTkFrame(filter_options, fg_color="white")
@@ -604,6 +624,15 @@ status_options = ["All", "Pending", "Confirmed", "Cancelled"]
 status_dropdown = ctk.CTkComboBox(status_frame, values=status_options, variable=status_var, width=120)
 status_dropdown.pack(pady=5)
 
+# Sort order
+sort_frame = ctk.CTkFrame(filter_options, fg_color="white")
+sort_frame.pack(side="left", padx=(10, 10))
+
+ctk.CTkLabel(sort_frame, text="Sort", font=("Arial", 12)).pack(anchor="w")
+sort_var = ctk.StringVar(value=DEFAULT_SORT)
+sort_dropdown = ctk.CTkComboBox(sort_frame, values=list(SORT_ORDERS), variable=sort_var, width=140)
+sort_dropdown.pack(pady=5)
+
 # Filter buttons
 button_frame = ctk.CTkFrame(filter_options, fg_color="white")
 button_frame.pack(side="left", padx=(10, 0))
@@ -619,6 +648,11 @@ reset_btn = ctk.CTkButton(button_frame, text="Reset", font=("Arial", 12),
                         command=reset_filters, width=80, height=30)
 reset_btn.pack(side="left", pady=5)
 
+export_btn = ctk.CTkButton(button_frame, text="Export...", font=("Arial", 12), 
+                         fg_color="#6C757D", hover_color="#5A6268",
+                         command=export_bookings_ui, width=80, height=30)
+export_btn.pack(side="left", pady=5, padx=(5, 0))
+
 # ----------------- Booking Table Section -----------------
 table_frame = ctk.CTkFrame(content_frame, fg_color="white", border_width=1, 
                         border_color="#E5E5E5", corner_radius=10)
@@ -649,7 +683,8 @@ cancelled_count_label.pack(side="left")
 
 # Create treeview for bookings
 columns = ('Booking ID', 'Customer', 'Room Type', 'Check-in', 'Check-out', 'Amount', 'Status')
-booking_table = ttk.Treeview(table_frame, columns=columns, show='headings', height=10)
+# Only the visible rows are drawn; more pages load as the table is scrolled
+booking_table = VirtualTable(table_frame, columns, height=10, fetch_more=load_more_bookings)
 
 # Configure column headings
 for col in columns:
@@ -672,10 +707,21 @@ booking_table.tag_configure('confirmed', background='#d4edda')
 booking_table.tag_configure('pending', background='#fff3cd')
 booking_table.tag_configure('cancelled', background='#f8d7da')
 
-# Add scrollbar
-table_scroll = ttk.Scrollbar(table_frame, orient='vertical', command=booking_table.yview)
-booking_table.configure(yscrollcommand=table_scroll.set)
-table_scroll.pack(side='right', fill='y')
+# Loaded rows indicator
+pager_frame = ctk.CTkFrame(table_frame, fg_color="white")
+pager_frame.pack(side="bottom", fill="x", padx=20, pady=(0, 10))
+
+loaded_label = ctk.CTkLabel(pager_frame, text="", font=("Arial", 12), text_color="gray")
+loaded_label.pack(side="right")
+
+# Shown while bookings load in the background
+table_spinner = tasks.Spinner(pager_frame, text="Loading bookings...")
+table_spinner.pack(side="left")
+
+# Throughput of a running export
+export_label = ctk.CTkLabel(pager_frame, text="", font=("Arial", 12), text_color="gray")
+export_label.pack(side="left", padx=10)
+
 booking_table.pack(expand=True, fill='both', padx=20, pady=(0, 20))
 
 # Bind click event to show details
@@ -759,4 +805,4 @@ populate_booking_table()
 
 # Run the application
 if __name__ == "__main__":
-    app.mainloop()
\ No newline at end of file
+    router.run("manage_booking")
\ No newline at end of file
@@ -1,70 +1,48 @@
 import customtkinter as ctk
-from tkinter import messagebox, ttk
-import mysql.connector
-import subprocess
-import sys
-import hashlib
-
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="new_password",
-        database="hotel_book"
-    )
+from tkinter import messagebox, ttk, filedialog
+from db import connect_db
+from instrument import timed
+from analytics import invalidate_dashboard_stats
+from inventory import get_inventory
+import rollup
+from virtual_table import VirtualTable
+from user_index import UserIndex
+from user_queries import load_users, load_user_details
+from user_import import import_users
+from export import export_users
+import router
+import session
+import tasks
+from credentials import hash_password
 
 # ------------------- Global Variables -------------------
 current_admin = None
+importing = False  # A bulk import is running
+import_progress = {}  # Latest stats reported by the running import (written by its worker thread)
+exporting = False  # An export is running
+export_progress = {}  # Latest stats reported by the running export (written by its worker thread)
 selected_user = None
-
-# ------------------- Password Hashing -------------------
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+saving = False  # A create, update or delete is being saved in the background
+user_index = UserIndex()  # In-memory search index over the loaded users
+last_search_term = ""  # Term of the results currently shown
+last_search_results = None  # Users matching last_search_term
+search_job = None  # Pending debounced search (Tk after ID)
+SEARCH_DELAY = 200  # Milliseconds of typing pause before searching
 
 # ------------------- Admin Session Management -------------------
 def load_admin_session():
-    """Load admin information from database"""
+    """Load the logged-in admin's profile from the signed session token"""
     global current_admin
     
-    # Check if any admin_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            admin_id = int(sys.argv[1])
-            
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Admin WHERE Admin_ID = %s",
-                (admin_id,)
-            )
-            admin_data = cursor.fetchone()
-            
-            if admin_data:
-                current_admin = admin_data
-                return True
-                
-        except (ValueError, IndexError, mysql.connector.Error) as err:
-            print(f"Error loading admin session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    # The token is checked locally (no database round trip)
+    current_admin = session.current("admin")
+    return current_admin is not None
 
 # ------------------- Navigation Functions -------------------
 def open_page(page_name):
-    """Open another page and close the current one"""
+    """Switch to another page in the same window"""
     try:
-        # Pass the current admin ID to the next page if an admin is logged in
-        admin_param = [str(current_admin['Admin_ID'])] if current_admin else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + admin_param
-        
-        subprocess.Popen(command)
-        app.destroy()  # Close the current window
+        router.show(page_name)
     except Exception as e:
         print(f"Navigation Error: {e}")
         messagebox.showerror("Navigation Error", f"Unable to open {page_name} page: {e}")
@@ -82,91 +60,13 @@ def logout():
     """Log out the current admin and return to login page"""
     global current_admin
     current_admin = None
-    open_page("login")
+    router.logout("login")
 
 # ------------------- User Management Functions -------------------
-def load_users():
-    """Load all users from database"""
-    users = []
-    
-    try:
-        connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
-        
-        # Query to get users with booking count
-        cursor.execute(
-            """
-            SELECT u.user_id, u.first_name, u.last_name, u.email, u.phone, 
-                   u.user_address, COUNT(b.Booking_ID) as bookings
-            FROM Users u
-            LEFT JOIN Booking b ON u.user_id = b.User_ID
-            GROUP BY u.user_id
-            ORDER BY u.user_id
-            """
-        )
-        
-        users = cursor.fetchall()
-        return users
-        
-    except mysql.connector.Error as err:
-        print(f"Error loading users: {err}")
-        messagebox.showerror("Database Error", f"Error loading users: {err}")
-        return []
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
-
-def load_user_details(user_id):
-    """Load details for a specific user"""
-    try:
-        connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
-        
-        # Query to get user details
-        cursor.execute(
-            """
-            SELECT u.*, COUNT(b.Booking_ID) as bookings,
-                  SUM(b.Total_Cost) as total_spent
-            FROM Users u
-            LEFT JOIN Booking b ON u.user_id = b.User_ID
-            WHERE u.user_id = %s
-            GROUP BY u.user_id
-            """,
-            (user_id,)
-        )
-        
-        user = cursor.fetchone()
-        
-        # Get user's bookings
-        if user:
-            cursor.execute(
-                """
-                SELECT b.Booking_ID, r.Room_Type, b.Check_IN_Date, 
-                       b.Check_Out_Date, b.Total_Cost, b.Booking_Status
-                FROM Booking b
-                JOIN Room r ON b.Room_ID = r.Room_ID
-                WHERE b.User_ID = %s
-                ORDER BY b.Check_IN_Date DESC
-                LIMIT 5
-                """,
-                (user_id,)
-            )
-            user['recent_bookings'] = cursor.fetchall()
-        
-        return user
-        
-    except mysql.connector.Error as err:
-        print(f"Error loading user details: {err}")
-        messagebox.showerror("Database Error", f"Error loading user details: {err}")
-        return None
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
-
 def create_user():
-    """Create a new user"""
+    """Create a new user (the password is hashed and the user saved in the background)"""
+    global saving
+    
     # Get data from entry fields
     first_name = first_name_entry.get()
     last_name = last_name_entry.get()
@@ -179,8 +79,29 @@ def create_user():
     if not first_name or not last_name or not email or not password:
         messagebox.showwarning("Input Error", "First name, last name, email, and password are required")
         return
+    if saving:
+        return
     
-    # Hash the password
+    saving = True
+    user = {
+        'first_name': first_name,
+        'last_name': last_name,
+        'email': email,
+        'phone': phone,
+        'user_address': address,
+        'bookings': 0
+    }
+    tasks.submit(insert_user, user, password, key="save_user", spinner=users_spinner,
+                 on_success=lambda user_id: user_created(user, user_id),
+                 on_error=lambda err: save_failed("creating", err))
+
+@timed()
+def insert_user(user, password):
+    """Hash the password and insert a user (runs on a worker thread, errors are raised)
+
+    Returns the new user_id, or None if the email is already registered.
+    """
+    # Hash the password (deliberately slow, see credentials.py)
     hashed_password = hash_password(password)
     
     try:
@@ -188,10 +109,9 @@ def create_user():
         cursor = connection.cursor()
         
         # Check if email already exists
-        cursor.execute("SELECT user_id FROM Users WHERE email = %s", (email,))
+        cursor.execute("SELECT user_id FROM Users WHERE email = %s", (user['email'],))
         if cursor.fetchone():
-            messagebox.showwarning("Input Error", "A user with this email already exists")
-            return
+            return None
         
         # Insert new user
         cursor.execute(
@@ -199,29 +119,42 @@ def create_user():
             INSERT INTO Users (first_name, last_name, email, phone, password, user_address)
             VALUES (%s, %s, %s, %s, %s, %s)
             """,
-            (first_name, last_name, email, phone, hashed_password, address)
+            (user['first_name'], user['last_name'], user['email'], user['phone'],
+             hashed_password, user['user_address'])
         )
         
         connection.commit()
-        messagebox.showinfo("Success", "User created successfully")
+        return cursor.lastrowid
         
-        # Clear form fields
-        clear_user_form()
-        
-        # Refresh user table
-        populate_user_table()
-        
-    except mysql.connector.Error as err:
-        print(f"Error creating user: {err}")
-        messagebox.showerror("Database Error", f"Error creating user: {err}")
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
+def user_created(user, user_id):
+    """Show a user saved by insert_user()"""
+    global saving
+    
+    saving = False
+    if user_id is None:
+        messagebox.showwarning("Input Error", "A user with this email already exists")
+        return
+    
+    invalidate_dashboard_stats()
+    
+    # Add the user to the search index
+    user_index.add(dict(user, user_id=user_id))
+    messagebox.showinfo("Success", "User created successfully")
+    
+    # Clear form fields
+    clear_user_form()
+    
+    # Refresh user table
+    refresh_user_table()
+
 def update_user():
-    """Update an existing user"""
-    global selected_user
+    """Update an existing user (saved in the background, hashing a new password if given)"""
+    global saving
     
     if not selected_user:
         messagebox.showwarning("Selection Error", "No user selected")
@@ -239,6 +172,30 @@ def update_user():
     if not first_name or not last_name or not email:
         messagebox.showwarning("Input Error", "First name, last name, and email are required")
         return
+    if saving:
+        return
+    
+    saving = True
+    user_id = selected_user['user_id']
+    changes = {
+        'first_name': first_name,
+        'last_name': last_name,
+        'email': email,
+        'phone': phone,
+        'user_address': address
+    }
+    tasks.submit(save_user_changes, user_id, changes, password, key="save_user", spinner=users_spinner,
+                 on_success=lambda saved: user_updated(user_id, changes, saved),
+                 on_error=lambda err: save_failed("updating", err))
+
+@timed()
+def save_user_changes(user_id, changes, password=""):
+    """Update a user, hashing the new password if one is given (runs on a worker thread, errors are raised)
+
+    Returns False if another user already has the email.
+    """
+    # Hash the new password first (deliberately slow, see credentials.py)
+    hashed_password = hash_password(password) if password else None
     
     try:
         connection = connect_db()
@@ -246,15 +203,13 @@ def update_user():
         
         # Check if email already exists for a different user
         cursor.execute("SELECT user_id FROM Users WHERE email = %s AND user_id != %s", 
-                    (email, selected_user['user_id']))
+                    (changes['email'], user_id))
         if cursor.fetchone():
-            messagebox.showwarning("Input Error", "Another user with this email already exists")
-            return
+            return False
         
         # Update user data
-        if password:
+        if hashed_password:
             # Update with new password
-            hashed_password = hash_password(password)
             cursor.execute(
                 """
                 UPDATE Users
@@ -262,8 +217,8 @@ def update_user():
                     phone = %s, user_address = %s, password = %s
                 WHERE user_id = %s
                 """,
-                (first_name, last_name, email, phone, address, 
-                 hashed_password, selected_user['user_id'])
+                (changes['first_name'], changes['last_name'], changes['email'], changes['phone'],
+                 changes['user_address'], hashed_password, user_id)
             )
         else:
             # Update without changing password
@@ -274,33 +229,51 @@ def update_user():
                     phone = %s, user_address = %s
                 WHERE user_id = %s
                 """,
-                (first_name, last_name, email, phone, address, 
-                 selected_user['user_id'])
+                (changes['first_name'], changes['last_name'], changes['email'], changes['phone'],
+                 changes['user_address'], user_id)
             )
         
         connection.commit()
-        messagebox.showinfo("Success", "User updated successfully")
-        
-        # Refresh user data
-        selected_user = load_user_details(selected_user['user_id'])
-        
-        # Update user details display
-        show_user_details()
-        
-        # Refresh user table
-        populate_user_table()
+        return True
         
-    except mysql.connector.Error as err:
-        print(f"Error updating user: {err}")
-        messagebox.showerror("Database Error", f"Error updating user: {err}")
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
+def user_updated(user_id, changes, saved):
+    """Show a user saved by save_user_changes()"""
+    global saving
+    
+    saving = False
+    if not saved:
+        messagebox.showwarning("Input Error", "Another user with this email already exists")
+        return
+    
+    # Sessions issued to this user carry the old profile - make them log in again
+    session.revoke_subject("user", user_id)
+    
+    # Re-index the changed fields
+    user_index.update(user_id, **changes)
+    messagebox.showinfo("Success", "User updated successfully")
+    
+    # Refresh user data and the details display
+    tasks.submit(load_user_details, user_id, key="user_details",
+                 spinner=users_spinner, on_success=show_user_panel)
+    
+    # Refresh user table
+    refresh_user_table()
+
+def save_failed(action, err):
+    global saving
+    
+    saving = False
+    print(f"Error {action} user: {err}")
+    messagebox.showerror("Database Error", f"Error {action} user: {err}")
+
 def delete_user():
-    """Delete a user (with confirmation)"""
-    global selected_user
+    """Delete a user (with confirmation) in the background"""
+    global saving
     
     if not selected_user:
         messagebox.showwarning("Selection Error", "No user selected")
@@ -314,86 +287,193 @@ def delete_user():
         f"This action cannot be undone."
     )
     
-    if not confirmed:
+    if not confirmed or saving:
         return
     
+    saving = True
+    user_id = selected_user['user_id']
+    tasks.submit(remove_user, user_id, key="save_user", spinner=users_spinner,
+                 on_success=lambda _: user_deleted(user_id),
+                 on_error=lambda err: save_failed("deleting", err))
+
+@timed()
+def remove_user(user_id):
+    """Delete a user and their bookings (runs on a worker thread, errors are raised)"""
     try:
         connection = connect_db()
         cursor = connection.cursor()
         
-        # Delete the user
-        cursor.execute("DELETE FROM Users WHERE user_id = %s", (selected_user['user_id'],))
-        
-        connection.commit()
-        messagebox.showinfo("Success", "User deleted successfully")
+        # Their bookings go with them - take those out of the daily revenue rollup first
+        cursor.execute(
+            "SELECT Booking_ID, Booking_Status FROM Booking WHERE User_ID = %s FOR UPDATE",
+            (user_id,)
+        )
+        bookings = cursor.fetchall()
+        for booking_id, status in bookings:
+            if status != "Cancelled":
+                rollup.apply_booking(cursor, booking_id, -1)
         
-        # Clear form and details
-        clear_user_form()
-        hide_user_details()
+        # Delete the user (their bookings and Room_Night rows cascade)
+        cursor.execute("DELETE FROM Users WHERE user_id = %s", (user_id,))
         
-        # Reset selected user
-        selected_user = None
+        connection.commit()
+        invalidate_dashboard_stats()
         
-        # Refresh user table
-        populate_user_table()
+        # Free the deleted bookings' nights in the in-memory availability index
+        inventory = get_inventory()
+        for booking_id, _ in bookings:
+            inventory.remove_booking(booking_id)
         
-    except mysql.connector.Error as err:
-        print(f"Error deleting user: {err}")
-        messagebox.showerror("Database Error", f"Error deleting user: {err}")
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
+def user_deleted(user_id):
+    """Show a deletion done by remove_user()"""
+    global saving, selected_user
+    
+    saving = False
+    session.revoke_subject("user", user_id)
+    user_index.remove(user_id)
+    messagebox.showinfo("Success", "User deleted successfully")
+    
+    # Clear form and details (unless another user was selected meanwhile)
+    if selected_user and selected_user['user_id'] == user_id:
+        clear_user_form()
+        hide_user_details()
+        selected_user = None
+    
+    # Refresh user table
+    refresh_user_table()
+
 # ------------------- UI Functions -------------------
+def user_row(user):
+    """Return the table values for a user"""
+    # Format values
+    full_name = f"{user['first_name']} {user['last_name']}"
+    phone = user['phone'] if user['phone'] else "N/A"
+    address = user['user_address'] if user['user_address'] else "N/A"
+    bookings = str(user['bookings'])
+    
+    return (
+        user['user_id'],
+        full_name,
+        user['email'],
+        phone,
+        address,
+        bookings
+    )
+
+def show_users(users):
+    """Put users in the table (only the visible rows are drawn)"""
+    user_table.set_rows([user_row(user) for user in users], [user['user_id'] for user in users])
+
 def populate_user_table():
-    """Populate the user table with data from database"""
-    # Clear existing rows
-    for row in user_table.get_children():
-        user_table.delete(row)
-    
-    # Load users and add to table
+    """Reload users from the database, rebuild the search index and refresh the table"""
+    tasks.submit(index_users, key="users", spinner=users_spinner,
+                 on_success=lambda users: refresh_user_table())
+
+def index_users():
+    """Load every user and rebuild the search index (runs on a worker thread)"""
     users = load_users()
+    user_index.build(users)
+    return users
+
+def refresh_user_table():
+    """Show the users matching the current search term, straight from the index"""
+    global last_search_term, last_search_results
     
-    for user in users:
-        # Format values
-        full_name = f"{user['first_name']} {user['last_name']}"
-        phone = user['phone'] if user['phone'] else "N/A"
-        address = user['user_address'] if user['user_address'] else "N/A"
-        bookings = str(user['bookings'])
-        
-        # Insert into table
-        user_table.insert('', 'end', iid=user['user_id'], values=(
-            user['user_id'],
-            full_name,
-            user['email'],
-            phone,
-            address,
-            bookings
-        ))
+    # The index changed, so the previous results can't be narrowed any more
+    last_search_term, last_search_results = "", None
+    run_search()
+
+# ------------------- Bulk Import -------------------
+def import_users_ui():
+    """Import users from a CSV or JSON file in the background"""
+    global importing
     
-    # Update user count
-    user_count_label.configure(text=f"Total Users: {len(users)}")
+    path = filedialog.askopenfilename(
+        title="Import Users",
+        filetypes=[("User files", "*.csv *.json *.jsonl *.ndjson"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+    
+    update = messagebox.askyesno(
+        "Existing Users",
+        "Update users whose email is already registered?\n\n"
+        "Choose No to skip them (they are listed in the rejected records file)."
+    )
+    
+    importing = True
+    import_progress.clear()
+    import_btn.configure(state="disabled")
+    tasks.submit(import_users, path, "update" if update else "skip", progress=import_progress.update,
+                 key="import", on_success=import_finished, on_error=import_failed)
+    show_import_progress()
+
+def show_import_progress():
+    """Show the running import's progress until it finishes"""
+    if not importing:
+        return
+    if import_progress:
+        imported = import_progress['inserted'] + import_progress['updated']
+        import_label.configure(text=f"Importing: {imported:,} of {import_progress['read']:,} read "
+                                    f"({import_progress['rows_per_s']:,.0f} rows/s)")
+    else:
+        import_label.configure(text="Importing...")
+    import_label.after(250, show_import_progress)
+
+def import_finished(stats):
+    global importing
+    
+    importing = False
+    import_btn.configure(state="normal")
+    import_label.configure(text=f"Imported {stats['inserted'] + stats['updated']:,} users "
+                                f"({stats['rows_per_s']:,.0f} rows/s)")
+    invalidate_dashboard_stats()
+    
+    summary = (f"Read: {stats['read']:,}\nAdded: {stats['inserted']:,}\nUpdated: {stats['updated']:,}\n"
+               f"Rejected: {stats['rejected']:,}\nTime: {stats['elapsed_s']} s")
+    if stats["rejected_file"]:
+        summary += f"\n\nRejected records were written to:\n{stats['rejected_file']}"
+    messagebox.showinfo("Import Finished", summary)
+    
+    # Reload the users and rebuild the search index
+    populate_user_table()
+
+def import_failed(error):
+    global importing
+    
+    importing = False
+    import_btn.configure(state="normal")
+    import_label.configure(text="")
+    messagebox.showerror("Import Failed", f"Error importing users: {error}")
 
 def show_user_details(event=None):
     """Show details for the selected user"""
+    # If event is None, use the currently selected user
+    if event is None:
+        show_user_panel(selected_user)
+        return
+    
+    selected_id = user_table.selected_id()
+    if not selected_id:
+        return
+    
+    # Load user details in the background
+    tasks.submit(load_user_details, int(selected_id), key="user_details",
+                 spinner=users_spinner, on_success=show_user_panel)
+
+def show_user_panel(user):
+    """Fill the form and details section with a loaded user"""
     global selected_user
     
-    # If event is None, use the currently selected user
-    if event is not None:
-        selected_id = user_table.focus()
-        if not selected_id:
-            return
-        
-        # Convert to integer
-        user_id = int(selected_id)
-        
-        # Load user details
-        user = load_user_details(user_id)
-        if not user:
-            return
-        
-        selected_user = user
+    if not user:
+        return
+    
+    selected_user = user
     
     # Fill in the form fields
     first_name_entry.delete(0, 'end')
@@ -487,62 +567,100 @@ def new_user_mode():
     first_name_entry.focus_set()
 
 def search_users():
-    """Search users based on search term"""
+    """Search users based on search term (Search button / Enter)"""
+    global search_job
+    
+    if search_job:
+        main_frame.after_cancel(search_job)
+        search_job = None
+    run_search()
+
+def schedule_search(event=None):
+    """Search once the admin pauses typing"""
+    global search_job
+    
+    if search_job:
+        main_frame.after_cancel(search_job)
+    search_job = main_frame.after(SEARCH_DELAY, run_search)
+
+def run_search():
+    """Show the users whose name, email or address contains the search term"""
+    global search_job, last_search_term, last_search_results
+    
+    search_job = None
     search_term = search_entry.get().lower()
     
-    if not search_term:
-        # If search term is empty, show all users
+    # Index not loaded yet - it runs the search when it is
+    if not user_index.loaded:
         populate_user_table()
         return
     
-    # Clear existing rows
-    for row in user_table.get_children():
-        user_table.delete(row)
+    # A longer term can only match users that matched the shorter one
+    within = None
+    if last_search_results is not None and last_search_term and last_search_term in search_term:
+        within = last_search_results
     
-    # Load all users
-    users = load_users()
+    users = user_index.search(search_term, within)
+    last_search_term, last_search_results = search_term, users
     
-    # Filter users
-    filtered_users = []
-    for user in users:
-        # Check if search term is in name, email, or address
-        full_name = f"{user['first_name']} {user['last_name']}".lower()
-        email = user['email'].lower()
-        address = user['user_address'].lower() if user['user_address'] else ""
-        
-        if (search_term in full_name or search_term in email or 
-            search_term in address):
-            filtered_users.append(user)
-    
-    # Add filtered users to table
-    for user in filtered_users:
-        # Format values
-        full_name = f"{user['first_name']} {user['last_name']}"
-        phone = user['phone'] if user['phone'] else "N/A"
-        address = user['user_address'] if user['user_address'] else "N/A"
-        bookings = str(user['bookings'])
-        
-        # Insert into table
-        user_table.insert('', 'end', iid=user['user_id'], values=(
-            user['user_id'],
-            full_name,
-            user['email'],
-            phone,
-            address,
-            bookings
-        ))
+    # Add users to table
+    show_users(users)
     
     # Update user count
-    user_count_label.configure(text=f"Filtered Users: {len(filtered_users)}")
+    if search_term:
+        user_count_label.configure(text=f"Filtered Users: {len(users)}")
+    else:
+        user_count_label.configure(text=f"Total Users: {len(users)}")
 
-# ----------------- Initialize App -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
+# ------------------- Export -------------------
+def export_users_ui():
+    """Export the users matching the current search to CSV or JSON lines"""
+    global exporting
+    
+    path = filedialog.asksaveasfilename(
+        title="Export Users",
+        defaultextension=".csv",
+        filetypes=[("CSV", "*.csv"), ("JSON lines", "*.jsonl")]
+    )
+    if not path:
+        return
+    
+    exporting = True
+    export_progress.clear()
+    export_btn.configure(state="disabled")
+    tasks.submit(export_users, search_entry.get().strip(), path, progress=export_progress.update,
+                 key="export_users", on_success=export_finished, on_error=export_failed)
+    show_export_progress()
 
-app = ctk.CTk()
-app.title("Hotel Booking - Manage Users")
-app.geometry("1200x700")
-app.resizable(False, False)
+def show_export_progress():
+    """Show the running export's throughput until it finishes"""
+    if not exporting:
+        return
+    if export_progress:
+        export_label.configure(text=f"Exporting: {export_progress['rows']:,} rows "
+                                    f"({export_progress['rows_per_s']:,.0f} rows/s)")
+    else:
+        export_label.configure(text="Exporting...")
+    export_label.after(250, show_export_progress)
+
+def export_finished(stats):
+    global exporting
+    
+    exporting = False
+    export_btn.configure(state="normal")
+    export_label.configure(text=f"Exported {stats['rows']:,} rows ({stats['rows_per_s']:,.0f} rows/s)")
+    messagebox.showinfo("Export Finished", f"Exported {stats['rows']:,} users in {stats['elapsed_s']} s to:\n{stats['path']}")
+
+def export_failed(error):
+    global exporting
+    
+    exporting = False
+    export_btn.configure(state="normal")
+    export_label.configure(text="")
+    messagebox.showerror("Export Failed", f"Error exporting users: {error}")
+
+# ----------------- Initialize App -----------------
+app = router.get_app()
 
 # Try to load admin session
 if not load_admin_session():
@@ -550,8 +668,8 @@ if not load_admin_session():
     open_page("admin_login")
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("manage_users", "Hotel Booking - Manage Users", "1200x700",
+                                on_show=populate_user_table)
 
 # ----------------- Sidebar (Navigation) -----------------
 sidebar = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=200, corner_radius=0)
@@ -605,9 +723,23 @@ new_user_btn = ctk.CTkButton(action_frame, text="+ New User", font=("Arial", 12)
                            command=new_user_mode, width=100, height=30)
 new_user_btn.pack(side="left", padx=(0, 10))
 
+# Bulk import button
+import_btn = ctk.CTkButton(action_frame, text="Import...", font=("Arial", 12), 
+                         fg_color="#6C757D", hover_color="#5A6268",
+                         command=import_users_ui, width=80, height=30)
+import_btn.pack(side="left", padx=(0, 10))
+
+# Export button
+export_btn = ctk.CTkButton(action_frame, text="Export...", font=("Arial", 12), 
+                         fg_color="#6C757D", hover_color="#5A6268",
+                         command=export_users_ui, width=80, height=30)
+export_btn.pack(side="left", padx=(0, 10))
+
 # Search field
 search_entry = ctk.CTkEntry(action_frame, width=200, placeholder_text="Search users...")
 search_entry.pack(side="left", padx=(0, 5))
+search_entry.bind("<KeyRelease>", schedule_search)
+search_entry.bind("<Return>", lambda event: search_users())
 
 search_btn = ctk.CTkButton(action_frame, text="Search", font=("Arial", 12), 
                          fg_color="#0F2D52", hover_color="#1E4D88",
@@ -703,9 +835,22 @@ ctk.CTkLabel(table_header, text="User List",
 user_count_label = ctk.CTkLabel(table_header, text="Total Users: 0", font=("Arial", 12))
 user_count_label.pack(side="right")
 
+# Shown while users load in the background
+users_spinner = tasks.Spinner(table_header, text="Loading users...")
+users_spinner.pack(side="right", padx=10)
+
+# Progress of a running bulk import
+import_label = ctk.CTkLabel(table_header, text="", font=("Arial", 12), text_color="gray")
+import_label.pack(side="right", padx=10)
+
+# Throughput of a running export
+export_label = ctk.CTkLabel(table_header, text="", font=("Arial", 12), text_color="gray")
+export_label.pack(side="right", padx=10)
+
 # Create treeview for users
 columns = ('ID', 'Name', 'Email', 'Phone', 'Address', 'Bookings')
-user_table = ttk.Treeview(table_frame, columns=columns, show='headings', height=8)
+# Only the visible rows are drawn, however many users there are
+user_table = VirtualTable(table_frame, columns, height=8)
 
 # Configure column headings
 for col in columns:
@@ -723,10 +868,6 @@ for col in columns:
     else:
         user_table.column(col, width=150, anchor='w')
 
-# Add scrollbar
-table_scroll = ttk.Scrollbar(table_frame, orient='vertical', command=user_table.yview)
-user_table.configure(yscrollcommand=table_scroll.set)
-table_scroll.pack(side='right', fill='y')
 user_table.pack(expand=True, fill='both', padx=20, pady=(0, 20))
 
 # Bind click event to show user details
@@ -813,4 +954,4 @@ populate_user_table()
 
 # Run the application
 if __name__ == "__main__":
-    app.mainloop()
\ No newline at end of file
+    router.run("manage_users")
\ No newline at end of file
@@ -0,0 +1,334 @@
+import mysql.connector
+from db import get_connection
+import rollup
+import user_counters
+import inventory
+import instrument
+import sys
+import time
+
+# ------------------- Schema Migrations -------------------
+# The schema is built by numbered migrations. Schema_Version records which
+# ones have been applied, so startup only runs the ones a database is
+# missing instead of re-running every CREATE TABLE. To change the schema,
+# append a migration to MIGRATIONS; never edit one that has shipped.
+#
+# A migration is a function taking a cursor. It may return callables to run
+# after its changes are committed (e.g. rebuilding a derived table through
+# its own connection). Migration 1 is the schema as setup_database() used to
+# create it. It checks before adding columns and indexes, so databases
+# created by that code upgrade cleanly.
+
+def create_index_if_missing(cursor, table, index_name, columns, unique=False):
+    """Create an index unless one with the same name already exists"""
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        """,
+        (table, index_name)
+    )
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {index_name} ON {table} ({columns})")
+
+def add_column_if_missing(cursor, table, column, definition):
+    """Add a column to an existing table unless it is already there; returns True if it was added"""
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """,
+        (table, column)
+    )
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+    return False
+
+# ------------------- Migrations -------------------
+def create_base_schema(cursor):
+    """Tables, columns and indexes created by the original setup_database()"""
+    after_commit = []
+    
+    # Create Users table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Users (
+            user_id INT AUTO_INCREMENT PRIMARY KEY,
+            first_name VARCHAR(50) NOT NULL,
+            last_name VARCHAR(50) NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            phone VARCHAR(20),
+            password VARCHAR(255) NOT NULL,
+            user_address VARCHAR(255),
+            user_role VARCHAR(20) DEFAULT 'customer'
+        )
+    """)
+    
+    # Per-user booking counters, kept up to date by the booking write paths
+    counters_added = add_column_if_missing(cursor, "Users", "booking_count", "INT NOT NULL DEFAULT 0")
+    counters_added = add_column_if_missing(cursor, "Users", "total_spent", "DECIMAL(12, 2) NOT NULL DEFAULT 0") or counters_added
+    if counters_added:
+        after_commit.append(user_counters.reconcile_user_counters)
+    
+    # Create Admin table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Admin (
+            Admin_ID INT AUTO_INCREMENT PRIMARY KEY,
+            AdminName VARCHAR(100) NOT NULL,
+            AdminEmail VARCHAR(100) UNIQUE NOT NULL,
+            AdminPassword VARCHAR(255) NOT NULL
+        )
+    """)
+    
+    # Create Hotel table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Hotel (
+            Hotel_ID INT AUTO_INCREMENT PRIMARY KEY,
+            hotel_name VARCHAR(100) NOT NULL,
+            location VARCHAR(255) NOT NULL,
+            description TEXT,
+            star_rating INT DEFAULT 3 CHECK (star_rating BETWEEN 1 AND 5)
+        )
+    """)
+    
+    # Create Room table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Room (
+            Room_ID INT AUTO_INCREMENT PRIMARY KEY,
+            Room_Type VARCHAR(50) NOT NULL,
+            Price_per_Night DECIMAL(10, 2) NOT NULL,
+            Availability_status VARCHAR(20) DEFAULT 'Available',
+            Updated_By INT,
+            FOREIGN KEY (Updated_By) REFERENCES Admin(Admin_ID) ON DELETE SET NULL
+        )
+    """)
+    
+    # Create Booking table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Booking (
+            Booking_ID INT AUTO_INCREMENT PRIMARY KEY,
+            User_ID INT NOT NULL,
+            Room_ID INT NOT NULL,
+            Check_IN_Date DATE NOT NULL,
+            Check_Out_Date DATE NOT NULL,
+            Total_Cost DECIMAL(10, 2) NOT NULL,
+            Booking_Status VARCHAR(20) DEFAULT 'Pending',
+            FOREIGN KEY (User_ID) REFERENCES Users(user_id) ON DELETE CASCADE,
+            FOREIGN KEY (Room_ID) REFERENCES Room(Room_ID) ON DELETE CASCADE
+        )
+    """)
+    
+    # Create RoomCategory table (room categories a hotel offers, with their starting price)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS RoomCategory (
+            Category_ID INT AUTO_INCREMENT PRIMARY KEY,
+            Hotel_ID INT NOT NULL,
+            category_name VARCHAR(50) NOT NULL,
+            base_price DECIMAL(10, 2) NOT NULL,
+            INDEX idx_room_category_hotel (Hotel_ID, base_price),
+            FOREIGN KEY (Hotel_ID) REFERENCES Hotel(Hotel_ID) ON DELETE CASCADE
+        )
+    """)
+    
+    # Create Amenities table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Amenities (
+            Amenity_ID INT AUTO_INCREMENT PRIMARY KEY,
+            amenity_name VARCHAR(100) UNIQUE NOT NULL
+        )
+    """)
+    
+    # Create Hotel_Amenities table (which hotel has which amenity)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Hotel_Amenities (
+            Hotel_ID INT NOT NULL,
+            Amenity_ID INT NOT NULL,
+            PRIMARY KEY (Hotel_ID, Amenity_ID),
+            FOREIGN KEY (Hotel_ID) REFERENCES Hotel(Hotel_ID) ON DELETE CASCADE,
+            FOREIGN KEY (Amenity_ID) REFERENCES Amenities(Amenity_ID) ON DELETE CASCADE
+        )
+    """)
+    
+    # Link rooms to their hotel and record how many guests a room sleeps (used by search)
+    add_column_if_missing(cursor, "Room", "Hotel_ID", 
+                          "INT NULL, ADD CONSTRAINT fk_room_hotel FOREIGN KEY (Hotel_ID) "
+                          "REFERENCES Hotel(Hotel_ID) ON DELETE SET NULL")
+    add_column_if_missing(cursor, "Room", "Max_Guests", "INT NOT NULL DEFAULT 2")
+    
+    # Client-generated key that makes retrying a booking request safe
+    add_column_if_missing(cursor, "Booking", "Idempotency_Key", "VARCHAR(64) NULL")
+    create_index_if_missing(cursor, "Booking", "uq_booking_idempotency_key", "Idempotency_Key", unique=True)
+    
+    # Create Review table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Review (
+            Review_ID INT AUTO_INCREMENT PRIMARY KEY,
+            User_ID INT,
+            Rating INT NOT NULL CHECK (Rating BETWEEN 1 AND 5),
+            Comments TEXT,
+            Review_Date DATE,
+            FOREIGN KEY (User_ID) REFERENCES Users(user_id) ON DELETE SET NULL
+        )
+    """)
+    
+    # Create Report table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Report (
+            Report_ID INT AUTO_INCREMENT PRIMARY KEY,
+            Generated_By INT,
+            Generate_Time DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (Generated_By) REFERENCES Admin(Admin_ID) ON DELETE SET NULL
+        )
+    """)
+    
+    # Record what each report was for
+    add_column_if_missing(cursor, "Report", "Description", "VARCHAR(255)")
+    
+    # Create Daily_Rollup table (bookings, revenue and nights sold per day and room type)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Daily_Rollup (
+            Stat_Date DATE NOT NULL,
+            Room_Type VARCHAR(50) NOT NULL,
+            Bookings INT NOT NULL DEFAULT 0,
+            Revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+            Nights_Sold INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (Stat_Date, Room_Type)
+        )
+    """)
+    
+    # Backfill the rollup the first time it is created on a database with bookings
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM Daily_Rollup), EXISTS(SELECT 1 FROM Booking)")
+    rollup_has_rows, has_bookings = cursor.fetchone()
+    if has_bookings and not rollup_has_rows:
+        after_commit.append(rollup.rebuild_rollup)
+    
+    # Create Room_Night table (one row per booked night; the primary key stops double-booking)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Room_Night (
+            Room_ID INT NOT NULL,
+            Stay_Date DATE NOT NULL,
+            Booking_ID INT NOT NULL,
+            PRIMARY KEY (Room_ID, Stay_Date),
+            INDEX idx_room_night_booking (Booking_ID),
+            FOREIGN KEY (Room_ID) REFERENCES Room(Room_ID) ON DELETE CASCADE,
+            FOREIGN KEY (Booking_ID) REFERENCES Booking(Booking_ID) ON DELETE CASCADE
+        )
+    """)
+    
+    # Fill it from existing bookings the first time it is created
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM Room_Night)")
+    if has_bookings and not cursor.fetchone()[0]:
+        inventory.backfill_room_nights(cursor)
+    
+    # Indexes for the Manage Bookings filters and per-user booking lookups
+    create_index_if_missing(cursor, "Booking", "idx_booking_checkin_status", "Check_IN_Date, Booking_Status")
+    create_index_if_missing(cursor, "Booking", "idx_booking_user", "User_ID, Check_IN_Date")
+    
+    return after_commit
+
+def add_access_path_indexes(cursor):
+    """Covering indexes for the filters and sorts the pages actually run"""
+    # Room types with their cheapest available price (book.py), free rooms by type (search, inventory)
+    create_index_if_missing(cursor, "Room", "idx_room_status_type_price",
+                            "Availability_status, Room_Type, Price_per_Night")
+    
+    # Manage Bookings status filter in check-in order, and the rollup rebuild's status scan
+    create_index_if_missing(cursor, "Booking", "idx_booking_status_checkin",
+                            "Booking_Status, Check_IN_Date, Booking_ID")
+    
+    # Manage Bookings "Highest/Lowest Amount" sorts and their keyset pagination
+    create_index_if_missing(cursor, "Booking", "idx_booking_cost", "Total_Cost, Booking_ID")
+
+def add_user_full_name(cursor):
+    """Users.Full_Name generated column so name lookups can use an index"""
+    add_column_if_missing(cursor, "Users", "Full_Name",
+                          "VARCHAR(101) GENERATED ALWAYS AS (CONCAT(first_name, ' ', last_name)) STORED")
+    create_index_if_missing(cursor, "Users", "idx_users_full_name", "Full_Name")
+
+# (version, description, function) in the order they are applied
+MIGRATIONS = [
+    (1, "Base tables, columns and indexes", create_base_schema),
+    (2, "Indexes for booking, room and status access paths", add_access_path_indexes),
+    (3, "Users.Full_Name generated column", add_user_full_name),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# ------------------- Applying Migrations -------------------
+def create_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Schema_Version (
+            Version INT PRIMARY KEY,
+            Description VARCHAR(255) NOT NULL,
+            Applied_At DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def applied_versions(cursor):
+    """Return the set of migration versions recorded in Schema_Version"""
+    cursor.execute("SELECT Version FROM Schema_Version")
+    return {row[0] for row in cursor.fetchall()}
+
+def schema_is_current():
+    """Return True if every migration has been applied (one cheap query)
+
+    False when the database or Schema_Version table doesn't exist yet.
+    """
+    try:
+        with get_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT MAX(Version) FROM Schema_Version")
+            version = cursor.fetchone()[0]
+            cursor.close()
+        return version is not None and version >= LATEST_VERSION
+    except mysql.connector.Error:
+        return False
+
+def migrate(connection):
+    """Apply every migration the database is missing; returns the versions applied
+
+    connection must already be using the hotel database.
+    """
+    cursor = connection.cursor()
+    try:
+        create_version_table(cursor)
+        applied = applied_versions(cursor)
+        connection.commit()
+        
+        newly_applied = []
+        for version, description, migration in MIGRATIONS:
+            if version in applied:
+                continue
+            
+            started = time.perf_counter()
+            after_commit = migration(cursor) or []
+            cursor.execute(
+                "INSERT INTO Schema_Version (Version, Description) VALUES (%s, %s)",
+                (version, description)
+            )
+            connection.commit()
+            
+            for task in after_commit:
+                task()
+            instrument.record_action(f"startup.migration_{version}", (time.perf_counter() - started) * 1000)
+            newly_applied.append(version)
+        
+        return newly_applied
+    finally:
+        cursor.close()
+
+# Direct execution: python migrations.py [--status]
+if __name__ == "__main__":
+    try:
+        with get_connection() as connection:
+            if len(sys.argv) > 1 and sys.argv[1] == "--status":
+                cursor = connection.cursor()
+                create_version_table(cursor)
+                applied = applied_versions(cursor)
+                cursor.close()
+                for version, description, _ in MIGRATIONS:
+                    print(f"{version:>3}  {'applied' if version in applied else 'pending':<8} {description}")
+            else:
+                versions = migrate(connection)
+                print(f"Applied migrations: {versions}" if versions else "Schema is up to date.")
+    except mysql.connector.Error as err:
+        print(f"Database Error: {err}")
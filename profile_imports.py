@@ -0,0 +1,145 @@
+import router
+import ast
+import json
+import os
+import subprocess
+import sys
+
+# ------------------- Import-Time Profiler -------------------
+# Keeps the heavy libraries (matplotlib, Pillow, tkcalendar) out of the
+# page build path:
+#   1. Static check: reads every page module, and the app modules it
+#      imports, and lists heavy imports made at module level, i.e. while
+#      the page is being built rather than on first use. Any finding makes
+#      the script exit with status 1.
+#   2. Import cost: times importing each dependency in a fresh interpreter
+#      with "python -X importtime".
+#   3. Time to first paint: if the app has written metrics.json (see
+#      instrument.py), prints how long each page took to build and appear.
+#
+# Usage: python profile_imports.py [--metrics metrics.json] [--skip-timing]
+
+HEAVY_MODULES = ("matplotlib", "PIL", "tkcalendar")
+IMPORT_TARGETS = ["customtkinter", "mysql.connector", "matplotlib.pyplot",
+                  "matplotlib.backends.backend_tkagg", "PIL.ImageTk", "tkcalendar"]
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ------------------- Static Check -------------------
+def module_level_imports(path):
+    """Return [(line, module)] for imports that run when the module is loaded
+
+    Imports inside functions and classes only run when they are called, so
+    they are skipped; imports inside module-level if/try/with blocks count.
+    """
+    with open(path, encoding="utf-8") as source:
+        tree = ast.parse(source.read(), path)
+
+    found = []
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        if isinstance(node, ast.Import):
+            found.extend((node.lineno, alias.name) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            found.append((node.lineno, node.module))
+        else:
+            for field in ("body", "orelse", "finalbody", "handlers"):
+                pending.extend(getattr(node, field, []))
+    return found
+
+def app_module_path(module):
+    """Return the file of an app module (top-level .py in this folder), or None"""
+    path = os.path.join(APP_DIR, module.split(".")[0] + ".py")
+    return path if os.path.isfile(path) else None
+
+def eager_heavy_imports(page_module):
+    """Return [(file, line, module)] heavy imports loaded while building a page"""
+    findings = []
+    seen = set()
+    pending = [page_module]
+    while pending:
+        module = pending.pop()
+        path = app_module_path(module)
+        if path is None or path in seen:
+            continue
+        seen.add(path)
+
+        for line, imported in module_level_imports(path):
+            if imported.split(".")[0] in HEAVY_MODULES:
+                findings.append((os.path.basename(path), line, imported))
+            elif app_module_path(imported) and imported.split(".")[0] != "router":
+                pending.append(imported)
+    return findings
+
+# ------------------- Import Cost -------------------
+def import_time_ms(statement):
+    """Total time (ms) of the top-level imports made by a statement in a fresh interpreter"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, cwd=APP_DIR)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # Top-level import (not pulled in by another one)
+            total_us += int(cumulative)
+    return total_us / 1000
+
+def dependency_costs():
+    """Return {module: import ms} with the interpreter's own startup imports subtracted"""
+    baseline = import_time_ms("pass")
+    return {module: max(0.0, import_time_ms(f"import {module}") - baseline) for module in IMPORT_TARGETS}
+
+# ------------------- Report -------------------
+def print_first_paint(metrics_path):
+    """Print the page build/first-paint times recorded by the app"""
+    if not os.path.isfile(metrics_path):
+        print(f"\nNo {metrics_path} yet - run the app and open some pages to record time to first paint.")
+        return
+
+    with open(metrics_path, encoding="utf-8") as metrics_file:
+        actions = json.load(metrics_file)["actions"]
+
+    print(f"\nTime to first paint (from {metrics_path}):")
+    print(f"  {'Page / step':<36} {'count':>6} {'avg ms':>9} {'max ms':>9}")
+    for name in sorted(actions):
+        if name.startswith(("page.", "startup.")):
+            stats = actions[name]
+            print(f"  {name:<36} {stats['count']:>6} {stats['avg_ms']:>9} {stats['max_ms']:>9}")
+
+def run(metrics_path, skip_timing=False):
+    """Print the report; returns True if no page loads a heavy module while it is built"""
+    pages = sorted(set(router.PAGE_MODULES.values()))
+    ok = True
+
+    print("Heavy imports made while a page is built:")
+    for page in pages:
+        findings = eager_heavy_imports(page)
+        for file, line, module in findings:
+            print(f"  {page:<16} {file}:{line} imports {module}")
+        ok = ok and not findings
+    if ok:
+        print("  none")
+
+    if not skip_timing:
+        print("\nImport cost in a fresh interpreter:")
+        for module, ms in dependency_costs().items():
+            print(f"  {module:<36} {ms:>8.1f} ms")
+
+    print_first_paint(metrics_path)
+    return ok
+
+# Direct execution
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import-time and first-paint profiler")
+    parser.add_argument("--metrics", default=os.path.join(APP_DIR, "metrics.json"))
+    parser.add_argument("--skip-timing", action="store_true", help="only run the static check")
+    args = parser.parse_args()
+
+    ok = run(args.metrics, args.skip_timing)
+    print("\nPASS" if ok else "\nFAIL")
+    sys.exit(0 if ok else 1)
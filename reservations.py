@@ -0,0 +1,155 @@
+import mysql.connector
+from mysql.connector import errorcode
+from db import connect_db
+from instrument import timed
+from datetime import datetime
+from inventory import get_inventory, invalidate_inventory, reserve_nights
+import rollup
+import user_counters
+import random
+import threading
+import time
+
+# ------------------- Room Reservation -------------------
+# A booking is written in one transaction that locks the chosen Room row
+# first, so concurrent writers for the same room queue up instead of racing.
+# Inside the lock the room's nights are re-checked against Room_Night (the
+# in-memory index may be stale), and the Room_Night primary key still rejects
+# any overlap that slips through. Deadlocks and lock-wait timeouts are retried
+# with exponential backoff. An optional idempotency key makes a repeated
+# request (double click, retry after a timeout) return the original booking.
+
+MAX_ATTEMPTS = 5  # Tries per room when MySQL reports a deadlock or lock-wait timeout
+BACKOFF_BASE = 0.05  # Seconds; doubled on every retry, plus jitter
+RETRYABLE_ERRORS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+
+# Counters for the stress benchmark
+stats = {"booked": 0, "conflicts": 0, "retries": 0, "replays": 0}
+_stats_lock = threading.Lock()
+
+
+class RoomTaken(Exception):
+    """The room was booked by someone else for some of the requested nights"""
+
+
+def as_date(value):
+    """Accept a date or datetime and return a date"""
+    return value.date() if isinstance(value, datetime) else value
+
+def count(name):
+    """Bump one of the reservation counters"""
+    with _stats_lock:
+        stats[name] += 1
+
+def backoff(attempt):
+    """Sleep before retry number attempt (1, 2, ...)"""
+    delay = BACKOFF_BASE * (2 ** (attempt - 1))
+    time.sleep(delay + random.uniform(0, delay))
+
+def find_booking_by_key(cursor, idempotency_key):
+    """Return (booking_id, room_id) of the booking made with this key, or None"""
+    cursor.execute(
+        "SELECT Booking_ID, Room_ID FROM Booking WHERE Idempotency_Key = %s",
+        (idempotency_key,)
+    )
+    return cursor.fetchone()
+
+def reserve_room(cursor, user_id, room_id, check_in, check_out, total_cost, status, idempotency_key):
+    """Insert the booking and its nights for one room; raises RoomTaken if a night is taken"""
+    # Serialize writers for this room
+    cursor.execute("SELECT Room_ID FROM Room WHERE Room_ID = %s FOR UPDATE", (room_id,))
+    if cursor.fetchone() is None:
+        raise RoomTaken()
+
+    cursor.execute(
+        """
+        SELECT 1 FROM Room_Night
+        WHERE Room_ID = %s AND Stay_Date >= %s AND Stay_Date < %s
+        LIMIT 1
+        """,
+        (room_id, check_in, check_out)
+    )
+    if cursor.fetchone():
+        raise RoomTaken()
+
+    cursor.execute(
+        """
+        INSERT INTO Booking (User_ID, Room_ID, Check_IN_Date, Check_Out_Date,
+                           Total_Cost, Booking_Status, Idempotency_Key)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """,
+        (user_id, room_id, check_in, check_out, total_cost, status, idempotency_key)
+    )
+    booking_id = cursor.lastrowid
+
+    # The Room_Night primary key rejects the insert if any night is already taken
+    reserve_nights(cursor, room_id, booking_id, check_in, check_out)
+    rollup.apply_booking(cursor, booking_id, 1)
+    user_counters.apply_booking(cursor, user_id, total_cost, 1)
+    return booking_id
+
+@timed()
+def book_room(user_id, room_type, check_in, check_out, total_cost, status="Confirmed",
+              idempotency_key=None):
+    """Book the first room of room_type that is free for [check_in, check_out)
+
+    Returns (booking_id, room_id), or None when no room of that type is free.
+    Calling it again with the same idempotency_key returns the booking that
+    the first call made instead of booking a second room.
+    """
+    check_in, check_out = as_date(check_in), as_date(check_out)
+    inventory = get_inventory()
+
+    connection = connect_db()
+    cursor = connection.cursor()
+    try:
+        if idempotency_key:
+            existing = find_booking_by_key(cursor, idempotency_key)
+            connection.commit()
+            if existing:
+                count("replays")
+                return tuple(existing)
+
+        for room_id in inventory.free_rooms(room_type, check_in, check_out):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    booking_id = reserve_room(cursor, user_id, room_id, check_in, check_out,
+                                              total_cost, status, idempotency_key)
+                    connection.commit()
+                except RoomTaken:
+                    connection.rollback()
+                    booking_id = None
+                except mysql.connector.Error as err:
+                    connection.rollback()
+                    if err.errno in RETRYABLE_ERRORS and attempt < MAX_ATTEMPTS:
+                        count("retries")
+                        backoff(attempt)
+                        continue
+                    if err.errno != errorcode.ER_DUP_ENTRY:
+                        raise
+
+                    # Either the same request already went through on another
+                    # connection, or a night was taken between check and insert
+                    if idempotency_key:
+                        existing = find_booking_by_key(cursor, idempotency_key)
+                        connection.commit()
+                        if existing:
+                            count("replays")
+                            return tuple(existing)
+                    booking_id = None
+                break
+
+            if booking_id is None:
+                # The index was stale for this room - reload it on the next lookup
+                count("conflicts")
+                invalidate_inventory()
+                continue
+
+            count("booked")
+            inventory.add_booking(booking_id, room_id, check_in, check_out)
+            return booking_id, room_id
+
+        return None
+    finally:
+        cursor.close()
+        connection.close()
@@ -0,0 +1,77 @@
+import mysql.connector
+from db import connect_db
+import sys
+
+# ------------------- Daily Revenue / Occupancy Rollup -------------------
+# Daily_Rollup keeps one row per check-in date and room type with the number
+# of bookings, revenue and nights sold. Cancelled bookings are not counted.
+# The booking write paths keep it up to date with apply_booking() inside
+# their own transaction; rebuild_rollup() recomputes it from scratch.
+
+def apply_booking(cursor, booking_id, sign):
+    """Add (sign=1) or remove (sign=-1) one booking from the rollup
+
+    Must run on the same cursor/transaction as the booking write, while the
+    Booking row still exists.
+    """
+    cursor.execute(
+        """
+        INSERT INTO Daily_Rollup (Stat_Date, Room_Type, Bookings, Revenue, Nights_Sold)
+        SELECT b.Check_IN_Date, r.Room_Type, %s, %s * b.Total_Cost,
+               %s * DATEDIFF(b.Check_Out_Date, b.Check_IN_Date)
+        FROM Booking b
+        JOIN Room r ON b.Room_ID = r.Room_ID
+        WHERE b.Booking_ID = %s
+        ON DUPLICATE KEY UPDATE
+            Bookings = Bookings + VALUES(Bookings),
+            Revenue = Revenue + VALUES(Revenue),
+            Nights_Sold = Nights_Sold + VALUES(Nights_Sold)
+        """,
+        (sign, sign, sign, booking_id)
+    )
+
+def apply_status_change(cursor, booking_id, old_status, new_status):
+    """Update the rollup when a booking moves into or out of Cancelled"""
+    if old_status != "Cancelled" and new_status == "Cancelled":
+        apply_booking(cursor, booking_id, -1)
+    elif old_status == "Cancelled" and new_status != "Cancelled":
+        apply_booking(cursor, booking_id, 1)
+
+def rebuild_rollup(admin_id=None):
+    """Recompute the whole rollup from the Booking table and record it in Report"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("DELETE FROM Daily_Rollup")
+        cursor.execute(
+            """
+            INSERT INTO Daily_Rollup (Stat_Date, Room_Type, Bookings, Revenue, Nights_Sold)
+            SELECT b.Check_IN_Date, r.Room_Type, COUNT(*), SUM(b.Total_Cost),
+                   SUM(DATEDIFF(b.Check_Out_Date, b.Check_IN_Date))
+            FROM Booking b
+            JOIN Room r ON b.Room_ID = r.Room_ID
+            WHERE b.Booking_Status <> 'Cancelled'
+            GROUP BY b.Check_IN_Date, r.Room_Type
+            """
+        )
+        rows = cursor.rowcount
+        cursor.execute(
+            "INSERT INTO Report (Generated_By, Description) VALUES (%s, %s)",
+            (admin_id, f"Daily rollup rebuilt ({rows} rows)")
+        )
+        connection.commit()
+        cursor.close()
+        return rows
+    finally:
+        connection.close()
+
+# Direct execution: python rollup.py --rebuild [admin_id]
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--rebuild":
+        admin_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        try:
+            print(f"Daily rollup rebuilt with {rebuild_rollup(admin_id)} rows.")
+        except mysql.connector.Error as err:
+            print(f"Database Error: {err}")
+    else:
+        print("Usage: python rollup.py --rebuild [admin_id]")
@@ -0,0 +1,163 @@
+import customtkinter as ctk
+import instrument
+import importlib
+import sys
+import time
+
+# ------------------- Page Registry -------------------
+# Page name -> module that builds the page. The aliases cover the names the
+# navigation buttons have always used ("bookings", "profile", ...).
+PAGE_MODULES = {
+    "main": "main",
+    "login": "login",
+    "signup": "signup",
+    "admin_login": "admin_login",
+    "home": "home",
+    "book": "book",
+    "bookings": "book",
+    "user": "user",
+    "profile": "user",
+    "feedback": "feedback",
+    "admin": "admin",
+    "manage_booking": "manage_booking",
+    "manage_bookings": "manage_booking",
+    "manage_users": "manage_users",
+}
+
+# Pages that do not depend on who is logged in and survive a logout
+PUBLIC_PAGES = ("main", "login", "signup", "admin_login")
+
+# ------------------- Global Variables -------------------
+app = None
+session = {"user": None, "admin": None}  # Signed session tokens of the logged-in user/admin (see session.py)
+pages = {}  # Page name -> {"frame", "title", "geometry", "on_show"}
+current_page = None
+switch_times = {}  # Page name -> last page-switch latency in milliseconds
+switch_label = None
+_navigation = 0
+
+# ------------------- App Window -------------------
+def get_app():
+    """Return the single application window, creating it on first use"""
+    global app, switch_label
+
+    if app is None:
+        ctk.set_appearance_mode("light")
+        ctk.set_default_color_theme("blue")
+
+        app = ctk.CTk()
+        app.resizable(False, False)
+
+        # Page-switch latency readout in the bottom-right corner
+        switch_label = ctk.CTkLabel(app, text="", font=("Arial", 10), text_color="gray",
+                                  fg_color="transparent", height=16)
+        switch_label.place(relx=1.0, rely=1.0, anchor="se", x=-8, y=-2)
+
+    return app
+
+def create_page(name, title, geometry="1200x700", on_show=None):
+    """Create the root frame for a page; the page module builds its widgets inside it
+
+    on_show is called every time the page is shown again after it was built.
+    """
+    frame = ctk.CTkFrame(get_app(), fg_color="white", corner_radius=0)
+    pages[name] = {
+        "frame": frame,
+        "title": title,
+        "geometry": geometry,
+        "on_show": on_show
+    }
+    return frame
+
+def page_name(name):
+    """Resolve a navigation name or alias to the page it opens"""
+    return PAGE_MODULES.get(name.lower(), name.lower())
+
+# ------------------- Navigation -------------------
+def show(name):
+    """Show a page, building it the first time it is opened"""
+    global current_page, _navigation
+
+    name = page_name(name)
+    started = time.perf_counter()
+    _navigation += 1
+    navigation = _navigation
+
+    just_built = name not in pages
+    if just_built:
+        build_page(name)
+
+        # The page redirected somewhere else (e.g. to login) while it was being built
+        if navigation != _navigation:
+            drop_page(name)
+            return
+
+        if name not in pages:
+            raise RuntimeError(f"Module '{PAGE_MODULES.get(name, name)}' did not create the {name} page")
+
+    page = pages[name]
+    if current_page and current_page != name and current_page in pages:
+        pages[current_page]["frame"].pack_forget()
+
+    page["frame"].pack(expand=True, fill="both")
+    app.title(page["title"])
+    app.geometry(page["geometry"])
+    current_page = name
+
+    if not just_built and page["on_show"]:
+        page["on_show"]()
+
+    # Measure until Tk has laid out the new page
+    app.update_idletasks()
+    elapsed = (time.perf_counter() - started) * 1000
+    switch_times[name] = elapsed
+    instrument.record_action(f"page.{name}.{'first_paint' if just_built else 'switch'}", elapsed)
+    switch_label.configure(text=f"{'Built' if just_built else 'Switched to'} {name} in {elapsed:.1f} ms")
+    switch_label.lift()
+
+def build_page(name):
+    """Import (or re-import) the module that builds a page"""
+    module_name = PAGE_MODULES.get(name, name)
+    module = sys.modules.get(module_name)
+
+    if module is None:
+        importlib.import_module(module_name)
+    else:
+        # The page was dropped (e.g. on logout) - run the module again to rebuild it
+        importlib.reload(module)
+
+def drop_page(name):
+    """Destroy a built page so it is rebuilt the next time it is opened"""
+    global current_page
+
+    page = pages.pop(name, None)
+    if page:
+        page["frame"].destroy()
+    if current_page == name:
+        current_page = None
+
+def logout(page="login"):
+    """Forget the logged-in user/admin and every page built for them"""
+    import session as sessions  # session.py imports this module
+    sessions.logout()
+    session["user"] = None
+    session["admin"] = None
+
+    for name in list(pages):
+        if name not in PUBLIC_PAGES and name != current_page:
+            drop_page(name)
+
+    previous = current_page
+    show(page)
+    if previous and previous not in PUBLIC_PAGES:
+        drop_page(previous)
+
+def run(name):
+    """Show the first page and start the Tk event loop"""
+    if current_page is None:
+        show(name)
+    else:
+        # The page redirected somewhere else while its module was running
+        drop_page(name)
+
+    get_app().mainloop()
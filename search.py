@@ -0,0 +1,199 @@
+from db import connect_db
+from instrument import timed
+from inventory import get_inventory
+from bisect import bisect_left
+import re
+import threading
+import time
+
+# ------------------- Hotel Search Index -------------------
+# Inverted index from hotel name / location tokens to hotels, with each
+# hotel's rooms grouped by room type and sorted by price. A search:
+#   1. matches every query token as a prefix of an indexed token,
+#   2. scores each hotel by where its tokens matched (name beats location,
+#      exact beats prefix) and keeps only hotels that matched all tokens,
+#   3. walks the hotels from best to worst and, per room type, takes the
+#      cheapest room that fits the guests and is free for the dates
+#      (checked against the RoomInventory interval index).
+# Rooms that are not linked to a Hotel row are grouped under the hotel name
+# at the start of their Room_Type ("Ocean View Resort - Deluxe Room").
+
+SEARCH_MAX_AGE = 300  # Seconds before the index is rebuilt from the database
+MAX_RESULTS = 50
+
+NAME_WEIGHT = 3  # Query token matched a word of the hotel name
+LOCATION_WEIGHT = 2  # Query token matched a word of the location
+PREFIX_FACTOR = 0.5  # Partial matches ("mich" -> "michigan") count half
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    """Split text into lowercase search tokens"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """In-memory inverted index over hotels and their rooms"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.hotels = {}  # Hotel key -> {"hotel_id", "name", "location", "stars"}
+        self.rooms = {}  # Hotel key -> {Room_Type: [(price, Room_ID, max_guests), ...] by price}
+        self.postings = {}  # Token -> {hotel key: weight}
+        self.tokens = []  # Sorted list of every indexed token, for prefix lookups
+        self.loaded_at = 0.0
+
+    def load(self):
+        """Build the index from the Room and Hotel tables"""
+        connection = connect_db()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                """
+                SELECT r.Room_ID, r.Room_Type, r.Price_per_Night, r.Max_Guests,
+                       h.Hotel_ID, h.hotel_name, h.location, h.star_rating
+                FROM Room r
+                LEFT JOIN Hotel h ON r.Hotel_ID = h.Hotel_ID
+                WHERE r.Availability_status = 'Available'
+                """
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+
+        self.build(rows)
+
+    def build(self, rows):
+        """Build the index from (room_id, room_type, price, max_guests,
+        hotel_id, hotel_name, location, star_rating) rows"""
+        hotels = {}
+        rooms = {}
+        postings = {}
+
+        for room_id, room_type, price, max_guests, hotel_id, hotel_name, location, stars in rows:
+            key = hotel_id if hotel_id is not None else room_type.split(" - ")[0]
+
+            if key not in hotels:
+                name = hotel_name or key
+                hotels[key] = {"hotel_id": hotel_id, "name": name, "location": location or "", "stars": stars or 0}
+                for token in tokenize(name):
+                    postings.setdefault(token, {})[key] = NAME_WEIGHT
+                for token in tokenize(location):
+                    weights = postings.setdefault(token, {})
+                    weights[key] = max(weights.get(key, 0), LOCATION_WEIGHT)
+
+            rooms.setdefault(key, {}).setdefault(room_type, []).append((price, room_id, max_guests or 1))
+
+        for room_types in rooms.values():
+            for options in room_types.values():
+                options.sort()
+
+        with self.lock:
+            self.hotels = hotels
+            self.rooms = rooms
+            self.postings = postings
+            self.tokens = sorted(postings)
+            self.loaded_at = time.monotonic()
+
+    def match(self, query):
+        """Return {hotel key: score} for hotels that match every query token"""
+        scores = None
+
+        for term in tokenize(query):
+            term_scores = {}
+            # Every indexed token that starts with the term sits in one sorted run
+            i = bisect_left(self.tokens, term)
+            while i < len(self.tokens) and self.tokens[i].startswith(term):
+                token = self.tokens[i]
+                factor = 1 if token == term else PREFIX_FACTOR
+                for key, weight in self.postings[token].items():
+                    score = weight * factor
+                    if score > term_scores.get(key, 0):
+                        term_scores[key] = score
+                i += 1
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: scores[key] + score for key, score in term_scores.items() if key in scores}
+            if not scores:
+                return {}
+
+        return scores or {}
+
+    def search(self, query, check_in=None, check_out=None, guests=1, inventory=None, limit=MAX_RESULTS):
+        """Return up to limit available room options, best first
+
+        Each result is a dict with the hotel, the cheapest free room of one
+        room type, its nightly price and the total for the stay. Dates are
+        optional; without them availability isn't checked.
+        """
+        if check_in and check_out and inventory is None:
+            inventory = get_inventory()
+        nights = (check_out - check_in).days if check_in and check_out else 1
+
+        with self.lock:
+            scores = self.match(query)
+
+            # Best matches first; ties go to the better-rated hotel
+            ranked = sorted(scores, key=lambda key: (-scores[key], -self.hotels[key]["stars"]))
+
+            results = []
+            cutoff = None
+            for key in ranked:
+                hotel = self.hotels[key]
+                rank = (scores[key], hotel["stars"])
+
+                # Once the page is full, only hotels that tie with the last one can still place
+                if cutoff is not None and rank != cutoff:
+                    break
+
+                for room_type, options in self.rooms[key].items():
+                    room = self.cheapest_free_room(options, check_in, check_out, guests, inventory)
+                    if room:
+                        price, room_id = room
+                        results.append({
+                            "hotel_id": hotel["hotel_id"],
+                            "hotel_name": hotel["name"],
+                            "location": hotel["location"],
+                            "stars": hotel["stars"],
+                            "room_id": room_id,
+                            "room_type": room_type,
+                            "price": price,
+                            "total": price * nights,
+                            "score": scores[key],
+                        })
+
+                if len(results) >= limit and cutoff is None:
+                    cutoff = rank
+
+        results.sort(key=lambda result: (-result["score"], -result["stars"], result["price"]))
+        return results[:limit]
+
+    def cheapest_free_room(self, options, check_in, check_out, guests, inventory):
+        """Return (price, room_id) of the cheapest fitting free room, or None"""
+        for price, room_id, max_guests in options:
+            if max_guests < guests:
+                continue
+            if inventory is None or inventory.is_free(room_id, check_in, check_out):
+                return price, room_id
+        return None
+
+
+_search_index = SearchIndex()
+
+def get_search_index(max_age=SEARCH_MAX_AGE):
+    """Return the shared search index, rebuilding it when it is stale"""
+    if time.monotonic() - _search_index.loaded_at > max_age:
+        _search_index.load()
+    return _search_index
+
+def invalidate_search_index():
+    """Force a rebuild on the next get_search_index() call"""
+    _search_index.loaded_at = 0.0
+
+@timed()
+def search_rooms(query, check_in=None, check_out=None, guests=1, limit=MAX_RESULTS):
+    """Search hotels by name/location and return ranked, available room options"""
+    return get_search_index().search(query, check_in, check_out, guests, limit=limit)
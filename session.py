@@ -0,0 +1,169 @@
+import router
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+
+# ------------------- Signed Sessions -------------------
+# At login a token is issued holding the user's (or admin's) profile and an
+# expiry, signed with HMAC-SHA256. router.session keeps the token, and each
+# page checks the signature and expiry locally instead of querying Users or
+# Admin again. A token can also be passed as the first command line argument
+# to open a page in its own process.
+#
+# When a profile is edited, refresh() issues a new token carrying the new
+# values and revokes the old one; revoke_subject() invalidates every token
+# issued so far for a user or admin (e.g. after an admin edits or deletes
+# them). Revocations are kept in memory, so they apply to this process.
+#
+# Token: base64url(JSON payload) "." base64url(signature)
+
+SESSION_TTL = 8 * 60 * 60  # Seconds a token stays valid
+SECRET_ENV = "HOTEL_SESSION_SECRET"
+SECRET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".session_key")
+
+# Session kind -> (ID column, profile columns kept in the token)
+# Passwords and the booking counters are left out on purpose.
+PROFILE_FIELDS = {
+    "user": ("user_id", ("user_id", "first_name", "last_name", "email", "phone", "user_address", "user_role")),
+    "admin": ("Admin_ID", ("Admin_ID", "AdminName", "AdminEmail")),
+}
+
+_secret = None
+_profiles = {}  # Token -> decoded profile (shared by every page using the token)
+_revoked = set()  # Token IDs revoked with revoke() or refresh()
+_not_before = {}  # (kind, subject ID) -> tokens issued before this time are revoked
+
+def get_secret():
+    """Return the signing key from the environment or SECRET_FILE, creating the file on first use"""
+    global _secret
+    if _secret is None:
+        if os.environ.get(SECRET_ENV):
+            _secret = os.environ[SECRET_ENV].encode()
+        elif os.path.isfile(SECRET_FILE):
+            with open(SECRET_FILE, "rb") as key_file:
+                _secret = key_file.read()
+        else:
+            _secret = os.urandom(32)
+            descriptor = os.open(SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(descriptor, "wb") as key_file:
+                key_file.write(_secret)
+    return _secret
+
+def encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def sign(body):
+    return encode(hmac.new(get_secret(), body.encode(), hashlib.sha256).digest())
+
+# ------------------- Issuing and Validating -------------------
+def issue(kind, profile, ttl=SESSION_TTL):
+    """Return a signed token for a profile row (kind is "user" or "admin")"""
+    id_column, fields = PROFILE_FIELDS[kind]
+    now = time.time()
+    payload = {
+        "kind": kind,
+        "sub": profile[id_column],
+        "jti": encode(os.urandom(12)),
+        "iat": now,
+        "exp": now + ttl,
+        "profile": {field: profile.get(field) for field in fields},
+    }
+    body = encode(json.dumps(payload, separators=(",", ":")).encode())
+    return f"{body}.{sign(body)}"
+
+def read_payload(token):
+    """Return the payload of a token with a valid signature, or None"""
+    try:
+        body, signature = token.split(".")
+        if not hmac.compare_digest(signature, sign(body)):
+            return None
+        return json.loads(decode(body))
+    except (AttributeError, ValueError):
+        return None
+
+def validate(token, kind):
+    """Return the profile in a token, or None if it is forged, expired, revoked or of another kind"""
+    payload = read_payload(token)
+    if payload is None or payload.get("kind") != kind:
+        return None
+    if payload["exp"] < time.time() or payload["jti"] in _revoked:
+        return None
+    if payload["iat"] < _not_before.get((kind, payload["sub"]), 0):
+        return None
+
+    if token not in _profiles:
+        _profiles[token] = payload["profile"]
+    return _profiles[token]
+
+# ------------------- Page Helpers -------------------
+def login(kind, profile):
+    """Start a session for a profile row; returns the cached profile"""
+    token = issue(kind, profile)
+    router.session[kind] = token
+    return validate(token, kind)
+
+def current(kind):
+    """Return the logged-in profile of this kind, or None
+
+    Uses the token in router.session, or one passed as the first command
+    line argument when a page is opened on its own.
+    """
+    token = router.session[kind]
+    if token is None and len(sys.argv) > 1:
+        token = sys.argv[1]
+
+    profile = validate(token, kind) if token else None
+    if profile is None:
+        router.session[kind] = None
+    else:
+        router.session[kind] = token
+    return profile
+
+def refresh(kind, profile):
+    """Re-issue the logged-in session after its profile was edited
+
+    The new values are copied into the cached profile, so pages that are
+    already built see them too. Does nothing if profile is someone else's.
+    """
+    current_profile = current(kind)
+    id_column, _ = PROFILE_FIELDS[kind]
+    if current_profile is None or current_profile[id_column] != profile[id_column]:
+        return None
+
+    old_token = router.session[kind]
+    revoke(old_token)
+    token = issue(kind, dict(current_profile, **profile))
+    router.session[kind] = token
+
+    # Keep sharing one dict between the pages
+    current_profile.update(read_payload(token)["profile"])
+    _profiles[token] = current_profile
+    return current_profile
+
+def revoke(token):
+    """Invalidate one token"""
+    payload = read_payload(token)
+    if payload:
+        _revoked.add(payload["jti"])
+    _profiles.pop(token, None)
+
+def revoke_subject(kind, subject_id):
+    """Invalidate every token issued so far for a user or admin"""
+    _not_before[(kind, subject_id)] = time.time()
+    for token in list(_profiles):
+        payload = read_payload(token)
+        if payload["kind"] == kind and payload["sub"] == subject_id:
+            del _profiles[token]
+
+def logout():
+    """Revoke the tokens of this window (router.logout() forgets them)"""
+    for kind in ("user", "admin"):
+        if router.session[kind]:
+            revoke(router.session[kind])
@@ -1,22 +1,11 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import mysql.connector
-import hashlib
-import subprocess
-import sys
-
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="new_password",
-        database="hotel_book"
-    )
-
-# ------------------- Password Hashing -------------------
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+from db import connect_db
+from analytics import invalidate_dashboard_stats
+from credentials import hash_password
+import image_cache
+import router
+import tasks
 
 # ------------------- Sign Up Function -------------------
 def signup_user():
@@ -46,7 +35,13 @@ def signup_user():
     first_name = name_parts[0]
     last_name = name_parts[1] if len(name_parts) > 1 else ""
 
-    # Hash the password
+    # Hashing the password is deliberately slow, so the account is saved in the background
+    signup_btn.configure(state="disabled")
+    tasks.submit(create_account, first_name, last_name, email, phone, password, key="signup",
+                 spinner=signup_spinner, on_success=account_created, on_error=signup_failed)
+
+def create_account(first_name, last_name, email, phone, password):
+    """Hash the password and insert the user (runs on a worker thread, errors are raised)"""
     hashed_password = hash_password(password)
 
     try:
@@ -60,87 +55,63 @@ def signup_user():
         )
 
         connection.commit()
-        messagebox.showinfo("Success", "Account created successfully!")
-        
-        # After successful registration, redirect to login page
-        open_login_page()
 
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
     finally:
-        if connection.is_connected():
+        if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
+def account_created(result):
+    signup_btn.configure(state="normal")
+    invalidate_dashboard_stats()
+    messagebox.showinfo("Success", "Account created successfully!")
+    
+    # After successful registration, redirect to login page
+    open_login_page()
+
+def signup_failed(error):
+    signup_btn.configure(state="normal")
+    messagebox.showerror("Database Error", str(error))
+
 # ------------------- Open Login Page -------------------
 def open_login_page(event=None):
     try:
-        subprocess.Popen([sys.executable, "login.py"])
-        app.destroy()  # Close the current signup window
+        router.show("login")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open login page: {e}")
 
 # ----------------- Setup -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
-app = ctk.CTk()
-app.title("Hotel Booking - Sign Up")
-app.geometry("1000x800")
-app.resizable(False, False)
+app = router.get_app()
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("signup", "Hotel Booking - Sign Up", "1000x800")
 
 # ----------------- Left Frame (Illustration) -----------------
 left_frame = ctk.CTkFrame(main_frame, fg_color="#3A546E", width=500, corner_radius=0)
 left_frame.pack(side="left", fill="both", expand=True)
 
-# Load and display the PNG image
-try:
-    from PIL import Image, ImageTk
-    
-    # Create a frame for the image
-    image_frame = ctk.CTkFrame(left_frame, fg_color="#3A546E")
-    image_frame.pack(fill="both", expand=True)
-    
-    # Create a label to hold the image
-    image_label = ctk.CTkLabel(image_frame, text="", fg_color="#3A546E")
-    image_label.pack(fill="both", expand=True)
-    
-    try:
-        # Replace 'city_image.png' with the actual name of your PNG file
-        image_path = "city_hotel.png"  # Use the same image as the login page
-        
-        # Load and resize the image
-        hotel_image = Image.open(image_path)
-        
-        # Get the dimensions of the frame
-        width, height = 400, 300
-        
-        # Resize the image while maintaining aspect ratio
-        hotel_image = hotel_image.resize((width, height), Image.LANCZOS)
-        
-        # Convert to PhotoImage for display
-        hotel_photo = ImageTk.PhotoImage(hotel_image)
-        
-        # Set the image to the label
-        image_label.configure(image=hotel_photo)
-        
-        # Keep a reference to avoid garbage collection
-        image_label.image = hotel_photo
-    
-    except Exception as e:
-        print(f"Error loading image: {e}")
+# Picture, scaled and loaded in the background (see image_cache.py)
+# Create a frame for the image
+image_frame = ctk.CTkFrame(left_frame, fg_color="#3A546E")
+image_frame.pack(fill="both", expand=True)
+
+# Create a label to hold the image
+image_label = ctk.CTkLabel(image_frame, text="", fg_color="#3A546E")
+image_label.pack(fill="both", expand=True)
+
+def hotel_image_failed(err):
+    """Show why the picture could not be loaded"""
+    print(f"Error loading image: {err}")
+    if isinstance(err, ImportError):
+        # Fallback if PIL is not installed
+        image_label.configure(text="PIL module not found\nPlease install PIL/Pillow with:\npip install Pillow", 
+                              font=("Arial", 14), text_color="white")
+    else:
         # Fallback text if image can't be loaded
         image_label.configure(text="Hotel Image Not Found\n\nPlease place your PNG file in the same directory\nand update the image path in the code.", 
                               font=("Arial", 14), text_color="white")
-except ImportError:
-    # Fallback if PIL is not installed
-    error_label = ctk.CTkLabel(left_frame, text="PIL module not found\nPlease install PIL/Pillow with:\npip install Pillow", 
-                             font=("Arial", 14), text_color="white")
-    error_label.pack(pady=300)
+
+image_cache.show_image(image_label, "city_hotel.png", (400, 300), on_error=hotel_image_failed)
 
 # ----------------- Right Frame (Sign Up Form) -----------------
 right_frame = ctk.CTkFrame(main_frame, fg_color="white", corner_radius=0)
@@ -190,7 +161,10 @@ terms_checkbox.pack(pady=(5, 15))
 signup_btn = ctk.CTkButton(content_frame, text="Sign Up", font=("Arial", 14, "bold"), 
                           fg_color="#0F2D52", hover_color="#1E4D88", 
                           width=400, height=45, corner_radius=5, command=signup_user)
-signup_btn.pack(pady=(5, 15))
+signup_btn.pack(pady=(5, 5))
+
+signup_spinner = tasks.Spinner(content_frame, text="Creating account...", font=("Arial", 10))
+signup_spinner.pack(pady=(0, 10))
 
 # Login Link
 login_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
@@ -203,4 +177,5 @@ login_link.pack(side="left")
 login_link.bind("<Button-1>", open_login_page)
 
 # Run App
-app.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    router.run("signup")
\ No newline at end of file
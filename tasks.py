@@ -0,0 +1,161 @@
+import customtkinter as ctk
+from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor
+import router
+import itertools
+import queue
+
+# ------------------- Background Tasks -------------------
+# Database calls run on a small thread pool so the Tk event loop keeps
+# drawing while a query is in flight. Workers never touch Tk: they put their
+# result on a queue, and the Tk thread drains it from an app.after() loop and
+# calls the page's callback there.
+#
+# Requests that replace each other (typing a new search term, changing a
+# filter) share a key. Submitting a new request for a key cancels the old one
+# if it hasn't started, and drops its result if it has, so a slow stale query
+# can never overwrite a newer one.
+
+WORKERS = 4
+POLL_INTERVAL = 16  # Milliseconds between result checks (about 60 fps)
+
+_executor = None
+_results = queue.Queue()  # (task_id, key, spinner, on_success, on_error, result, error) from workers
+_latest = {}  # Key -> ID of the newest task submitted for it
+_futures = {}  # Key -> Future of the newest task submitted for it
+_task_ids = itertools.count(1)
+_outstanding = 0  # Tasks whose results haven't been handled yet
+_polling = False
+
+def get_executor():
+    """Return the shared worker pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="db-task")
+    return _executor
+
+def submit(func, *args, on_success=None, on_error=None, key=None, spinner=None, **kwargs):
+    """Run func(*args, **kwargs) on a worker thread
+
+    on_success(result) or on_error(error) is called on the Tk thread when it
+    finishes. With a key, an earlier task with the same key is cancelled.
+    spinner (a Spinner) is shown while the task runs. Returns the task ID.
+    Must be called from the Tk thread.
+    """
+    global _outstanding
+
+    task_id = next(_task_ids)
+    if key is not None:
+        cancel(key)
+        _latest[key] = task_id
+
+    if spinner:
+        spinner.start()
+
+    def run():
+        try:
+            result, error = func(*args, **kwargs), None
+        except Exception as err:
+            result, error = None, err
+        _results.put((task_id, key, spinner, on_success, on_error, result, error))
+
+    future = get_executor().submit(run)
+    # A task cancelled before it started still has to stop its spinner
+    future.add_done_callback(lambda done: done.cancelled() and
+                             _results.put((task_id, key, spinner, None, None, None, None)))
+    if key is not None:
+        _futures[key] = future
+
+    _outstanding += 1
+    _start_polling()
+    return task_id
+
+def cancel(key):
+    """Cancel the pending task for key; a running one finishes but its result is dropped"""
+    _latest.pop(key, None)
+    future = _futures.pop(key, None)
+    if future:
+        future.cancel()
+
+def is_current(task_id, key):
+    """Return True if no newer task was submitted for key"""
+    return key is None or _latest.get(key) == task_id
+
+def _start_polling():
+    global _polling
+    if not _polling:
+        _polling = True
+        router.get_app().after(POLL_INTERVAL, _poll)
+
+def _poll():
+    """Hand finished results to their callbacks (runs on the Tk thread)"""
+    global _outstanding, _polling
+
+    while True:
+        try:
+            task_id, key, spinner, on_success, on_error, result, error = _results.get_nowait()
+        except queue.Empty:
+            break
+
+        _outstanding -= 1
+        if spinner:
+            spinner.stop()
+        if not is_current(task_id, key):
+            continue
+        if key is not None:
+            _latest.pop(key, None)
+            _futures.pop(key, None)
+
+        if error is not None:
+            (on_error or show_error)(error)
+        elif on_success:
+            on_success(result)
+
+    # Only keep polling while something is still running
+    if _outstanding > 0:
+        router.get_app().after(POLL_INTERVAL, _poll)
+    else:
+        _polling = False
+
+def show_error(error):
+    """Default error handler for background tasks"""
+    print(f"Database Error: {error}")
+    messagebox.showerror("Database Error", str(error))
+
+# ------------------- Loading Spinner -------------------
+class Spinner:
+    """Small animated "Loading..." label shown while background tasks run"""
+
+    FRAMES = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+    INTERVAL = 80  # Milliseconds per animation frame
+
+    def __init__(self, parent, text="Loading...", **label_options):
+        label_options.setdefault("font", ("Arial", 12))
+        label_options.setdefault("text_color", "gray")
+        self.label = ctk.CTkLabel(parent, text="", **label_options)
+        self.text = text
+        self.active = 0  # Number of running tasks using this spinner
+        self.frame = 0
+
+    def pack(self, **options):
+        self.label.pack(**options)
+
+    def grid(self, **options):
+        self.label.grid(**options)
+
+    def start(self):
+        self.active += 1
+        if self.active == 1:
+            self.animate()
+
+    def stop(self):
+        self.active = max(0, self.active - 1)
+        if self.active == 0 and self.label.winfo_exists():
+            self.label.configure(text="")
+
+    def animate(self):
+        if not self.active or not self.label.winfo_exists():
+            return
+        self.label.configure(text=f"{self.FRAMES[self.frame % len(self.FRAMES)]} {self.text}")
+        self.frame += 1
+        self.label.after(self.INTERVAL, self.animate)
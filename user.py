@@ -1,65 +1,30 @@
 import customtkinter as ctk
 from tkinter import messagebox, ttk
 import mysql.connector
-import subprocess
-import sys
+from db import connect_db
+from instrument import timed
+import router
+import session
+import tasks
 from datetime import datetime
 
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",  # Replace with your MySQL username
-        password="new_password",  # Replace with your MySQL password
-        database="hotel_book"  # Replace with your database name
-    )
-
 # ------------------- Global Variables -------------------
 current_user = None
 
 # ------------------- User Session Management -------------------
 def load_user_session():
-    """Load user information from database"""
+    """Load the logged-in user's profile from the signed session token"""
     global current_user
     
-    # Check if any user_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-            
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                return True
-                
-        except (ValueError, IndexError, mysql.connector.Error) as err:
-            print(f"Error loading user session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    # The token is checked locally (no database round trip)
+    current_user = session.current("user")
+    return current_user is not None
 
 # ------------------- Navigation Functions -------------------
 def open_page(page_name):
-    """Open another page and close the current one"""
+    """Switch to another page in the same window"""
     try:
-        # Pass the current user ID to the next page if a user is logged in
-        user_param = [str(current_user['user_id'])] if current_user else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + user_param
-        
-        subprocess.Popen(command)
-        app.destroy()  # Close the current window
+        router.show(page_name)
     except Exception as e:
         messagebox.showerror("Navigation Error", f"Unable to open {page_name} page: {e}")
 
@@ -79,7 +44,7 @@ def logout():
     """Log out the current user and return to login page"""
     global current_user
     current_user = None
-    open_page("login")
+    router.logout("login")
 
 # ------------------- Profile Functions -------------------
 def populate_profile_fields():
@@ -102,6 +67,7 @@ def populate_profile_fields():
         address_entry.delete(0, 'end')
         address_entry.insert(0, current_user['user_address'] if current_user.get('user_address') else "")
 
+@timed()
 def update_profile():
     """Update user profile information"""
     if not current_user:
@@ -144,12 +110,15 @@ def update_profile():
         
         connection.commit()
         
-        # Update current_user data
-        current_user['first_name'] = first_name
-        current_user['last_name'] = last_name
-        current_user['email'] = email
-        current_user['phone'] = phone
-        current_user['user_address'] = address
+        # Re-issue the session token with the new profile (updates current_user too)
+        session.refresh("user", {
+            'user_id': current_user['user_id'],
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': email,
+            'phone': phone,
+            'user_address': address
+        })
         
         messagebox.showinfo("Success", "Profile updated successfully!")
         
@@ -161,11 +130,9 @@ def update_profile():
             connection.close()
 
 # ------------------- Booking History Functions -------------------
-def load_booking_history():
-    """Load booking history from database"""
-    if not current_user:
-        return []
-        
+@timed()
+def load_booking_history(user_id):
+    """Load booking history from database (runs on a worker thread, errors are raised)"""
     try:
         connection = connect_db()
         cursor = connection.cursor(dictionary=True)
@@ -180,28 +147,32 @@ def load_booking_history():
             WHERE b.User_ID = %s
             ORDER BY b.Check_IN_Date DESC
             """,
-            (current_user['user_id'],)
+            (user_id,)
         )
         
         bookings = cursor.fetchall()
         return bookings
         
-    except mysql.connector.Error as err:
-        print(f"Error loading booking history: {err}")
-        return []
     finally:
         if 'connection' in locals() and connection.is_connected():
             cursor.close()
             connection.close()
 
 def populate_booking_table():
-    """Populate the booking history table"""
+    """Load the booking history in the background and show it in the table"""
+    if not current_user:
+        return
+    
+    tasks.submit(load_booking_history, current_user['user_id'], key="booking_history",
+                 spinner=history_spinner, on_success=show_booking_history,
+                 on_error=lambda err: print(f"Error loading booking history: {err}"))
+
+def show_booking_history(bookings):
+    """Replace the rows in the booking history table"""
     # Clear existing rows
     for row in booking_table.get_children():
         booking_table.delete(row)
     
-    bookings = load_booking_history()
-    
     # Add bookings to the table
     for booking in bookings:
         # Format dates
@@ -224,14 +195,13 @@ def populate_booking_table():
             status
         ))
 
-# ----------------- Initialize App -----------------
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
+def refresh_page():
+    """Reload the profile and booking history when the page is shown again"""
+    populate_profile_fields()
+    populate_booking_table()
 
-app = ctk.CTk()
-app.title("Hotel Booking - User Profile")
-app.geometry("1200x700")
-app.resizable(False, False)
+# ----------------- Initialize App -----------------
+app = router.get_app()
 
 # Check if user is logged in
 if not load_user_session():
@@ -239,8 +209,8 @@ if not load_user_session():
     open_page("login")
 
 # ----------------- Main Frame -----------------
-main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-main_frame.pack(expand=True, fill="both")
+main_frame = router.create_page("user", "Hotel Booking - User Profile", "1200x700",
+                                on_show=refresh_page)
 
 # ----------------- Sidebar (Navigation) -----------------
 sidebar = ctk.CTkFrame(main_frame, fg_color="#2C3E50", width=200, corner_radius=0)
@@ -343,7 +313,11 @@ history_header = ctk.CTkFrame(history_frame, fg_color="white", height=50)
 history_header.pack(fill="x", padx=20, pady=10)
 
 ctk.CTkLabel(history_header, text="🕒 Booking History", 
-           font=("Arial", 18, "bold"), text_color="#2C3E50").pack(anchor="w")
+           font=("Arial", 18, "bold"), text_color="#2C3E50").pack(side="left")
+
+# Shown while the history loads in the background
+history_spinner = tasks.Spinner(history_header, text="Loading bookings...")
+history_spinner.pack(side="right")
 
 # Booking Table
 table_frame = ctk.CTkFrame(history_frame, fg_color="white")
@@ -399,4 +373,4 @@ populate_booking_table()
 
 # Run the application
 if __name__ == "__main__":
-    app.mainloop()
\ No newline at end of file
+    router.run("user")
\ No newline at end of file
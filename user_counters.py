@@ -0,0 +1,61 @@
+import mysql.connector
+from db import connect_db
+import sys
+
+# ------------------- Per-User Booking Counters -------------------
+# Users.booking_count and Users.total_spent hold the number of bookings a
+# user has and their total cost (every status, like the old COUNT/SUM join).
+# Booking writes adjust them with apply_booking() inside their own
+# transaction; reconcile_user_counters() recomputes them from Booking and
+# fixes any row that drifted.
+
+def apply_booking(cursor, user_id, total_cost, sign):
+    """Add (sign=1) or remove (sign=-1) one booking from a user's counters
+
+    Must run on the same cursor/transaction as the booking write.
+    """
+    cursor.execute(
+        """
+        UPDATE Users
+        SET booking_count = booking_count + %s,
+            total_spent = total_spent + %s * %s
+        WHERE user_id = %s
+        """,
+        (sign, sign, total_cost, user_id)
+    )
+
+def reconcile_user_counters():
+    """Recompute every user's counters from the Booking table; returns the number of rows fixed"""
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            """
+            UPDATE Users u
+            LEFT JOIN (
+                SELECT User_ID, COUNT(*) AS bookings, SUM(Total_Cost) AS spent
+                FROM Booking
+                GROUP BY User_ID
+            ) b ON b.User_ID = u.user_id
+            SET u.booking_count = COALESCE(b.bookings, 0),
+                u.total_spent = COALESCE(b.spent, 0)
+            WHERE u.booking_count <> COALESCE(b.bookings, 0)
+               OR u.total_spent <> COALESCE(b.spent, 0)
+            """
+        )
+        fixed = cursor.rowcount
+        connection.commit()
+        cursor.close()
+        return fixed
+    finally:
+        connection.close()
+
+# Direct execution: python user_counters.py --reconcile
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--reconcile":
+        try:
+            print(f"User booking counters reconciled ({reconcile_user_counters()} users fixed).")
+        except mysql.connector.Error as err:
+            print(f"Database Error: {err}")
+    else:
+        print("Usage: python user_counters.py --reconcile")
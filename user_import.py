@@ -0,0 +1,310 @@
+import mysql.connector
+from db import connect_db
+from credentials import IMPORT_COST
+from hash_pool import HashPool
+import csv
+import json
+import os
+import re
+import sys
+import time
+
+# ------------------- Bulk User Import -------------------
+# Loads guest profiles exported from other systems into Users:
+#   1. The file is read one record at a time (CSV, JSON lines, or a JSON
+#      array decoded incrementally), so its size doesn't matter.
+#   2. Each record is validated (names, email, lengths, duplicates within
+#      the file); rejected records go to a CSV file with the reason.
+#   3. Plaintext passwords are hashed with credentials.hash_password() at
+#      IMPORT_COST in a process pool (hash_pool.py) while the previous chunk
+#      is being inserted.
+#   4. Each chunk is written with one executemany() (a single multi-row
+#      INSERT) using ON DUPLICATE KEY UPDATE, and committed.
+# Emails already in Users are either rejected (on_duplicate="skip") or
+# have their profile updated (on_duplicate="update").
+#
+# Records without a password get NO_PASSWORD, which matches no password,
+# so those users have to reset it before they can log in.
+#
+# At the deployment's cost a hash takes about as long as a login (57 ms
+# here), which would hold files with passwords to ~17 rows/s per CPU.
+# IMPORT_COST is a salted scrypt hash at a tiny cost (~25 us, ~40k rows/s
+# per CPU); authenticate() replaces it with a full-cost hash at the user's
+# first login. The pool is only started once a chunk has passwords.
+#
+# Usage: python user_import.py guests.csv [--on-duplicate skip|update] [--rejected rejected.csv]
+#                                         [--chunk 5000] [--workers 4]
+
+CHUNK_SIZE = 5000
+NO_PASSWORD = "-"
+
+# Column name in the file -> Users column
+FIELD_ALIASES = {
+    "first_name": "first_name", "firstname": "first_name", "first": "first_name",
+    "last_name": "last_name", "lastname": "last_name", "last": "last_name", "surname": "last_name",
+    "name": "full_name", "full_name": "full_name", "fullname": "full_name",
+    "email": "email", "email_address": "email", "e_mail": "email",
+    "phone": "phone", "phone_number": "phone", "telephone": "phone",
+    "address": "user_address", "user_address": "user_address",
+    "password": "password",
+}
+MAX_LENGTHS = {"first_name": 50, "last_name": 50, "email": 100, "phone": 20, "user_address": 255}
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+INSERT_USERS = """
+    INSERT INTO Users (first_name, last_name, email, phone, password, user_address)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE user_id = user_id
+"""
+UPSERT_USERS = """
+    INSERT INTO Users (first_name, last_name, email, phone, password, user_address)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE first_name = VALUES(first_name), last_name = VALUES(last_name),
+                            phone = VALUES(phone), user_address = VALUES(user_address),
+                            password = IF(VALUES(password) = '-', password, VALUES(password))
+"""
+
+# ------------------- Reading -------------------
+def read_records(path):
+    """Yield (position, record, error) for every record in a CSV, JSON lines or JSON file
+
+    position is the line number (record number for a JSON array). error is
+    set, and record is the raw text, when a line can't be decoded.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8-sig", newline="") as source:
+        if extension == ".csv":
+            reader = csv.DictReader(source)
+            for record in reader:
+                yield reader.line_num, record, None
+        elif extension in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(source, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line), None
+                except ValueError as err:
+                    yield line_number, line.rstrip("\n"), f"invalid JSON: {err}"
+        elif extension == ".json":
+            for position, record in enumerate(read_json_array(source), 1):
+                yield position, record, None
+        else:
+            raise ValueError(f"Unsupported file type '{extension}' (use .csv, .json or .jsonl)")
+
+def read_json_array(source, block_size=1 << 16):
+    """Yield the items of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    while True:
+        block = source.read(block_size)
+        buffer += block
+        position = 0
+        while True:
+            # Skip whitespace and separators up to the next item
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if not started and position < len(buffer):
+                if buffer[position] != "[":
+                    raise ValueError("A .json file must hold an array of user objects")
+                started = True
+                position += 1
+                continue
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if not block:
+                    raise ValueError("The JSON array in the file is incomplete or invalid")
+                break  # Item continues in the next block
+            yield item
+            position = end
+        buffer = buffer[position:]
+
+# ------------------- Validation -------------------
+def normalize(record):
+    """Map a record's fields to Users columns; returns (row, error)"""
+    if not isinstance(record, dict):
+        return None, "record is not an object"
+
+    row = {}
+    for name, value in record.items():
+        column = FIELD_ALIASES.get(str(name).strip().lower().replace(" ", "_").replace("-", "_"))
+        if column and value is not None:
+            row[column] = str(value).strip()
+
+    # A single name column is split like the signup form does
+    if not row.get("first_name") and row.get("full_name"):
+        parts = row["full_name"].split(maxsplit=1)
+        row["first_name"] = parts[0]
+        row.setdefault("last_name", parts[1] if len(parts) > 1 else "")
+
+    if not row.get("first_name"):
+        return None, "missing first name"
+    if not row.get("email"):
+        return None, "missing email"
+    if not EMAIL_PATTERN.fullmatch(row["email"]):
+        return None, "invalid email"
+    for column, limit in MAX_LENGTHS.items():
+        if len(row.get(column) or "") > limit:
+            return None, f"{column} longer than {limit} characters"
+    return row, None
+
+# ------------------- Importing -------------------
+class RejectedFile:
+    """CSV of rejected records, created when the first one is written"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.writer = None
+
+    def write(self, position, reason, record):
+        if self.writer is None:
+            self.file = open(self.path, "w", encoding="utf-8", newline="")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(["position", "reason", "record"])
+        raw = record if isinstance(record, str) else json.dumps(record, default=str)
+        self.writer.writerow([position, reason, raw])
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+def read_chunks(path, rejected, stats, chunk_size):
+    """Yield lists of valid rows (position, row), sending invalid records to rejected"""
+    seen = set()  # Emails already read from this file
+    chunk = []
+    for position, record, error in read_records(path):
+        stats["read"] += 1
+        row = None
+        if error is None:
+            row, error = normalize(record)
+        if error is None and row["email"].lower() in seen:
+            error = "duplicate email in file"
+        if error is not None:
+            rejected.write(position, error, record)
+            stats["rejected"] += 1
+            continue
+
+        seen.add(row["email"].lower())
+        chunk.append((position, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def write_chunk(connection, cursor, chunk, hashes, on_duplicate, rejected, stats):
+    """Insert (or update) one chunk of rows and commit"""
+    # Find the emails that are already registered
+    placeholders = ", ".join(["%s"] * len(chunk))
+    cursor.execute(f"SELECT email FROM Users WHERE email IN ({placeholders})",
+                   [row["email"] for _, row in chunk])
+    existing = {email.lower() for email, in cursor.fetchall()}
+
+    hashes = iter(hashes)
+    values = []
+    for position, row in chunk:
+        password = next(hashes) if row.get("password") else NO_PASSWORD
+        if row["email"].lower() in existing:
+            if on_duplicate != "update":
+                rejected.write(position, "email already exists", {key: value for key, value in row.items()
+                                                                  if key != "password"})
+                stats["rejected"] += 1
+                continue
+            stats["updated"] += 1
+        else:
+            stats["inserted"] += 1
+        values.append((row["first_name"], row.get("last_name", ""), row["email"],
+                       row.get("phone") or None, password, row.get("user_address") or None))
+
+    if values:
+        cursor.executemany(UPSERT_USERS if on_duplicate == "update" else INSERT_USERS, values)
+    connection.commit()
+
+def import_users(path, on_duplicate="skip", rejected_path=None, chunk_size=CHUNK_SIZE,
+                 workers=None, progress=None):
+    """Import users from a CSV, JSON lines or JSON file; returns the import stats
+
+    progress(stats) is called after every chunk (on the calling thread).
+    Rejected records are written to rejected_path (default: next to the
+    file, with .rejected.csv added). Database errors are raised; chunks
+    committed before the error stay imported.
+    """
+    if on_duplicate not in ("skip", "update"):
+        raise ValueError("on_duplicate must be 'skip' or 'update'")
+
+    workers = workers or os.cpu_count() or 1
+    rejected = RejectedFile(rejected_path or f"{path}.rejected.csv")
+    stats = {"read": 0, "inserted": 0, "updated": 0, "rejected": 0,
+             "elapsed_s": 0.0, "rows_per_s": 0.0, "rejected_file": None}
+    started = time.perf_counter()
+
+    pool = None
+    try:
+        connection = connect_db()
+        cursor = connection.cursor()
+
+        # Hash the next chunk's passwords while the current one is inserted
+        pending = None
+        for chunk in read_chunks(path, rejected, stats, chunk_size):
+            passwords = [row["password"] for _, row in chunk if row.get("password")]
+            if passwords and pool is None:
+                pool = HashPool(workers, IMPORT_COST)
+            hashes = pool.hash_batch(passwords) if passwords else ()
+            if pending:
+                write_chunk(connection, cursor, *pending, on_duplicate, rejected, stats)
+                report(stats, started, progress)
+            pending = (chunk, hashes)
+        if pending:
+            write_chunk(connection, cursor, *pending, on_duplicate, rejected, stats)
+        report(stats, started, progress)
+
+        return stats
+
+    finally:
+        if pool:
+            pool.close()
+        rejected.close()
+        if rejected.writer:
+            stats["rejected_file"] = rejected.path
+        if 'connection' in locals() and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+def report(stats, started, progress):
+    """Update the timing stats and pass them to the progress callback"""
+    stats["elapsed_s"] = round(time.perf_counter() - started, 2)
+    stats["rows_per_s"] = round(stats["read"] / stats["elapsed_s"], 1) if stats["elapsed_s"] else 0.0
+    if progress:
+        progress(dict(stats))
+
+def print_progress(stats):
+    print(f"  {stats['read']:>9} read {stats['inserted']:>9} inserted {stats['updated']:>8} updated "
+          f"{stats['rejected']:>8} rejected  {stats['rows_per_s']:>9.0f} rows/s")
+
+# Direct execution
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or JSON")
+    parser.add_argument("path", help=".csv, .json (array) or .jsonl file")
+    parser.add_argument("--on-duplicate", choices=["skip", "update"], default="skip",
+                        help="what to do with emails that are already registered")
+    parser.add_argument("--rejected", help="where to write rejected records")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, help="password hashing processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        stats = import_users(args.path, args.on_duplicate, args.rejected, args.chunk, args.workers,
+                             progress=print_progress)
+    except (OSError, ValueError, mysql.connector.Error) as err:
+        print(f"Import failed: {err}")
+        sys.exit(1)
+
+    print(f"Done in {stats['elapsed_s']} s")
+    if stats["rejected_file"]:
+        print(f"Rejected records written to {stats['rejected_file']}")
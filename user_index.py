@@ -0,0 +1,128 @@
+import threading
+
+# ------------------- User Search Index -------------------
+# In-memory n-gram index over each user's full name, email and address. Every
+# substring of length 1-3 of those fields maps to the users that contain it:
+#   - a search term of up to 3 characters is a single dictionary lookup,
+#   - a longer term intersects the sets of its 3-grams and then checks the
+#     few remaining users for the actual substring.
+# Matching is case-insensitive substring matching, like the old linear scan.
+# The page keeps the index current with add()/update()/remove() after its own
+# writes, so it only has to be rebuilt when the page is reloaded.
+
+NGRAM_SIZE = 3
+
+def search_fields(user):
+    """Return the lowercase fields a user can be found by"""
+    return (
+        f"{user['first_name']} {user['last_name']}".lower(),
+        (user['email'] or "").lower(),
+        (user['user_address'] or "").lower(),
+    )
+
+def ngrams(text, max_size=NGRAM_SIZE):
+    """Return every substring of text of length 1..max_size"""
+    grams = set()
+    for size in range(1, max_size + 1):
+        for i in range(len(text) - size + 1):
+            grams.add(text[i:i + size])
+    return grams
+
+def matches(fields, term):
+    """Return True if term occurs in one of the fields"""
+    return any(term in field for field in fields)
+
+
+class UserIndex:
+    """N-gram index for substring search over users"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.users = {}  # user_id -> user row (as returned by load_users)
+        self.fields = {}  # user_id -> search_fields(user)
+        self.postings = {}  # n-gram -> set of user_ids
+        self.loaded = False
+
+    def build(self, users):
+        """Replace the index contents with users"""
+        with self.lock:
+            self.users = {}
+            self.fields = {}
+            self.postings = {}
+            for user in users:
+                self._add(user)
+            self.loaded = True
+
+    def _add(self, user):
+        user_id = user['user_id']
+        fields = search_fields(user)
+        self.users[user_id] = user
+        self.fields[user_id] = fields
+        for field in fields:
+            for gram in ngrams(field):
+                self.postings.setdefault(gram, set()).add(user_id)
+
+    def _remove(self, user_id):
+        fields = self.fields.pop(user_id, None)
+        self.users.pop(user_id, None)
+        if fields is None:
+            return
+        for field in fields:
+            for gram in ngrams(field):
+                ids = self.postings.get(gram)
+                if ids is not None:
+                    ids.discard(user_id)
+                    if not ids:
+                        del self.postings[gram]
+
+    def add(self, user):
+        """Index a newly created user"""
+        with self.lock:
+            self._remove(user['user_id'])
+            self._add(user)
+
+    def update(self, user_id, **changes):
+        """Re-index a user after some of their fields changed"""
+        with self.lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return
+            self._remove(user_id)
+            self._add(dict(user, **changes))
+
+    def remove(self, user_id):
+        """Drop a deleted user from the index"""
+        with self.lock:
+            self._remove(user_id)
+
+    def all_users(self):
+        """Return every indexed user ordered by ID"""
+        with self.lock:
+            return [self.users[user_id] for user_id in sorted(self.users)]
+
+    def search(self, term, within=None):
+        """Return the users (ordered by ID) whose name, email or address contains term
+
+        within is an optional list of users from an earlier search; when the
+        new term contains the earlier one, only those users can match, so they
+        are filtered directly instead of going through the index.
+        """
+        term = term.lower()
+        with self.lock:
+            if not term:
+                return self.all_users()
+
+            if within is not None:
+                return [user for user in within
+                        if user['user_id'] in self.fields and matches(self.fields[user['user_id']], term)]
+
+            if len(term) <= NGRAM_SIZE:
+                ids = self.postings.get(term, set())
+            else:
+                # Users that contain every 3-gram of the term, then confirm the full substring
+                sets = sorted((self.postings.get(term[i:i + NGRAM_SIZE], set())
+                               for i in range(len(term) - NGRAM_SIZE + 1)), key=len)
+                ids = set(sets[0]).intersection(*sets[1:])
+                ids = {user_id for user_id in ids if matches(self.fields[user_id], term)}
+
+            return [self.users[user_id] for user_id in sorted(ids)]
@@ -0,0 +1,94 @@
+from db import connect_db
+from booking_queries import escape_like
+from instrument import timed
+
+# ------------------- User Loaders -------------------
+# Data functions behind the Manage Users page, kept free of widgets so the
+# benchmark harness can call them headlessly.
+
+@timed()
+def load_users():
+    """Load all users from database (runs on a worker thread, errors are raised)"""
+    try:
+        connection = connect_db()
+        cursor = connection.cursor(dictionary=True)
+        
+        # Booking counts are kept on Users by the booking write paths (see user_counters.py)
+        cursor.execute(
+            """
+            SELECT user_id, first_name, last_name, email, phone, 
+                   user_address, booking_count as bookings
+            FROM Users
+            ORDER BY user_id
+            """
+        )
+        
+        users = cursor.fetchall()
+        return users
+        
+    finally:
+        if 'connection' in locals() and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+@timed()
+def load_user_details(user_id):
+    """Load details for a specific user (runs on a worker thread, errors are raised)"""
+    try:
+        connection = connect_db()
+        cursor = connection.cursor(dictionary=True)
+        
+        # Query to get user details
+        cursor.execute(
+            """
+            SELECT u.*, u.booking_count as bookings
+            FROM Users u
+            WHERE u.user_id = %s
+            """,
+            (user_id,)
+        )
+        
+        user = cursor.fetchone()
+        
+        # Get user's bookings
+        if user:
+            cursor.execute(
+                """
+                SELECT b.Booking_ID, r.Room_Type, b.Check_IN_Date, 
+                       b.Check_Out_Date, b.Total_Cost, b.Booking_Status
+                FROM Booking b
+                JOIN Room r ON b.Room_ID = r.Room_ID
+                WHERE b.User_ID = %s
+                ORDER BY b.Check_IN_Date DESC
+                LIMIT 5
+                """,
+                (user_id,)
+            )
+            user['recent_bookings'] = cursor.fetchall()
+        
+        return user
+        
+    finally:
+        if 'connection' in locals() and connection.is_connected():
+            cursor.close()
+            connection.close()
+
+# ------------------- User List Query -------------------
+def build_user_query(search_term=""):
+    """Build the SQL and parameters for the users matching a search term (used by the export)
+
+    Matches like the page's search (see user_index.py): the term is a
+    substring of the full name, email or address, ignoring case.
+    """
+    query = """
+    SELECT user_id, first_name, last_name, email, phone, user_address,
+           booking_count AS bookings, total_spent
+    FROM Users
+"""
+    params = []
+    if search_term:
+        pattern = f"%{escape_like(search_term)}%"
+        query += "    WHERE CONCAT(first_name, ' ', last_name) LIKE %s OR email LIKE %s OR user_address LIKE %s\n"
+        params.extend([pattern, pattern, pattern])
+    query += "    ORDER BY user_id"
+    return query, params
@@ -0,0 +1,197 @@
+from tkinter import ttk
+
+# ------------------- Virtual Scrolling Table -------------------
+# A ttk.Treeview only ever holds the rows that fit on screen. The full data
+# lives in a plain list; scrolling just rewrites the values of the visible
+# items, so drawing costs the same for 50 rows or 500,000. When the view gets
+# close to the end of the loaded rows, fetch_more() is called so the caller
+# can load the next page and hand it over with append_rows().
+#
+# Selection is tracked by row ID rather than by Treeview item, so it survives
+# scrolling; callers use selected_id() instead of Treeview.focus().
+
+PREFETCH_ROWS = 20  # Ask for the next page when this close to the last loaded row
+
+class VirtualTable:
+    """Treeview that materializes only the visible window of a large row list"""
+
+    def __init__(self, parent, columns, height=10, fetch_more=None, **tree_options):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=height,
+                                 selectmode='none', **tree_options)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.on_scrollbar)
+
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', expand=True, fill='both')
+
+        self.fetch_more = fetch_more
+        self.rows = []  # Values tuple for every loaded row
+        self.ids = []  # Row ID for every loaded row, same order as rows
+        self.tags = []  # Tags tuple for every loaded row
+        self.has_more = False  # fetch_more() can still load rows
+        self.fetching = False  # Waiting for append_rows() after fetch_more()
+        self.first = 0  # Index of the row shown at the top
+        self.visible = height  # Number of rows that fit in the view
+        self.selected = None  # Row ID of the selected row
+        self.slots = []  # Treeview items used to show the visible rows
+
+        self.tree.tag_configure('selected', background='#1E90FF', foreground='white')
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<Button-1>', self.on_click)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+        self.tree.bind('<Up>', lambda event: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda event: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda event: self.scroll_by(-self.visible))
+        self.tree.bind('<Next>', lambda event: self.scroll_by(self.visible))
+
+    # ---------- Treeview pass-through ----------
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def heading(self, column, **options):
+        return self.tree.heading(column, **options)
+
+    def column(self, column, **options):
+        return self.tree.column(column, **options)
+
+    def tag_configure(self, tag, **options):
+        return self.tree.tag_configure(tag, **options)
+
+    def bind(self, sequence, func):
+        return self.tree.bind(sequence, func, add='+')
+
+    # ---------- Data ----------
+    def set_rows(self, rows, ids, tags=None, has_more=False, keep_position=False):
+        """Replace all rows; rows are value tuples and ids their row IDs"""
+        self.rows = list(rows)
+        self.ids = list(ids)
+        self.tags = list(tags) if tags is not None else [()] * len(self.rows)
+        self.has_more = has_more
+        self.fetching = False
+
+        if self.selected not in self.ids:
+            self.selected = None
+        if not keep_position:
+            self.first = 0
+        self.render()
+
+    def append_rows(self, rows, ids, tags=None, has_more=False):
+        """Add the next page of rows after fetch_more() was called"""
+        self.rows.extend(rows)
+        self.ids.extend(ids)
+        self.tags.extend(tags if tags is not None else [()] * len(rows))
+        self.has_more = has_more
+        self.fetching = False
+        self.render()
+
+    def clear(self):
+        """Remove every row"""
+        self.set_rows([], [])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def selected_id(self):
+        """Return the row ID of the selected row, or None"""
+        return self.selected
+
+    def row_values(self, row_id):
+        """Return the values of a loaded row"""
+        return self.rows[self.ids.index(row_id)]
+
+    # ---------- Drawing ----------
+    def render(self):
+        """Show rows first .. first + visible in the Treeview items"""
+        self.first = max(0, min(self.first, len(self.rows) - self.visible))
+        count = min(self.visible, len(self.rows) - self.first)
+
+        # Only the number of items changes, never more than one screenful
+        while len(self.slots) < count:
+            self.slots.append(self.tree.insert('', 'end'))
+        while len(self.slots) > count:
+            self.tree.delete(self.slots.pop())
+
+        for slot, index in zip(self.slots, range(self.first, self.first + count)):
+            # The selection colour replaces the row's own tags (e.g. status colours)
+            tags = ('selected',) if self.ids[index] == self.selected else self.tags[index]
+            self.tree.item(slot, values=self.rows[index], tags=tags)
+
+        # Scrollbar reflects the position in the loaded rows
+        if self.rows:
+            self.scrollbar.set(self.first / len(self.rows), (self.first + count) / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
+
+        self.maybe_fetch_more()
+
+    def maybe_fetch_more(self):
+        if (self.fetch_more and self.has_more and not self.fetching
+                and self.first + self.visible >= len(self.rows) - PREFETCH_ROWS):
+            self.fetching = True
+            self.fetch_more()
+
+    def scroll_to(self, first):
+        self.first = first
+        self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.first + rows)
+        return "break"
+
+    # ---------- Events ----------
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif action == 'scroll':
+            step = self.visible if unit == 'pages' else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        # Work out how many rows fit below the headings
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        heading_height = row_height
+        if self.slots:
+            bbox = self.tree.bbox(self.slots[0])
+            heading_height = bbox[1] if bbox else row_height
+        visible = max(1, (event.height - heading_height) // row_height)
+
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def on_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if item in self.slots:
+            self.select(self.ids[self.first + self.slots.index(item)])
+        self.tree.focus_set()
+
+    def select(self, row_id):
+        """Select a row and tell the page (as a <<TreeviewSelect>> event)"""
+        self.selected = row_id
+        self.render()
+        self.tree.event_generate('<<TreeviewSelect>>')
+
+    def move_selection(self, step):
+        if not self.rows:
+            return "break"
+
+        index = self.ids.index(self.selected) + step if self.selected in self.ids else 0
+        index = max(0, min(index, len(self.rows) - 1))
+
+        # Keep the selected row in view
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.visible:
+            self.first = index - self.visible + 1
+
+        self.select(self.ids[index])
+        return "break"